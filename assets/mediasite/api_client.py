@@ -8,27 +8,289 @@ License: MIT - see license.txt
 """
 
 import base64
+import http.cookiejar
 import logging
 import json
+import os
+import random
 import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
 import requests
+import requests.adapters
+import assets.mediasite.response_cache as response_cache
+import assets.mediasite.odata as odata
 requests.packages.urllib3.disable_warnings()
 
+#statuses which indicate a temporary server condition worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+#statuses for which the server asks us to slow down, honoring Retry-After
+THROTTLE_STATUSES = (429, 503)
+
+#request types which are safe to repeat regardless of the failure
+IDEMPOTENT_REQUEST_TYPES = ("get", "put", "delete", "get stream", "get job")
+
+#statuses returned by servers which do not accept $batch requests
+BATCH_REJECTED_STATUSES = (400, 404, 405, 406, 415, 501)
+
+def get_client_options(config_data):
+    """
+    Gathers optional api client settings from configuration data
+
+    params:
+        config_data: dictionary containing information relevant to setting up mediasite api connection
+
+    returns:
+        dictionary of keyword arguments for client and async client creation
+    """
+    max_workers = int(config_data.get("mediasite_api_max_workers", 8))
+
+    return {
+        "pool_connections": int(config_data.get("mediasite_api_pool_connections", 10)),
+        "pool_maxsize": int(config_data.get("mediasite_api_pool_maxsize", max(10, max_workers))),
+        "pool_block": bool(config_data.get("mediasite_api_pool_block", False)),
+        "keep_alive": bool(config_data.get("mediasite_api_keep_alive", True)),
+        "http2": bool(config_data.get("mediasite_api_http2", False)),
+        "auth_ticket": config_data.get("mediasite_api_auth_ticket"),
+        "auth_ticket_application": config_data.get("mediasite_api_auth_ticket_application", ""),
+        "cookie_file": config_data.get("mediasite_api_cookie_file"),
+        "cache": config_data.get("mediasite_api_cache"),
+        "max_retries": int(config_data.get("mediasite_api_max_retries", 3)),
+        "backoff_factor": float(config_data.get("mediasite_api_backoff_factor", 0.5)),
+        "backoff_max": float(config_data.get("mediasite_api_backoff_max", 60)),
+        "rate_limit": config_data.get("mediasite_api_rate_limit"),
+        "rate_limit_burst": config_data.get("mediasite_api_rate_limit_burst"),
+        "batch": bool(config_data.get("mediasite_api_batch", True)),
+        "batch_size": int(config_data.get("mediasite_api_batch_size", 50))
+    }
+
+def get_backoff_delay(attempt, backoff_factor, backoff_max):
+    """
+    Exponential backoff with full jitter
+
+    params:
+        attempt: number of the attempt which failed, starting at 0
+        backoff_factor: base delay in seconds
+        backoff_max: maximum delay in seconds
+
+    returns:
+        seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(backoff_max, backoff_factor * (2 ** attempt)))
+
+def parse_retry_after(retry_after):
+    """
+    Parses a Retry-After header value which can be a number of seconds or an http date
+
+    params:
+        retry_after: value of the Retry-After header
+
+    returns:
+        seconds to wait, None if the value could not be parsed
+    """
+    if not retry_after:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_datetime = parsedate_to_datetime(retry_after)
+        return max(0.0, retry_datetime.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class token_bucket:
+    def __init__(self, rate, capacity=None):
+        """
+        Thread-safe token bucket rate limiter
+
+        params:
+            rate: tokens added per second (sustained requests per second)
+            capacity: maximum number of tokens (burst size), defaults to rate
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token from the bucket, going into debt if none are available
+
+        returns:
+            seconds the caller must wait before using the token
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+class request_error:
+    def __init__(self, url, exception):
+        """
+        Returned in place of a response when a request could not be completed.
+        json() provides an odata.error so callers can log it as they would a Mediasite error.
+
+        params:
+            url: url which the request was made against
+            exception: exception raised while making the request
+        """
+        self.url = url
+        self.exception = exception
+        self.status_code = None
+        self.text = "Error: " + str(exception)
+
+    def __str__(self):
+        return self.text
+
+    def json(self):
+        return {"odata.error": {"code": type(self.exception).__name__, "message": {"value": str(self.exception)}}}
+
+class http2_response:
+    def __init__(self, response):
+        """
+        Wraps an httpx response so it can be used like a requests response
+
+        params:
+            response: httpx response
+        """
+        self.response = response
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def iter_content(self, chunk_size=1024):
+        return self.response.iter_bytes(chunk_size)
+
+class http2_session:
+    def __init__(self, pool_maxsize=10, keep_alive=True, headers=None):
+        """
+        HTTP/2 capable session backed by httpx, exposing the parts of requests.Session used by client.
+        Requires httpx to be installed with its http2 extra (pip install httpx[http2]).
+
+        params:
+            pool_maxsize: maximum number of connections to keep open
+            keep_alive: whether connections are reused between requests
+            headers: default headers sent with every request
+        """
+        import httpx
+
+        self.httpx = httpx
+        limits = httpx.Limits(max_connections=pool_maxsize,
+                              max_keepalive_connections=pool_maxsize if keep_alive else 0)
+        self.client = httpx.Client(http2=True, verify=False, limits=limits, timeout=None, headers=headers)
+        self.headers = self.client.headers
+
+    def request(self, method, url, headers=None, json=None, data=None, verify=False, stream=False, timeout=None):
+        """
+        Sends a request, translating httpx transport errors into requests exceptions
+
+        returns:
+            http2_response
+        """
+        try:
+            httpx_request = self.client.build_request(method.upper(), url, headers=headers, json=json, content=data,
+                                                      timeout=timeout)
+            return http2_response(self.client.send(httpx_request, stream=stream))
+        except self.httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+
+    def get(self, url, **kwargs):
+        return self.request("get", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("post", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("put", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("delete", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("patch", url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
 class client:
-    def __init__(self, serviceroot, sfapikey, username, password):
+    def __init__(self, serviceroot, sfapikey, username, password, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, keep_alive=True, http2=False, auth_ticket=None, auth_ticket_application="",
+                 cookie_file=None, cache=None, max_retries=3, backoff_factor=0.5, backoff_max=60, rate_limit=None,
+                 rate_limit_burst=None, batch=True, batch_size=50):
         """
         params:
             serviceroot: root URL to send API requests to
             sfapikey: Mediasite API key for making requests
             username: Mediasite API username for making requests
             password: Mediasite API password for making requests
+            pool_connections: number of hosts to keep connection pools for
+            pool_maxsize: maximum number of connections kept open per host, should be at least
+                the number of threads making requests at one time
+            pool_block: wait for a free connection rather than opening (and discarding) extra ones
+            keep_alive: whether connections are reused between requests
+            http2: use an HTTP/2 capable session (requires httpx[http2]) instead of requests
+            auth_ticket: Mediasite identity ticket to authenticate with instead of the password
+            auth_ticket_application: application name the identity ticket was issued for
+            cookie_file: file used to persist session cookies between runs (requests sessions only)
+            cache: settings for the on-disk GET response cache, see response_cache.response_cache
+                for ex. {"path": "cache/mediasite.sqlite", "ttl": {"Folders": 3600}}, disabled if None
+            max_retries: number of times a failed request is retried
+            backoff_factor: base delay in seconds for exponential backoff between retries
+            backoff_max: maximum delay in seconds between retries
+            rate_limit: maximum sustained requests per second per host, unlimited if None
+            rate_limit_burst: number of requests which may be made at once before rate limiting applies
+            batch: whether independent requests are combined into OData $batch requests
+            batch_size: maximum number of operations sent in one $batch request
         """
         self.serviceroot = serviceroot
         self.sfapikey = sfapikey
         self.username = username
         self.password = password
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.http2 = http2
+        self.auth_ticket = auth_ticket
+        self.auth_ticket_application = auth_ticket_application
+        self.cookie_file = cookie_file
+        self.cache = response_cache.response_cache(identity=self.get_cache_identity(), **cache) if cache else None
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.rate_limit = rate_limit
+        self.rate_limit_burst = rate_limit_burst
+        self.batch_size = batch_size
+
+        #turned off for the life of the client once the server rejects a $batch request
+        self.batch_supported = batch
 
         self.session = None
+        self.session_lock = threading.Lock()
+        self.rate_limiters = {}
+        self.rate_limiters_lock = threading.Lock()
+
+        #computed once and installed as session defaults rather than rebuilt for every request
+        self.auth_headers = self.get_auth_headers()
+
+    def get_cache_identity(self):
+        """
+        returns:
+            credentials cached responses are kept apart by, see response_cache.response_cache
+        """
+        return "\n".join((self.username, self.sfapikey, self.auth_ticket or ""))
 
     #formatting for login credentials needed by Mediasite
     def get_basic_auth_header_value(self):
@@ -43,62 +305,402 @@ class client:
             str(base64.b64encode(bytes(self.username + ":" + self.password, "utf-8")).decode("utf-8"))
         return return_string
 
+    def get_ident_ticket_header_value(self):
+        """
+        Creates authentication string for Mediasite identity ticket (SfIdentTicket) authentication
+
+        returns:
+            String for the Authorization header based on the username, application and ticket provided to class.
+        """
+        ticket_string = self.username + ":" + self.auth_ticket_application + ":" + self.auth_ticket
+        return "SfIdentTicket " + base64.b64encode(bytes(ticket_string, "utf-8")).decode("utf-8")
+
+    def get_auth_headers(self):
+        """
+        Creates the header values required for every Mediasite API request
+
+        returns:
+            dictionary of header values
+        """
+        if self.auth_ticket:
+            authorization = self.get_ident_ticket_header_value()
+        else:
+            authorization = self.get_basic_auth_header_value()
+
+        return {
+            "sfapikey": self.sfapikey,
+            "Accept": "application/json",
+            "Authorization": authorization
+        }
+
+    def set_auth_ticket(self, auth_ticket, auth_ticket_application=None):
+        """
+        Switches authentication to the provided Mediasite identity ticket, updating the active session
+
+        params:
+            auth_ticket: Mediasite identity ticket
+            auth_ticket_application: application name the identity ticket was issued for
+        """
+        self.auth_ticket = auth_ticket
+        if auth_ticket_application is not None:
+            self.auth_ticket_application = auth_ticket_application
+
+        self.auth_headers = self.get_auth_headers()
+        if self.session:
+            self.session.headers.update(self.auth_headers)
+
+    def save_cookies(self):
+        """
+        Persists session cookies to the cookie file so later runs can reuse the server-side session
+        """
+        if self.session and self.cookie_file and isinstance(self.session.cookies, http.cookiejar.FileCookieJar):
+            self.session.cookies.save(ignore_discard=True, ignore_expires=True)
+
     def close_sessions(self):
         if self.session:
+            self.save_cookies()
             self.session.close()
 
-    def request(self, request_type, resource, odata_attributes=None, post_vars=None):
+    def create_session(self):
         """
-        Performs API request based on parameter data
+        Creates the session shared by all requests, with connection pools sized so
+        concurrent requests reuse warm connections rather than renegotiating them
+
+        returns:
+            requests session, or http2_session if http2 is enabled
+        """
+        if self.http2:
+            return http2_session(self.pool_maxsize, self.keep_alive, self.auth_headers)
+
+        session = requests.Session()
+        session.headers.update(self.auth_headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_connections,
+                                                pool_maxsize=self.pool_maxsize,
+                                                pool_block=self.pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        #reuse cookies from earlier runs so the server can skip re-authenticating the session
+        if self.cookie_file:
+            session.cookies = http.cookiejar.LWPCookieJar(self.cookie_file)
+            if os.path.exists(self.cookie_file):
+                try:
+                    session.cookies.load(ignore_discard=True, ignore_expires=True)
+                except (OSError, http.cookiejar.LoadError) as e:
+                    logging.warning(f'Unable to load cookies from {self.cookie_file}: {e}')
+
+        return session
+
+    def get_session(self):
+        """
+        Gathers the shared session, creating it on first use
+
+        returns:
+            session used for making requests
+        """
+        if self.session is None:
+            with self.session_lock:
+                if self.session is None:
+                    self.session = self.create_session()
+
+        return self.session
+
+    def get_rate_limiter(self, url):
+        """
+        Gathers the token bucket for the host of the url
+
+        params:
+            url: url which a request will be made against
+
+        returns:
+            token_bucket for the host, None if rate limiting is disabled
+        """
+        if not self.rate_limit:
+            return None
+
+        host = urlparse(url).netloc
+        with self.rate_limiters_lock:
+            if host not in self.rate_limiters:
+                self.rate_limiters[host] = token_bucket(self.rate_limit, self.rate_limit_burst)
+            return self.rate_limiters[host]
+
+    def get_retry_delay(self, request_type, attempt, rsp=None, max_retries=None):
+        """
+        Determines whether a request should be retried and how long to wait beforehand
+
+        params:
+            request_type: type of request made, for ex. "get","post", etc.
+            attempt: number of the attempt which failed, starting at 0
+            rsp: response received, None if the request raised an exception
+            max_retries: number of times the request may be retried, defaults to the client setting
+
+        returns:
+            seconds to wait before retrying, None if the request should not be retried
+        """
+        if attempt >= (self.max_retries if max_retries is None else max_retries):
+            return None
+
+        if rsp is None:
+            return get_backoff_delay(attempt, self.backoff_factor, self.backoff_max) \
+                if request_type in IDEMPOTENT_REQUEST_TYPES else None
+
+        if rsp.status_code not in RETRY_STATUSES:
+            return None
+
+        #non-idempotent requests are only repeated when the server refused them outright
+        if request_type not in IDEMPOTENT_REQUEST_TYPES and rsp.status_code not in THROTTLE_STATUSES:
+            return None
+
+        retry_after = parse_retry_after(rsp.headers.get("Retry-After")) if rsp.status_code in THROTTLE_STATUSES else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+
+        return get_backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+
+    def send(self, request_type, url, post_vars=None, headers=None, timeout=None):
+        """
+        Sends a single http request using the shared session, which carries the authentication headers
+
+        params:
+            request_type: type of request to make, for ex. "get","post", etc.
+            url: full url to make the request against
+            post_vars: variables to send when making post requests
+            headers: headers to send in addition to the session defaults
+            timeout: seconds to wait for the server before giving up, no limit if None
+
+        returns:
+            requests response
+        """
+        req = self.get_session()
+
+        if request_type == "get":
+            return req.get(url, headers=headers, verify=False, timeout=timeout)
+
+        elif request_type == "post":
+            return req.post(url, headers=headers, json=post_vars, verify=False, timeout=timeout)
+
+        elif request_type == "put":
+            return req.put(url, headers=headers, json=post_vars, verify=False, timeout=timeout)
+
+        elif request_type == "delete":
+            return req.delete(url, headers=headers, verify=False, timeout=timeout)
+
+        elif request_type == "patch":
+            return req.patch(url, headers=headers, json=post_vars, verify=False, timeout=timeout)
+
+        elif request_type == "get stream":
+            return req.get(url, headers=headers, verify=False, stream=True, timeout=timeout)
+
+        elif request_type == "get job":
+            return req.get(url, headers=headers, verify=False, timeout=timeout)
+
+        elif request_type == "post batch":
+            return req.post(url, headers=headers, data=post_vars, verify=False, timeout=timeout)
+
+    def request(self, request_type, resource, odata_attributes=None, post_vars=None, timeout=None, max_retries=None):
+        """
+        Performs API request based on parameter data. Temporary failures are retried with
+        exponential backoff (honoring Retry-After on 429/503) and requests are rate limited per host.
+        GET requests are served from the response cache when one is configured.
 
         params:
             request_type: type of request to make, for ex. "get","post", etc.
             resource:  resource within the API to make requests on, for ex. "Presentations"
             odata_attributes: odata attributes to use when making the requests
             post_vars: variables to send when making post requests
+            timeout: seconds to wait for the server on each attempt, no limit if None
+            max_retries: number of times a failed request is retried, defaults to the client setting
+
+        returns:
+            requests response, or request_error if the request could not be completed
         """
-        if self.session is None:
-            self.session = requests.Session()
+        odata_attributes = f'?{odata_attributes}' if (odata_attributes) else ''
 
-        self.resource = resource
-        self.odata_attributes = f'?{odata_attributes}' if (odata_attributes) else ''
+        #What we're requesting, job and stream requests are made against full urls provided by Mediasite
+        if request_type in ("get stream", "get job"):
+            url = resource
+        else:
+            url = self.serviceroot + resource + odata_attributes
 
-        #What we're requesting
-        url = self.serviceroot + self.resource + self.odata_attributes
+        if request_type == "get" and self.cache and self.cache.get_ttl(resource) > 0:
+            return self.cached_request(url, resource, timeout, max_retries)
 
-        # Header values required for request
-        auth_values = {
-            "sfapikey": self.sfapikey,
-            "Accept": "application/json",
-            "Authorization": self.get_basic_auth_header_value()
-        }
+        return self.send_with_retries(request_type, url, post_vars, timeout=timeout, max_retries=max_retries)
 
-        req = self.session if self.session else requests
-        try:
-            if request_type == "get":
-                rsp = req.get(url, headers=auth_values, verify=False)
+    def cached_request(self, url, resource, timeout=None, max_retries=None):
+        """
+        Performs a GET request through the response cache. Fresh responses are served from disk,
+        stale ones are revalidated with the server when it provided an ETag or Last-Modified.
 
-            elif request_type == "post":
-                rsp = req.post(url, headers=auth_values, json=post_vars, verify=False)
+        params:
+            url: full url to make the request against
+            resource: resource within the API, used to find the cache time to live
+            timeout: seconds to wait for the server on each attempt, no limit if None
+            max_retries: number of times a failed request is retried, defaults to the client setting
 
-            elif request_type == "put":
-                rsp = req.put(url, headers=auth_values, json=post_vars, verify=False)
+        returns:
+            cached or requests response, or request_error if the request could not be completed
+        """
+        entry = self.cache.lookup(url)
+        headers = {}
 
-            elif request_type == "delete":
-                rsp = req.delete(url, headers=auth_values, verify=False)
+        if entry:
+            if self.cache.is_fresh(entry, resource):
+                self.cache.touch(url)
+                return entry["response"]
 
-            elif request_type == "patch":
-                rsp = req.patch(url, headers=auth_values, json=post_vars, verify=False)
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
 
-            elif request_type == "get stream":
-                rsp = req.get(resource, headers=auth_values, verify=False, stream=True)
+        rsp = self.send_with_retries("get", url, headers=headers or None, timeout=timeout, max_retries=max_retries)
 
-            elif request_type == "get job":
-                rsp = req.get(resource, headers=auth_values, verify=False)
+        if entry and getattr(rsp, "status_code", None) == 304:
+            self.cache.touch(url, revalidated=True)
+            return entry["response"]
 
-            return rsp
+        if getattr(rsp, "status_code", None) == 200:
+            self.cache.store(url, resource, rsp)
 
-        #catch all exceptions and return them
-        except requests.exceptions.RequestException as e:
+        return rsp
+
+    def invalidate_cache(self, resource=None):
+        """
+        Removes cached responses after changes are made through the API. Does nothing when no cache is configured.
+
+        params:
+            resource: resource (or collection name) whose responses are removed, for ex. "Folders", all if None
+        """
+        if self.cache:
+            self.cache.invalidate(resource)
+
+    def send_with_retries(self, request_type, url, post_vars=None, headers=None, timeout=None, max_retries=None):
+        """
+        Sends an http request, retrying temporary failures and applying the per-host rate limit
+
+        params:
+            request_type: type of request to make, for ex. "get","post", etc.
+            url: full url to make the request against
+            post_vars: variables to send when making post requests
+            headers: headers to send in addition to the session defaults
+            timeout: seconds to wait for the server on each attempt, no limit if None
+            max_retries: number of times a failed request is retried, defaults to the client setting
+
+        returns:
+            requests response, or request_error if the request could not be completed
+        """
+        rate_limiter = self.get_rate_limiter(url)
+        attempt = 0
+        while 1:
+            if rate_limiter:
+                time.sleep(rate_limiter.reserve())
+
+            try:
+                rsp = self.send(request_type, url, post_vars, headers, timeout)
+                delay = self.get_retry_delay(request_type, attempt, rsp, max_retries)
+                if delay is None:
+                    return rsp
+
+                logging.warning(f'Retrying request in {delay:.2f}s after status {rsp.status_code}: {url}')
+
+            #catch all exceptions and return them once out of retries
+            except requests.exceptions.RequestException as e:
+                delay = self.get_retry_delay(request_type, attempt, max_retries=max_retries)
+                if delay is None:
+                    return request_error(url, e)
+
+                logging.warning(f'Retrying request in {delay:.2f}s after error {e}: {url}')
+
+            time.sleep(delay)
+            attempt += 1
+
+    def batch(self, operations, batch_size=None, max_workers=None):
+        """
+        Performs many independent requests, combining them into OData $batch requests of at most
+        batch_size operations. Falls back to single requests made in parallel when the server
+        rejects $batch, which is remembered for the rest of the client's life.
+
+        params:
+            operations: list of (request_type, resource, odata_attributes, post_vars) tuples,
+                for ex. ("post", "Schedules('1234')/Recurrences", "", post_data)
+            batch_size: maximum number of operations per $batch request, defaults to the client setting
+            max_workers: number of single requests made at one time when falling back, defaults to pool_maxsize
+
+        returns:
+            list of responses (odata.batch_response, requests response or request_error) in operation order
+        """
+        operations = list(operations)
+        batch_size = batch_size or self.batch_size
+        results = []
+
+        for start in range(0, len(operations), batch_size):
+            chunk = operations[start:start + batch_size]
+
+            chunk_results = self.send_batch(chunk) if self.batch_supported and len(chunk) > 1 else None
+            if chunk_results is None:
+                chunk_results = self.request_each(chunk, max_workers)
+
+            results.extend(chunk_results)
+
+        return results
+
+    def send_batch(self, operations):
+        """
+        Sends operations as a single $batch request
+
+        params:
+            operations: list of (request_type, resource, odata_attributes, post_vars) tuples
+
+        returns:
+            list of responses in operation order, None if the server does not accept $batch requests
+        """
+        urls = [self.serviceroot + resource + (f'?{odata_attributes}' if odata_attributes else '')
+                for _, resource, odata_attributes, _ in operations]
+        body, content_type = odata.encode_batch(
+            [(operation[0], url, operation[3]) for operation, url in zip(operations, urls)])
+
+        logging.debug(f'Sending $batch request of {len(operations)} operations')
+        batch_url = self.serviceroot + "$batch"
+        rsp = self.send_with_retries("post batch", batch_url, body, headers={"Content-Type": content_type})
+
+        #the operations may or may not have been carried out, so they are not repeated one by one
+        if isinstance(rsp, request_error):
+            return [rsp] * len(operations)
+
+        response_type = rsp.headers.get("Content-Type", "")
+        if rsp.status_code in BATCH_REJECTED_STATUSES or \
+                (rsp.status_code < 400 and not response_type.lower().startswith("multipart/mixed")):
+            logging.warning(f'Server does not accept $batch requests (status {rsp.status_code}), sending requests individually')
+            self.batch_supported = False
+            return None
+
+        if rsp.status_code >= 400:
+            return [rsp] * len(operations)
+
+        results = odata.parse_batch_response(rsp.content, response_type, urls)
+        if len(results) != len(operations):
+            logging.error(f'$batch response contained {len(results)} of {len(operations)} operation responses')
+            results += [request_error(url, Exception("Missing from $batch response")) for url in urls[len(results):]]
+
+        return results[:len(operations)]
+
+    def request_each(self, operations, max_workers=None):
+        """
+        Performs operations as single requests made in parallel
+
+        params:
+            operations: list of (request_type, resource, odata_attributes, post_vars) tuples
+            max_workers: number of requests made at one time, defaults to pool_maxsize
+
+        returns:
+            list of responses in operation order
+        """
+        if not operations:
+            return []
 
-            return "Error: " + str(e)
+        with ThreadPoolExecutor(max_workers=min(max_workers or self.pool_maxsize, len(operations))) as executor:
+            return list(executor.map(lambda operation: self.request(*operation), operations))
@@ -0,0 +1,172 @@
+"""
+Class for creating asyncio-native connections to Mediasite API
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import asyncio
+import json
+import logging
+import aiohttp
+import assets.mediasite.api_client as api_client
+
+class async_response:
+    def __init__(self, status_code, url, headers, content):
+        """
+        Response returned by async_client requests. Mirrors the parts of requests.Response
+        used throughout the Mediasite modules so results can be handled the same way.
+
+        params:
+            status_code: http status code of the response
+            url: url which the request was made against
+            headers: response headers
+            content: response body as bytes
+        """
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1024):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+class async_client(api_client.client):
+    def __init__(self, serviceroot, sfapikey, username, password, max_concurrency=10, **kwargs):
+        """
+        Shares connection pool, retry, backoff and rate limiting settings with api_client.client.
+        HTTP/2 is not available with aiohttp so the http2 setting is ignored. Responses are not
+        read from the response cache, it is only kept so invalidate_cache applies to later synchronous runs.
+
+        params:
+            serviceroot: root URL to send API requests to
+            sfapikey: Mediasite API key for making requests
+            username: Mediasite API username for making requests
+            password: Mediasite API password for making requests
+            max_concurrency: maximum number of requests in flight at one time
+            kwargs: connection pool, retry and rate limit settings, see api_client.client
+        """
+        super().__init__(serviceroot, sfapikey, username, password, **kwargs)
+        self.max_concurrency = max_concurrency
+
+        #bounds requests in flight to max_concurrency, created on the event loop by bounded_request
+        self.request_semaphore = None
+
+    def create_session(self):
+        """
+        Creates the aiohttp session used for all requests. Must be called from within a running event loop.
+
+        returns:
+            aiohttp client session
+        """
+        #every request goes to the one Mediasite host, so the per host limit must allow max_concurrency too
+        connector = aiohttp.TCPConnector(limit=max(self.max_concurrency, self.pool_maxsize),
+                                         limit_per_host=max(self.max_concurrency, self.pool_maxsize),
+                                         force_close=not self.keep_alive,
+                                         ssl=False)
+        return aiohttp.ClientSession(connector=connector, headers=self.auth_headers)
+
+    async def close_sessions(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+        self.request_semaphore = None
+
+    async def bounded_request(self, *args, **kwargs):
+        """
+        Performs an API request once fewer than max_concurrency requests are in flight, see request
+
+        returns:
+            async_response, or api_client.request_error if the request could not be completed
+        """
+        if self.request_semaphore is None:
+            self.request_semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self.request_semaphore:
+            return await self.request(*args, **kwargs)
+
+    async def request(self, request_type, resource, odata_attributes=None, post_vars=None, timeout=None, max_retries=None):
+        """
+        Performs API request based on parameter data, retrying and rate limiting as api_client.client does
+
+        params:
+            request_type: type of request to make, for ex. "get","post", etc.
+            resource:  resource within the API to make requests on, for ex. "Presentations"
+            odata_attributes: odata attributes to use when making the requests
+            post_vars: variables to send when making post requests
+            timeout: seconds to wait for the server on each attempt, no limit if None
+            max_retries: number of times a failed request is retried, defaults to the client setting
+
+        returns:
+            async_response with the body already read, or api_client.request_error if the request could not be completed
+        """
+        if self.session is None:
+            self.session = self.create_session()
+
+        odata_attributes = f'?{odata_attributes}' if (odata_attributes) else ''
+
+        #job and stream requests are made against full urls provided by Mediasite
+        if request_type in ("get stream", "get job"):
+            method = "get"
+            url = resource
+        else:
+            method = request_type
+            url = self.serviceroot + resource + odata_attributes
+
+        request_kwargs = {}
+        if timeout is not None:
+            request_kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        if method in ("post", "put", "patch"):
+            request_kwargs["json"] = post_vars
+
+        rate_limiter = self.get_rate_limiter(url)
+        attempt = 0
+        while 1:
+            if rate_limiter:
+                await asyncio.sleep(rate_limiter.reserve())
+
+            try:
+                async with self.session.request(method.upper(), url, **request_kwargs) as client_response:
+                    content = await client_response.read()
+                    rsp = async_response(client_response.status, str(client_response.url), client_response.headers, content)
+
+                delay = self.get_retry_delay(request_type, attempt, rsp, max_retries)
+                if delay is None:
+                    return rsp
+
+                logging.warning(f'Retrying request in {delay:.2f}s after status {rsp.status_code}: {url}')
+
+            #catch all exceptions and return them once out of retries
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                delay = self.get_retry_delay(request_type, attempt, max_retries=max_retries)
+                if delay is None:
+                    return api_client.request_error(url, e)
+
+                logging.warning(f'Retrying request in {delay:.2f}s after error {e}: {url}')
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def batch(self, operations, batch_size=None, max_workers=None):
+        """
+        Performs many independent requests concurrently, at most max_concurrency at one time.
+        aiohttp requests are not combined into $batch requests.
+
+        params:
+            operations: list of (request_type, resource, odata_attributes, post_vars) tuples
+            batch_size: accepted for compatibility with api_client.client.batch, unused
+            max_workers: accepted for compatibility with api_client.client.batch, unused
+
+        returns:
+            list of responses in operation order
+        """
+        return await asyncio.gather(*[self.bounded_request(*operation) for operation in operations])
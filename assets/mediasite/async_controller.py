@@ -0,0 +1,193 @@
+"""
+Asyncio facade for the Mediasite controller. Lets module calls be awaited and gathered
+with bounded concurrency while network I/O is performed by the async api client.
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import assets.mediasite.controller as controller
+import assets.mediasite.api_client as api_client
+import assets.mediasite.async_api_client as async_api_client
+
+class sync_bridge:
+    def __init__(self, async_client, loop):
+        """
+        Synchronous stand-in for api_client.client which forwards requests to an async client
+        running on the given event loop. Used by module code running in worker threads.
+
+        params:
+            async_client: async_api_client.async_client performing the requests
+            loop: running event loop which owns the async client session
+        """
+        self.async_client = async_client
+        self.loop = loop
+
+    def __getattr__(self, name):
+        return getattr(self.async_client, name)
+
+    def request(self, request_type, resource, odata_attributes=None, post_vars=None, timeout=None, max_retries=None):
+        future = asyncio.run_coroutine_threadsafe(
+            self.async_client.request(request_type, resource, odata_attributes, post_vars, timeout=timeout, max_retries=max_retries), self.loop)
+        return future.result()
+
+    def batch(self, operations, batch_size=None, max_workers=None):
+        future = asyncio.run_coroutine_threadsafe(
+            self.async_client.batch(list(operations), batch_size, max_workers), self.loop)
+        return future.result()
+
+    def close_sessions(self):
+        pass
+
+class bridged_controller(controller.controller):
+    def __init__(self, config_data, bridge, *args, **kwargs):
+        """
+        params:
+            config_data: dictionary containing information relevant to setting up mediasite api connection
+            bridge: sync_bridge used in place of a blocking api client
+        """
+        self.bridge = bridge
+        super().__init__(config_data, *args, **kwargs)
+
+    def create_api_client(self, config_data):
+        return self.bridge
+
+class async_module:
+    def __init__(self, async_mediasite, module):
+        """
+        Awaitable wrapper around a Mediasite module (presentation, folder, etc.)
+
+        params:
+            async_mediasite: async_controller owning the semaphore and worker threads
+            module: the synchronous module instance to wrap
+        """
+        self.async_mediasite = async_mediasite
+        self.module = module
+
+    def __getattr__(self, name):
+        attribute = getattr(self.module, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self.async_mediasite.run(attribute, *args, **kwargs)
+
+        return call
+
+class async_controller():
+    def __init__(self, config_data, max_concurrency=10, *args, **kwargs):
+        """
+        params:
+            config_data: dictionary containing information relevant to setting up mediasite api connection
+            max_concurrency: maximum number of module calls in flight at one time, and of requests
+
+        Usage:
+            async with async_controller(config_data, max_concurrency=20) as mediasite:
+                presentations = await mediasite.gather(*[mediasite.presentation.get_presentation_by_id(i) for i in ids])
+        """
+        self.config_data = config_data
+        self.max_concurrency = max_concurrency
+        self.api_client = self.create_api_client(config_data)
+
+        self.mediasite = None
+        self.semaphore = None
+        self.executor = None
+        self.presentation = None
+        self.folder = None
+        self.catalog = None
+        self.content = None
+
+    def create_api_client(self, config_data):
+        """
+        Loads configuration file data and creates new async Mediasite api client
+
+        params:
+            config_data: dictionary containing information relevant to setting up mediasite api connection
+
+        returns:
+            Configured async Mediasite web api client object
+        """
+
+        return async_api_client.async_client(config_data["mediasite_api_url"],
+                                             config_data["mediasite_api_key"],
+                                             config_data["mediasite_api_user"],
+                                             config_data["mediasite_api_password"],
+                                             self.max_concurrency,
+                                             **api_client.get_client_options(config_data))
+
+    async def open(self):
+        """
+        Creates the underlying controller and module wrappers. Must be awaited from within a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+
+        #the controller performs requests on creation so it is built off of the event loop thread
+        bridge = sync_bridge(self.api_client, loop)
+        self.mediasite = await loop.run_in_executor(self.executor, bridged_controller, self.config_data, bridge)
+
+        self.presentation = async_module(self, self.mediasite.presentation)
+        self.folder = async_module(self, self.mediasite.folder)
+        self.catalog = async_module(self, self.mediasite.catalog)
+        self.content = async_module(self, self.mediasite.content)
+
+        return self
+
+    async def close(self):
+        #job polls are made through the event loop so the job tracker is stopped from another thread
+        if self.mediasite:
+            await asyncio.get_running_loop().run_in_executor(None, self.mediasite.close)
+            self.mediasite = None
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        await self.api_client.close_sessions()
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Runs a synchronous module function on a worker thread once a concurrency slot is available
+
+        params:
+            function: module function to run
+            args, kwargs: arguments passed to the function
+
+        returns:
+            result of the function
+        """
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def request(self, request_type, resource, odata_attributes=None, post_vars=None, timeout=None, max_retries=None):
+        """
+        Performs an API request directly on the async client, bounded like the requests of async_client.batch.
+        Module calls hold a slot of the controller semaphore while their batches run, so requests are
+        bounded by the client semaphore rather than competing with them for it.
+
+        returns:
+            async_api_client.async_response or api_client.request_error
+        """
+        return await self.api_client.bounded_request(request_type, resource, odata_attributes, post_vars, timeout=timeout, max_retries=max_retries)
+
+    async def gather(self, *awaitables, return_exceptions=False):
+        """
+        Gathers awaitable module calls, concurrency being bounded by max_concurrency
+
+        returns:
+            list of results in the order the awaitables were provided
+        """
+        logging.debug(f'Gathering {len(awaitables)} Mediasite calls with concurrency {self.max_concurrency}')
+        return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
@@ -12,9 +12,11 @@ import os
 import sys
 import logging
 import json
-import time
+import pandas as pd
 import assets.mediasite.model as model
 import assets.mediasite.api_client as api_client
+import assets.mediasite.pager as pager
+import assets.mediasite.job_tracker as job_tracker
 import assets.mediasite.modules.module as module
 import assets.mediasite.modules.schedule as schedule
 import assets.mediasite.modules.catalog as catalog
@@ -36,7 +38,12 @@ class controller():
         """
         self.model = model.model()
         self.config_data = config_data
+        self.max_workers = int(config_data.get("mediasite_api_max_workers", 8))
         self.api_client = self.create_api_client(config_data)
+        self.pager = pager.pager(self)
+        self.job_tracker = job_tracker.job_tracker(self,
+                                                   initial_interval=float(config_data.get("mediasite_api_job_poll_interval", 0.5)),
+                                                   max_interval=float(config_data.get("mediasite_api_job_poll_max_interval", 5)))
         self.module = module.module(self)
         self.schedule = schedule.schedule(self)
         self.catalog = catalog.catalog(self)
@@ -62,7 +69,8 @@ class controller():
         return api_client.client(config_data["mediasite_api_url"],
                                  config_data["mediasite_api_key"],
                                  config_data["mediasite_api_user"],
-                                 config_data["mediasite_api_password"])
+                                 config_data["mediasite_api_password"],
+                                 **api_client.get_client_options(config_data))
 
     def connection_validated(self):
         """
@@ -88,17 +96,29 @@ class controller():
         Checks for errors experienced from web_api Python requests.
 
         params:
-            request_result: returned content from web_api request peformed
+            request_result: returned content from web_api request peformed, either the response
+                itself or its already decoded json
 
         returns:
             true if errors were experienced, false if no errors experienced
         """
-        if request_result.status_code == 200 or request_result.status_code == allowed_status:
+        #requests which could not be completed at all (connection errors, exhausted retries)
+        if isinstance(request_result, (str, api_client.request_error)):
+            logging.error(f'Request error: {request_result}')
+            self.model.set_current_connection_valid(False)
+            return True
+        #decoded json results only carry Mediasite errors
+        elif isinstance(request_result, dict):
+            if "odata.error" in request_result:
+                logging.error(request_result["odata.error"]["code"] + ": " + request_result["odata.error"]["message"]["value"])
+                return True
+            return False
+        elif request_result.status_code == 200 or request_result.status_code == allowed_status:
             return False
         elif request_result.status_code < 400:
             logging.warning(f'Specific status code: {request_result.status_code}')
             return False
-        elif request_result.status_code >= 400 or type(request_result) is str:
+        elif request_result.status_code >= 400:
             logging.error(f'Request error [{request_result.status_code}]: {request_result.url}')
             self.model.set_current_connection_valid(False)
             try:
@@ -114,44 +134,46 @@ class controller():
     def wait_for_job_to_complete(self, job_link_url):
         """
         Function for checking on and waiting for completion or error status of jobs in
-        Mediasite system using Mediasite API.
+        Mediasite system using Mediasite API. The job is polled by the shared job tracker
+        so other jobs being waited on from other threads are polled alongside it.
 
         arguments:
             job_link_url: unique link to Mediasite job which can be used for gathering status
+
+        returns:
+            None once the job succeeded or failed, the job result when it could not be gathered
         """
-        while 1:
-            #gather information on the job status
-            job_result = self.api_client.request("get job", job_link_url, "", "").json()
-
-            if self.experienced_request_errors(job_result):
-                return job_result
-            else:
-                if "Status" in job_result.keys():
-                    job_result_status = job_result["Status"]
-
-                    #if successful we return
-                    if job_result_status == "Successful":
-                        logging.info("Job was successful")
-                        return
-
-                    #if the job fails or is canceled for some reason exit
-                    elif job_result_status == "Disabled" or job_result_status == "Failed" or job_result_status == "Cancelled":
-                        logging.error("Job did not complete successfully with a status of "+job_result_status)
-                        logging.error("Job status information: "+job_result["StatusMessage"])
-                        return
-                    #if the job is queued or working we wait for the job to finish or fail
-                    else:
-                        logging.info("Waiting for job to complete. Job status: "+job_result_status)
-                        time.sleep(5)
-                else:
-                    return job_result
-
-    def process_scheduling_data_row(self, schedule_data):
+        return self.job_tracker.track(job_link_url).result()
+
+    def wait_for_jobs_to_complete(self, job_link_urls):
+        """
+        Waits for many Mediasite jobs at once, polling them concurrently
+
+        arguments:
+            job_link_urls: list of unique links to Mediasite jobs
+
+        returns:
+            list of results in the order of the job links, see wait_for_job_to_complete
+        """
+        futures = self.job_tracker.track_all(job_link_urls)
+        return [future.result() for future in futures]
+
+    def close(self):
+        """
+        Stops the job tracker threads and closes the api client sessions once the controller is no longer needed
+        """
+        self.job_tracker.shutdown()
+        self.api_client.close_sessions()
+
+    def process_scheduling_data_row(self, schedule_data, parent_folder_id=None, skip_validation=False):
         """
         Process scheduling data provided in pre-specified format.
 
         params:
             schedule_data: list which contain pertinent mediasite scheduling data
+            parent_folder_id: id of the already created folder the schedule belongs in, the folders
+                in the schedule data are parsed and created if None
+            skip_validation: whether the schedule data was already validated, for ex. by a batch
 
         returns:
             output indicating which rows of scheduling information were successfully scheduled
@@ -159,15 +181,17 @@ class controller():
 
         row_result = {}
 
-        validation_result = self.validate_scheduling_data(schedule_data)
-
         #validate the scheduling data
-        if "error" in validation_result.keys():
-            row_result["error"] = validation_result["error"]
-            return row_result
+        if not skip_validation:
+            validation_result = self.validate_scheduling_data(schedule_data)
+
+            if "error" in validation_result.keys():
+                row_result["error"] = validation_result["error"]
+                return row_result
 
         #parse and create folders
-        parent_folder_id = self.folder.parse_and_create_folders(schedule_data["mediasite_folders"], schedule_data["mediasite_folder_root_id"])
+        if parent_folder_id is None:
+            parent_folder_id = self.folder.parse_and_create_folders(self.get_schedule_folders(schedule_data), self.get_schedule_folder_root_id(schedule_data))
 
         #set the current schedule data parent folder id
         schedule_data["schedule_parent_folder_id"] = parent_folder_id
@@ -187,13 +211,16 @@ class controller():
             analytics_report_result = self.report.create_catalog_report(schedule_data["catalog_name"], catalog_result["Id"])
             row_result["analytics_result"] = analytics_report_result
 
-        #enable catalog downloads
-        if schedule_data["catalog_include"] and schedule_data["catalog_enable_download"]:
-            self.catalog.enable_catalog_downloads(catalog_result["Id"])
+        #enable catalog downloads and disable catalog links using a single settings update
+        if schedule_data["catalog_include"]:
+            catalog_settings = {}
+            if schedule_data["catalog_enable_download"]:
+                catalog_settings["AllowPresentationDownload"] = "True"
+            if not schedule_data["catalog_allow_links"]:
+                catalog_settings["AllowCatalogLinks"] = "False"
 
-        #disable catalog links
-        if schedule_data["catalog_include"] and not schedule_data["catalog_allow_links"]:
-            self.catalog.disable_catalog_allow_links(catalog_result["Id"])
+            if catalog_settings:
+                self.catalog.update_catalog_settings(catalog_result["Id"], catalog_settings)
 
         #link module to catalog
         if schedule_data["module_include"] and schedule_data["catalog_include"]:
@@ -202,7 +229,7 @@ class controller():
         schedule_result = self.schedule.create_schedule(schedule_data)
         row_result["schedule_result"] = schedule_result
 
-        row_result["schedule_result"]["folder_directory"] = schedule_data["mediasite_folders"]
+        row_result["schedule_result"]["folder_directory"] = self.get_schedule_folders(schedule_data)
 
         if "odata.error" not in schedule_result:
             recurrence_result = self.schedule.create_recurrence(schedule_data, schedule_result)
@@ -210,6 +237,21 @@ class controller():
 
         return row_result
 
+    def get_schedule_folders(self, schedule_data):
+        """
+        returns:
+            folder path of the schedule data, gather_import_schedule_data provides it as "folders"
+            while older callers use "mediasite_folders"
+        """
+        return schedule_data.get("folders", schedule_data.get("mediasite_folders", ""))
+
+    def get_schedule_folder_root_id(self, schedule_data):
+        """
+        returns:
+            id of the folder the schedule data folder path starts from, "" for the root folder
+        """
+        return schedule_data.get("folder_root_id", schedule_data.get("mediasite_folder_root_id", ""))
+
     def validate_scheduling_data(self, schedule_data):
         """
         Validate user entered data and notify them of any corrections using error dialogs
@@ -244,9 +286,86 @@ class controller():
             logging.error(result["error"])
             return result
 
-        if schedule_data["schedule_template"] in self.model.get_templates():
+        if self.model.get_templates() and not self.model.get_template_by_name(schedule_data["schedule_template"]):
             result = {"error":"Error: " + schedule_data["schedule_name"] + " - Submitted template name does not exist."}
             logging.error(result["error"])
             return result
 
-        return {"Success":""}
\ No newline at end of file
+        return {"Success":""}
+
+    def validate_batch_scheduling_data(self, batch_schedule_data):
+        """
+        Validate many rows of scheduling data at once. Existing module ids, templates and recorders are
+        gathered once and each check is made against the whole batch in memory, so no requests are made
+        per row. Every error of a row is reported, not only the first. Occurrences are generated once per
+        row and kept in its schedule data for recurrence creation.
+
+        params:
+            batch_schedule_data: dictionary of schedule data by row index, or list of schedule data
+
+        returns:
+            pandas DataFrame with "row", "schedule_name" and "error" columns, one line per error found,
+            empty if every row is valid
+        """
+        if not isinstance(batch_schedule_data, dict):
+            batch_schedule_data = dict(enumerate(batch_schedule_data))
+
+        report_columns = ["row", "schedule_name", "error"]
+        if not batch_schedule_data:
+            return pd.DataFrame(columns=report_columns)
+
+        logging.info(f'Validating {len(batch_schedule_data)} rows of scheduling data')
+
+        #gather everything the rows are checked against up front
+        if not self.model.get_templates():
+            self.template.gather_templates()
+        if not self.model.get_recorders():
+            self.recorder.gather_recorders()
+
+        existing_module_ids = self.module.get_all_module_ids()
+        template_names = set(self.model.templates_index.by_name)
+        recorder_names = set(self.model.recorders_index.by_name)
+
+        rows = pd.DataFrame({
+            "row":list(batch_schedule_data.keys()),
+            "schedule_name":[schedule_data["schedule_name"] for schedule_data in batch_schedule_data.values()],
+            "catalog_include":[bool(schedule_data["catalog_include"]) for schedule_data in batch_schedule_data.values()],
+            "catalog_name":[schedule_data["catalog_name"] for schedule_data in batch_schedule_data.values()],
+            "module_include":[bool(schedule_data["module_include"]) for schedule_data in batch_schedule_data.values()],
+            "module_id":[schedule_data["module_id"] for schedule_data in batch_schedule_data.values()],
+            "template":[schedule_data["schedule_template"] for schedule_data in batch_schedule_data.values()],
+            "recorder":[schedule_data["schedule_recorder"] for schedule_data in batch_schedule_data.values()],
+            "occurrences":[len(self.schedule.get_occurrences(schedule_data)) for schedule_data in batch_schedule_data.values()]
+        })
+
+        #module ids included by more than one row of the batch would collide once the first is created
+        included_module_ids = rows["module_id"].where(rows["module_include"] & (rows["module_id"] != ""))
+        duplicated_module_ids = included_module_ids.notna() & included_module_ids.duplicated(keep=False)
+
+        checks = [
+            (rows["catalog_include"] & (rows["catalog_name"] == ""), "Submitted schedule data has no catalog name."),
+            (rows["occurrences"] == 0, "Submitted schedule data does not contain at least one occurrence."),
+            (rows["module_include"] & (rows["module_id"] == ""), "No module Id specified."),
+            (rows["module_include"] & rows["module_id"].isin(existing_module_ids), "Submitted ModuleId already exists."),
+            (duplicated_module_ids, "Submitted ModuleId is used by more than one row."),
+            (~rows["template"].isin(template_names) if template_names else None, "Submitted template name does not exist."),
+            (~rows["recorder"].isin(recorder_names) if recorder_names else None, "Submitted recorder name does not exist.")
+        ]
+
+        errors = []
+        for failed, message in checks:
+            if failed is None or not failed.any():
+                continue
+
+            failed_rows = rows.loc[failed, ["row", "schedule_name"]].copy()
+            failed_rows["error"] = "Error: " + failed_rows["schedule_name"] + " - " + message
+            errors.append(failed_rows)
+
+        if not errors:
+            return pd.DataFrame(columns=report_columns)
+
+        report = pd.concat(errors).sort_values("row", kind="stable").reset_index(drop=True)
+        for error in report["error"]:
+            logging.error(error)
+
+        return report
\ No newline at end of file
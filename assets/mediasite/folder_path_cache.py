@@ -0,0 +1,92 @@
+"""
+Thread-safe memo of Mediasite folder paths to folder ids, shared by folder creation across a batch
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import logging
+import threading
+
+class folder_path_cache():
+    def __init__(self):
+        """
+        Trie of folder ids keyed by folder name, one per root folder id. Each node is resolved at most
+        once: threads needing the same folder wait for the first to find or create it, while
+        different folders (even siblings) are resolved concurrently.
+        """
+        self.lock = threading.Lock()
+        self.roots = {}
+
+    def new_node(self, folder_id=None):
+        return {"id": folder_id, "children": {}, "lock": threading.Lock()}
+
+    def get_root(self, root_id):
+        with self.lock:
+            if root_id not in self.roots:
+                self.roots[root_id] = self.new_node(root_id)
+            return self.roots[root_id]
+
+    def get_child(self, node, folder_name):
+        with node["lock"]:
+            if folder_name not in node["children"]:
+                node["children"][folder_name] = self.new_node()
+            return node["children"][folder_name]
+
+    def resolve(self, root_id, folder_names, create_folder):
+        """
+        Resolves a folder path to a folder id, finding or creating only the folders not already cached
+
+        params:
+            root_id: id of the folder the path starts from
+            folder_names: list of folder names from the root down
+            create_folder: function taking a folder name and parent id, returning the found or created
+                folder record (for ex. folder.create_folder)
+
+        returns:
+            id of the last folder in the path, or of the lowest folder which could be found or created
+        """
+        node = self.get_root(root_id)
+
+        for folder_name in folder_names:
+            child = self.get_child(node, folder_name)
+
+            #the child lock is only contended by threads resolving this very folder
+            with child["lock"]:
+                if child["id"] is None:
+                    result = create_folder(folder_name, node["id"])
+                    if "Id" in result:
+                        child["id"] = result["Id"]
+
+            if child["id"] is None:
+                return node["id"]
+
+            node = child
+
+        return node["id"]
+
+    def add(self, root_id, folder_names, folder_ids):
+        """
+        Records the ids of the folders of a path found by other means, for ex. from the folder tree
+
+        params:
+            root_id: id of the folder the path starts from
+            folder_names: list of folder names from the root down
+            folder_ids: list of the ids of those folders
+        """
+        node = self.get_root(root_id)
+        for folder_name, folder_id in zip(folder_names, folder_ids):
+            node = self.get_child(node, folder_name)
+
+            with node["lock"]:
+                node["id"] = folder_id
+
+    def clear(self):
+        """
+        Forgets every cached path, for use after folders are deleted
+        """
+        with self.lock:
+            self.roots = {}
+
+        logging.debug("Cleared folder path cache")
@@ -0,0 +1,155 @@
+"""
+In-memory index of the Mediasite folder hierarchy built from a single bulk folder listing
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import logging
+import assets.mediasite.model as model
+
+class folder_tree():
+    def __init__(self, folders, root_id="", include_recycled=False):
+        """
+        params:
+            folders: listing of mediasite folder records, for ex. from folder.get_all_folders
+            root_id: id of the mediasite root folder, paths are resolved from here
+            include_recycled: whether folders in the recycle bin are part of the tree
+        """
+        self.root_id = root_id
+        self.index = model.record_index(("Id", "id"), ("Name", "name"), ("ParentFolderId", "parent_id"))
+
+        for folder in folders:
+            if include_recycled or not folder.get("Recycled"):
+                self.index.add(folder)
+
+        logging.debug(f'Built folder tree of {len(self.index.by_id)} folders')
+
+    def add(self, folder):
+        """
+        Adds or replaces a folder, for ex. after it was created through the API
+
+        params:
+            folder: mediasite folder record
+        """
+        self.index.add(folder)
+
+    def remove(self, folder_id):
+        """
+        Removes a folder and everything beneath it
+
+        params:
+            folder_id: id of the folder to remove
+        """
+        for folder in list(self.iter_subtree(folder_id, include_self=True)):
+            self.index.remove(self.index.get_id(folder))
+
+    def get_folder(self, folder_id):
+        return self.index.get_by_id(folder_id)
+
+    def get_folders_by_name(self, folder_name):
+        return self.index.get_all_by_name(folder_name)
+
+    def get_children(self, parent_id):
+        return self.index.get_by_parent_id(parent_id)
+
+    def get_child_by_name(self, parent_id, folder_name):
+        """
+        returns:
+            child folder record with the provided name, None if there is none
+        """
+        for folder in self.index.by_parent_id.get(parent_id, []):
+            if self.index.get_value(folder, self.index.name_keys) == folder_name:
+                return folder
+
+        return None
+
+    def get_id_by_path(self, folder_path, root_id=None):
+        """
+        Resolves a folder path to a folder id
+
+        params:
+            folder_path: folder path delimited by "/", for ex "/Current/Spring 2018/Test"
+            root_id: id of the folder the path starts from, defaults to the tree root
+
+        returns:
+            id of the last folder in the path, None if any folder of the path was not found
+        """
+        folder_ids = self.get_ids_by_path(folder_path, root_id)
+        if folder_ids is None:
+            return None
+
+        return folder_ids[-1] if folder_ids else root_id or self.root_id
+
+    def get_ids_by_path(self, folder_path, root_id=None):
+        """
+        Resolves each folder of a folder path to its folder id
+
+        params:
+            folder_path: folder path delimited by "/", for ex "/Current/Spring 2018/Test"
+            root_id: id of the folder the path starts from, defaults to the tree root
+
+        returns:
+            list of the ids of the folders in the path from the root down, None if any folder of the path was not found
+        """
+        folder_id = root_id or self.root_id
+        folder_ids = []
+
+        for folder_name in folder_path.split("/"):
+            if folder_name == "":
+                continue
+
+            folder = self.get_child_by_name(folder_id, folder_name)
+            if folder is None:
+                return None
+            folder_id = self.index.get_id(folder)
+            folder_ids.append(folder_id)
+
+        return folder_ids
+
+    def get_path(self, folder_id):
+        """
+        Builds the path of a folder from the tree root
+
+        params:
+            folder_id: id of the folder
+
+        returns:
+            folder path delimited by "/", for ex "/Current/Spring 2018/Test"
+        """
+        names = []
+        folder = self.get_folder(folder_id)
+
+        while folder is not None and self.index.get_id(folder) != self.root_id:
+            names.append(self.index.get_value(folder, self.index.name_keys))
+            folder = self.get_folder(self.index.get_value(folder, self.index.parent_keys))
+
+        return "/" + "/".join(reversed(names))
+
+    def iter_subtree(self, folder_id, include_self=False):
+        """
+        Generator over the folders beneath a folder, parents before their children
+
+        params:
+            folder_id: id of the folder
+            include_self: whether the folder itself is yielded first
+
+        yields:
+            mediasite folder records
+        """
+        if include_self and self.get_folder(folder_id) is not None:
+            yield self.get_folder(folder_id)
+
+        stack = list(reversed(self.index.by_parent_id.get(folder_id, [])))
+        while stack:
+            folder = stack.pop()
+            yield folder
+            stack.extend(reversed(self.index.by_parent_id.get(self.index.get_id(folder), [])))
+
+    def get_descendants(self, folder_id):
+        """
+        returns:
+            list of all folder records beneath a folder, parents before their children
+        """
+        return list(self.iter_subtree(folder_id))
@@ -0,0 +1,210 @@
+"""
+Mediasite client class for tracking many Mediasite jobs at one time
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+#job statuses which mean the job ended without succeeding
+FAILED_JOB_STATUSES = ("Disabled", "Failed", "Cancelled")
+
+class job_tracker():
+    def __init__(self, mediasite, max_workers=None, initial_interval=0.5, max_interval=5, backoff_factor=1.5):
+        """
+        Polls Mediasite jobs from a scheduler thread, many jobs being checked concurrently. Each job is
+        polled soon after it is tracked and then less and less often, so short jobs finish quickly
+        while long ones do not flood the server.
+
+        params:
+            mediasite: controller used to make requests
+            max_workers: number of job statuses requested at one time, defaults to the controller setting
+            initial_interval: seconds between the first polls of a job
+            max_interval: longest number of seconds between polls of a job
+            backoff_factor: growth of the interval after each poll of an unfinished job
+        """
+        self.mediasite = mediasite
+        self.max_workers = max_workers or mediasite.max_workers
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+
+        self.condition = threading.Condition()
+        #held while the scheduler is started or shut down, so jobs are never handed to a stopping scheduler
+        self.lifecycle_lock = threading.Lock()
+        self.pending = []
+        self.sequence = itertools.count()
+        self.thread = None
+        self.executor = None
+        self.stopped = False
+
+    def start(self):
+        """
+        Starts the scheduler thread and polling workers if they are not running. Expects the lifecycle lock and condition to be held.
+        """
+        if self.thread is None:
+            self.stopped = False
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job_poll")
+            self.thread = threading.Thread(target=self.run, name="job_tracker", daemon=True)
+            self.thread.start()
+
+    def shutdown(self):
+        """
+        Stops the scheduler thread and polling workers, jobs still being tracked are cancelled.
+        Jobs tracked afterwards start them again.
+        """
+        with self.lifecycle_lock:
+            with self.condition:
+                self.stopped = True
+                for _, _, job in self.pending:
+                    job["future"].cancel()
+                self.pending = []
+                self.condition.notify()
+
+            #the scheduler needs the condition to exit so it is joined once the condition is released
+            if self.thread:
+                self.thread.join()
+                self.thread = None
+
+            executor, self.executor = self.executor, None
+
+        #polls in progress may run callbacks which track jobs again, so they are waited on without the lock
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def track(self, job_link_url, callback=None):
+        """
+        Starts tracking a Mediasite job
+
+        params:
+            job_link_url: unique link to Mediasite job which can be used for gathering status
+            callback: function called with the future once the job ends
+
+        returns:
+            future whose result is what wait_for_job_to_complete returns for the job
+        """
+        future = Future()
+        if callback:
+            future.add_done_callback(callback)
+
+        job = {"url":job_link_url, "future":future, "interval":self.initial_interval}
+
+        with self.lifecycle_lock, self.condition:
+            self.start()
+            self.schedule(job, 0)
+
+        return future
+
+    def track_all(self, job_link_urls, callback=None):
+        """
+        returns:
+            list of futures for each of the provided job links, see track
+        """
+        return [self.track(job_link_url, callback) for job_link_url in job_link_urls]
+
+    def schedule(self, job, delay):
+        """
+        Queues a job to be polled after a delay. Expects the condition to be held.
+        """
+        heapq.heappush(self.pending, (time.monotonic() + delay, next(self.sequence), job))
+        self.condition.notify()
+
+    def run(self):
+        """
+        Scheduler loop, hands each job to a polling worker once it is due
+        """
+        while 1:
+            with self.condition:
+                while not self.stopped:
+                    if not self.pending:
+                        self.condition.wait()
+                        continue
+
+                    due, _, job = self.pending[0]
+                    delay = due - time.monotonic()
+                    if delay <= 0:
+                        heapq.heappop(self.pending)
+                        break
+
+                    self.condition.wait(delay)
+
+                if self.stopped:
+                    return
+
+            try:
+                self.executor.submit(self.poll, job)
+            except RuntimeError:
+                #the tracker was shut down after the job was taken off the queue
+                job["future"].cancel()
+                return
+
+    def poll(self, job):
+        """
+        Checks a job once, completing its future if the job ended or scheduling the next check
+        """
+        future = job["future"]
+        if future.cancelled():
+            return
+
+        try:
+            done, result = self.check_job(job["url"])
+        except Exception as e:
+            if not future.cancelled():
+                future.set_exception(e)
+            return
+
+        if done:
+            if not future.cancelled():
+                future.set_result(result)
+            return
+
+        job["interval"] = min(job["interval"] * self.backoff_factor, self.max_interval)
+        with self.condition:
+            if not self.stopped:
+                self.schedule(job, job["interval"])
+                return
+
+        #the tracker was shut down while the job was being polled
+        future.cancel()
+
+    def check_job(self, job_link_url):
+        """
+        Gathers the status of a Mediasite job
+
+        params:
+            job_link_url: unique link to Mediasite job which can be used for gathering status
+
+        returns:
+            whether the job ended, and the job result on errors (None once the job succeeded or failed)
+        """
+        job_result = self.mediasite.api_client.request("get job", job_link_url, "", "").json()
+
+        if self.mediasite.experienced_request_errors(job_result):
+            return True, job_result
+
+        if "Status" not in job_result.keys():
+            return True, job_result
+
+        job_result_status = job_result["Status"]
+
+        #if successful we return
+        if job_result_status == "Successful":
+            logging.info("Job was successful")
+            return True, None
+
+        #if the job fails or is canceled for some reason exit
+        elif job_result_status in FAILED_JOB_STATUSES:
+            logging.error("Job did not complete successfully with a status of "+job_result_status)
+            logging.error("Job status information: "+job_result["StatusMessage"])
+            return True, None
+
+        #if the job is queued or working we wait for the job to finish or fail
+        logging.info("Waiting for job to complete. Job status: "+job_result_status)
+        return False, None
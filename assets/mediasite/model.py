@@ -12,6 +12,88 @@ import os
 import sys
 import logging
 
+class record_index():
+    def __init__(self, id_keys, name_keys, parent_keys=()):
+        """
+        Hash indexes over a listing of Mediasite records for constant time lookups
+
+        params:
+            id_keys: keys which may hold the record id, for ex. ("Id", "id")
+            name_keys: keys which may hold the record name, for ex. ("Name", "name")
+            parent_keys: keys which may hold the record parent id, for ex. ("ParentFolderId", "parent_id")
+        """
+        self.id_keys = id_keys
+        self.name_keys = name_keys
+        self.parent_keys = parent_keys
+        self.clear()
+
+    def clear(self):
+        self.by_id = {}
+        self.by_name = {}
+        self.by_parent_id = {}
+
+    def get_value(self, record, keys):
+        for key in keys:
+            if key in record:
+                return record[key]
+        return None
+
+    def get_id(self, record):
+        return self.get_value(record, self.id_keys)
+
+    def add(self, record):
+        """
+        Adds a record to the indexes, replacing any record with the same id
+
+        params:
+            record: dictionary for a Mediasite record
+        """
+        record_id = self.get_id(record)
+        if record_id in self.by_id:
+            self.remove(record_id)
+
+        self.by_id[record_id] = record
+        self.by_name.setdefault(self.get_value(record, self.name_keys), []).append(record)
+        if self.parent_keys:
+            self.by_parent_id.setdefault(self.get_value(record, self.parent_keys), []).append(record)
+
+    def remove(self, record_id):
+        """
+        Removes a record from the indexes
+
+        params:
+            record_id: id of the record to remove
+        """
+        record = self.by_id.pop(record_id, None)
+        if record is None:
+            return
+
+        self.by_name[self.get_value(record, self.name_keys)].remove(record)
+        if self.parent_keys:
+            self.by_parent_id[self.get_value(record, self.parent_keys)].remove(record)
+
+    def set(self, records):
+        self.clear()
+        for record in records:
+            self.add(record)
+
+    def get_by_id(self, record_id):
+        return self.by_id.get(record_id)
+
+    def get_by_name(self, name):
+        """
+        returns:
+            first record with the provided name, None if there is none
+        """
+        records = self.by_name.get(name)
+        return records[0] if records else None
+
+    def get_all_by_name(self, name):
+        return list(self.by_name.get(name, []))
+
+    def get_by_parent_id(self, parent_id):
+        return list(self.by_parent_id.get(parent_id, []))
+
 class model():
     def __init__(self):
         self.current_connection_valid = False
@@ -22,6 +104,14 @@ class model():
         self.recurrences = {}
         self.folders = {}
         self.catalogs = []
+        self.presentations = []
+
+        #hash indexes kept alongside the listings above for constant time lookups
+        self.templates_index = record_index(("Id", "id"), ("Name", "name"))
+        self.recorders_index = record_index(("id", "Id"), ("name", "Name"))
+        self.folders_index = record_index(("Id", "id"), ("Name", "name"), ("ParentFolderId", "parent_id"))
+        self.catalogs_index = record_index(("Id", "id"), ("Name", "name"), ("LinkedFolderId",))
+        self.presentations_index = record_index(("Id", "id"), ("Title", "title"), ("ParentFolderId", "parent_id"))
 
     def translate_recorder_id(self, recorder_name):
         """
@@ -33,19 +123,15 @@ class model():
         returns:
             resulting response from the mediasite web api request
         """
-        for recorder in self.recorders:
-            if recorder_name == recorder["name"]:
-                return recorder["id"]
+        recorder = self.recorders_index.get_by_name(recorder_name)
 
-        return ""
+        return self.recorders_index.get_id(recorder) if recorder else ""
 
     def translate_template_id(self, template_name):
 
-        for template in self.templates:
-            if template_name == template["Name"]:
-                return template["Id"]
+        template = self.templates_index.get_by_name(template_name)
 
-        return ""
+        return self.templates_index.get_id(template) if template else ""
 
     def translate_schedule_recurrence_naming(self, recurrence_label):
         translate_recurrence_dict = {
@@ -78,18 +164,22 @@ class model():
 
     def set_templates(self, templates):
         self.templates = templates
+        self.templates_index.set(templates)
 
     def get_templates(self):
         return self.templates
 
     def set_recorders(self, recorders):
         self.recorders = recorders
+        self.recorders_index.set(recorders)
 
     def get_recorders(self):
         return self.recorders
 
     def set_folders(self, folders, parent_id="root"):
         self.folders[parent_id] = folders
+        for folder in folders:
+            self.folders_index.add(folder)
 
     def get_folders(self):
         return self.folders
@@ -111,3 +201,50 @@ class model():
 
     def set_catalogs(self, catalogs):
         self.catalogs = catalogs
+        self.catalogs_index.set(catalogs)
+
+    def get_template_by_id(self, template_id):
+        return self.templates_index.get_by_id(template_id)
+
+    def get_template_by_name(self, template_name):
+        return self.templates_index.get_by_name(template_name)
+
+    def get_recorder_by_id(self, recorder_id):
+        return self.recorders_index.get_by_id(recorder_id)
+
+    def get_recorder_by_name(self, recorder_name):
+        return self.recorders_index.get_by_name(recorder_name)
+
+    def get_folder_by_id(self, folder_id):
+        return self.folders_index.get_by_id(folder_id)
+
+    def get_folders_by_name(self, folder_name):
+        return self.folders_index.get_all_by_name(folder_name)
+
+    def get_folders_by_parent_id(self, parent_id):
+        return self.folders_index.get_by_parent_id(parent_id)
+
+    def get_catalog_by_id(self, catalog_id):
+        return self.catalogs_index.get_by_id(catalog_id)
+
+    def get_catalog_by_name(self, catalog_name):
+        return self.catalogs_index.get_by_name(catalog_name)
+
+    def get_catalogs_by_folder_id(self, folder_id):
+        return self.catalogs_index.get_by_parent_id(folder_id)
+
+    def get_presentations(self):
+        return self.presentations
+
+    def set_presentations(self, presentations):
+        self.presentations = presentations
+        self.presentations_index.set(presentations)
+
+    def get_presentation_by_id(self, presentation_id):
+        return self.presentations_index.get_by_id(presentation_id)
+
+    def get_presentations_by_title(self, title):
+        return self.presentations_index.get_all_by_name(title)
+
+    def get_presentations_by_folder_id(self, folder_id):
+        return self.presentations_index.get_by_parent_id(folder_id)
@@ -8,6 +8,7 @@ License: MIT - see license.txt
 """
 
 import logging
+import assets.mediasite.odata as odata
 
 
 class catalog():
@@ -15,42 +16,64 @@ class catalog():
         self.mediasite = mediasite
         self.catalogs = list()
 
-    def get_all_catalogs(self):
+    def get_all_catalogs(self, query=None):
         """
         Gathers all mediasite catalogs
 
+        params:
+            query: odata.query or odata attribute string for the listing. Listings made with a query
+                are returned as is, only the default $select=full listing is kept for later calls.
+
         returns:
-            list of mediasite catalogs
+            list of mediasite catalogs, raises pager.incomplete_listing_error rather than returning
+            a listing with missing pages
         """
 
         logging.info("Gathering all catalogs.")
 
+        if query is not None:
+            odata_attributes, _ = odata.resolve_query(query)
+            return self.mediasite.pager.get_all("Catalogs", odata_attributes, page_size=100)
+
         if not self.catalogs:
-            catalogs = list()
-            current = 0
-            increment = 100
-
-            next_page = f'?$select=full&$skip={current}&$top={increment}'
-            while next_page:
-                result = self.mediasite.api_client.request("get", "Catalogs", next_page)
-                if not self.mediasite.experienced_request_errors(result):
-                    result = result.json()
-                    if 'odata.error' in result:
-                        logging.error(result["odata.error"]["code"] + ": " + result["odata.error"]["message"]["value"])
-                    else:
-                        data = result.get('value')
-                        catalogs.extend(data)
-                        next_link = result.get('odata.nextLink')
-                        next_page = next_link.split('?')[-1] if next_link else None
+            catalogs = self.mediasite.pager.get_all("Catalogs", '$select=full', page_size=100)
 
             self.mediasite.model.set_catalogs(catalogs)
             self.catalogs = catalogs
 
         return self.catalogs
 
-    def get_catalogs_presentations(self, catalog_id):
+    def iter_catalogs(self, query=None):
+        """
+        Generator over all mediasite catalogs, requested page by page so only a few pages are held in memory.
+
+        params:
+            query: odata.query or odata attribute string for the listing, defaults to $select=full
+
+        yields:
+            mediasite catalog records in listing order
+        """
+
+        logging.info("Iterating over all catalogs.")
+
+        odata_attributes, _ = odata.resolve_query(query)
+        for page in self.mediasite.pager.iter_pages("Catalogs", odata_attributes, page_size=100):
+            yield from page
+
+    def get_catalogs_presentations(self, catalog_id, query=None):
+        """
+        Gathers the presentations of a mediasite catalog
+
+        params:
+            catalog_id: mediasite catalog ID
+            query: odata.query or odata attribute string to project, expand, filter or sort the presentations
+
+        returns:
+            resulting json from the mediasite web api request
+        """
         route = f'Catalogs/(\'{catalog_id}\')/Presentations'
-        result = self.mediasite.api_client.request('get', route)
+        odata_attributes, _ = odata.resolve_query(query, None)
+        result = self.mediasite.api_client.request('get', route, odata_attributes)
 
         if not self.mediasite.experienced_request_errors(result):
             result = result.json()
@@ -73,16 +96,7 @@ class catalog():
 
         logging.info("Enabling catalog downloads for catalog: '"+catalog_id)
 
-        #prepare patch data to be sent to mediasite
-        patch_data = {"AllowPresentationDownload":"True"}
-
-        #make the mediasite request using the catalog id and the patch data found above to enable downloads
-        result = self.mediasite.api_client.request("patch", "Catalogs('"+catalog_id+"')/Settings", "", patch_data)
-
-        if self.mediasite.experienced_request_errors(result):
-            return result
-        else:
-            return result
+        return self.update_catalog_settings(catalog_id, {"AllowPresentationDownload":"True"})
 
     def disable_catalog_allow_links(self, catalog_id):
         """
@@ -99,16 +113,52 @@ class catalog():
 
         logging.info("Disabling catalog links for catalog: '"+catalog_id)
 
-        #prepare patch data to be sent to mediasite
-        patch_data = {"AllowCatalogLinks":"False"}
+        return self.update_catalog_settings(catalog_id, {"AllowCatalogLinks":"False"})
 
-        #make the mediasite request using the catalog id and the patch data found above to enable downloads
+    def update_catalog_settings(self, catalog_id, patch_data):
+        """
+        Updates mediasite catalog settings using provided catalog ID, several settings may be changed at once
+
+        Note: only returns a 204 http code on success
+
+        params:
+            catalog_id: mediasite catalog ID to update settings on
+            patch_data: dictionary of catalog settings, for ex. {"AllowPresentationDownload":"True", "AllowCatalogLinks":"False"}
+
+        returns:
+            resulting response from the mediasite web api request
+        """
+
+        #make the mediasite request using the catalog id and the patch data provided
         result = self.mediasite.api_client.request("patch", "Catalogs('"+catalog_id+"')/Settings", "", patch_data)
+        self.mediasite.api_client.invalidate_cache("Catalogs")
 
-        if self.mediasite.experienced_request_errors(result):
-            return result
-        else:
-            return result
+        self.mediasite.experienced_request_errors(result)
+
+        return result
+
+    def update_catalogs_settings(self, catalogs_settings):
+        """
+        Updates the settings of many mediasite catalogs, sent in as few $batch requests as possible
+
+        params:
+            catalogs_settings: dictionary of patch data by catalog ID, see update_catalog_settings
+
+        returns:
+            dictionary of resulting responses from the mediasite web api by catalog ID
+        """
+
+        logging.info(f'Updating settings for {len(catalogs_settings)} catalogs')
+
+        operations = [("patch", "Catalogs('"+catalog_id+"')/Settings", "", patch_data)
+                      for catalog_id, patch_data in catalogs_settings.items()]
+        results = self.mediasite.api_client.batch(operations)
+        self.mediasite.api_client.invalidate_cache("Catalogs")
+
+        for result in results:
+            self.mediasite.experienced_request_errors(result)
+
+        return dict(zip(catalogs_settings.keys(), results))
 
     def add_module_to_catalog(self, catalog_id, module_guid):
         """
@@ -129,6 +179,8 @@ class catalog():
 
         #make the mediasite request using the catalog id and the patch data found above to enable downloads
         result = self.mediasite.api_client.request("post", "Modules('"+module_guid+"')/AddAssociation", "", post_data)
+        self.mediasite.api_client.invalidate_cache("Modules")
+        self.mediasite.api_client.invalidate_cache("Catalogs")
 
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -159,6 +211,7 @@ class catalog():
             post_data["LinkedFolderId"] = parent_id
 
         result = self.mediasite.api_client.request("post", "Catalogs", "", post_data).json()
+        self.mediasite.api_client.invalidate_cache("Catalogs")
         
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -183,6 +236,7 @@ class catalog():
 
         #request mediasite folder information on the "Mediasite Users" folder
         result = self.mediasite.api_client.request("delete", "Catalogs('"+catalog_id+"')", "","")
+        self.mediasite.api_client.invalidate_cache("Catalogs")
 
         if self.mediasite.experienced_request_errors(result):
             return result
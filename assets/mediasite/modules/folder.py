@@ -8,6 +8,9 @@ License: MIT - see license.txt
 """
 
 import logging
+import assets.mediasite.folder_tree as folder_tree
+import assets.mediasite.folder_path_cache as folder_path_cache
+import assets.mediasite.odata as odata
 
 
 class folder():
@@ -15,14 +18,19 @@ class folder():
         self.mediasite = mediasite
         self.root_folder_id = self.get_root_folder_id()
         self.folders = list()
+        self.tree = None
+        self.path_cache = folder_path_cache.folder_path_cache()
 
-    def gather_folders(self, parent_id=None):
+    def gather_folders(self, parent_id=None, query=None):
         """
         Gathers mediasite child folder name, ID, and parent ID listing from mediasite system
         based on provided parent mediasite folder ID
 
         params:
             parent_id: mediasite parent folder ID for use as a reference point in this function
+            query: odata.query or odata attribute string further filtering or sorting the child folders,
+                selected properties must include Name, Id and ParentFolderId. Listings made with a
+                query are not stored on the model.
 
         returns:
             list of dictionary items containing child mediasite folder names, ID's, and parent folder ID's
@@ -37,6 +45,7 @@ class folder():
 
         #request existing (non-recycled) mediasite folder information based on parent folder ID provided to function
         query_params = f"$filter=ParentFolderId eq '{parent_id}' and Recycled eq false"
+        query_params = odata.resolve_scoped_query(query, f"ParentFolderId eq {odata.format_literal(parent_id)} and Recycled eq false", query_params)
         result = self.mediasite.api_client.request("get", "Folders", query_params)
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -50,7 +59,8 @@ class folder():
                 })
 
             #add the listing of folder data to the model for later use
-            self.mediasite.model.set_folders(ms_folders, parent_id)
+            if query is None:
+                self.mediasite.model.set_folders(ms_folders, parent_id)
 
             return ms_folders
 
@@ -107,6 +117,7 @@ class folder():
 
         #make the mediasite request using the post data found above to create the folder
         result = self.mediasite.api_client.request("post", "Folders", "", post_data).json()
+        self.mediasite.api_client.invalidate_cache("Folders")
 
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -114,6 +125,8 @@ class folder():
             #if there is an error, log it
             if "odata.error" in result:
                 logging.error(result["odata.error"]["code"]+": "+result["odata.error"]["message"]["value"])
+            elif self.tree is not None:
+                self.tree.add(result)
 
             return result
 
@@ -183,32 +196,33 @@ class folder():
             details of schedules and presentations found within mediasite folder
         """
 
-        folder = mediasite.folder.get_folder_by_name(folder_name)
+        presentations = []
+        schedules = []
 
-        if int(folder.json()["odata.count"]) > 0:
-            parent_id = folder.json()["value"][0]["Id"]
+        tree = self.get_folder_tree()
+        matching_folders = tree.get_folders_by_name(folder_name)
 
-            child_folders = mediasite.folder.get_child_folders(parent_id)
-            child_folders.append(folder.json()["value"][0])
+        if matching_folders:
+            parent_folder = matching_folders[0]
 
-            presentations = []
-            schedules = []
+            child_folders = tree.get_descendants(parent_folder["Id"])
+            child_folders.append(parent_folder)
 
             for folder in child_folders:
-                presentations_result = mediasite.folder.get_folder_presentations(folder["Id"])
-                [presentations.append(presentation) for presentation in presentations_result.json()["value"]]
-                schedules_result = mediasite.folder.get_folder_schedules(folder["Id"])
-                print(schedules_result.json())
-                [schedules.append(schedule) for schedule in schedules_result.json()["value"]]
+                presentations.extend(self.get_folder_presentations(folder["Id"]))
+                schedules_result = self.get_folder_schedules(folder["Id"])
+                if not self.mediasite.experienced_request_errors(schedules_result):
+                    schedules.extend(schedules_result.json()["value"])
 
         return presentations, schedules
 
-    def get_folder_schedules(self, parent_id):
+    def get_folder_schedules(self, parent_id, query=None):
         """
         Gathers schedules found under mediasite folder given folder's id
 
         params:
             parent_id: id of mediasite folder
+            query: odata.query or odata attribute string to project, filter or sort the schedules
 
         returns:
             details of schedules found within mediasite folder
@@ -218,49 +232,55 @@ class folder():
 
         logging.info("Finding Mediasite presentations under parent: "+parent_id)
 
-        result = self.mediasite.api_client.request("get", "Schedules", "$top=100&$filter=FolderId eq '"+parent_id+"'","")
+        odata_attributes = odata.resolve_scoped_query(query, "FolderId eq "+odata.format_literal(parent_id), "$filter=FolderId eq '"+parent_id+"'")
+        result = self.mediasite.api_client.request("get", "Schedules", odata.add_default_attribute(odata_attributes, "$top", 100),"")
 
         if self.mediasite.experienced_request_errors(result):
             return result
         else:
             return result
 
-    def get_folder_presentations(self, parent_id):
+    def get_folder_presentations(self, parent_id, query=None):
         """
         Gathers presentations found under mediasite folder given folder's id
 
         params:
             parent_id: id of mediasite folder
-            all_data: having all web api response
+            query: odata.query or odata attribute string for the listing, defaults to $select=full
 
         returns:
-            details of presentations found within mediasite folder,
-            only id, title, and owner if all_data is disabled
+            details of presentations found within mediasite folder
 
         """
 
-        logging.debug("Finding Mediasite presentations under parent: " + parent_id)
+        return list(self.iter_folder_presentations(parent_id, query))
 
-        increment = 50
-        folder_presentations = []
+    def iter_folder_presentations(self, parent_id, query=None):
+        """
+        Generator over presentations found under mediasite folder given folder's id,
+        requested page by page so only a few pages are held in memory.
 
-        next_page = f'$select=full&$skip=0&$top={increment}'
-        while next_page:
-            result = self.mediasite.api_client.request("get", f"Folders(\'{parent_id}\')/Presentations", next_page)
-            if not self.mediasite.experienced_request_errors(result):
-                result = result.json()
-                data = result['value']
-                folder_presentations.extend(data)
-                next_link = result.get('odata.nextLink')
-                next_page = next_link.split('?')[-1] if next_link else None
-        return folder_presentations
+        params:
+            parent_id: id of mediasite folder
+            query: odata.query or odata attribute string for the listing, defaults to $select=full
 
-    def get_folder_catalogs(self, parent_id):
+        yields:
+            details of presentations found within mediasite folder
+        """
+
+        logging.debug("Finding Mediasite presentations under parent: " + parent_id)
+
+        odata_attributes, _ = odata.resolve_query(query)
+        for page in self.mediasite.pager.iter_pages(f"Folders(\'{parent_id}\')/Presentations", odata_attributes, page_size=50):
+            yield from page
+
+    def get_folder_catalogs(self, parent_id, query=None):
         """
         Gathers presentations found under mediasite folder given folder's id
 
         params:
             parent_id: id of mediasite folder
+            query: odata.query or odata attribute string to project, filter or sort the catalogs
 
         returns:
             details of presentations found within mediasite folder
@@ -269,7 +289,8 @@ class folder():
         logging.info(f'Finding Mediasite catalogs under folder parent: {parent_id}')
 
         data = list()
-        next_page = f"$top=600&$filter=LinkedFolderId eq '{parent_id}'"
+        next_page = odata.add_default_attribute(odata.resolve_scoped_query(query, "LinkedFolderId eq "+odata.format_literal(parent_id),
+                                                                           f"$filter=LinkedFolderId eq '{parent_id}'"), "$top", 600)
         result = self.mediasite.api_client.request("get", "Catalogs", next_page)
 
         next_page = str()
@@ -287,9 +308,10 @@ class folder():
 
         return data
 
-    def get_child_folders(self, parent_id, child_result=[]):
+    def get_child_folders(self, parent_id, child_result=None):
         """
-        Gathers mediasite child folders given parent id of a folder
+        Gathers mediasite child folders given parent id of a folder, making one request per folder.
+        See get_descendant_folders for an in-memory alternative.
 
         params:
             parent_id: id of mediasite folder
@@ -298,6 +320,9 @@ class folder():
             list of child folder id's associated with the given parent folder id
         """
 
+        if child_result is None:
+            child_result = []
+
         logging.debug("Finding child Mediasite folders under parent: "+parent_id)
 
         result = self.mediasite.api_client.request("get", "Folders", "$top=100&$filter=ParentFolderId eq '"+parent_id+"' and Recycled eq false","")
@@ -353,36 +378,109 @@ class folder():
         else:
             return result
 
-    def get_all_folders(self, max_folders=None):
+    def get_all_folders(self, max_folders=None, query=None):
         """
         Gathers all mediasite folders name, ID, and parent ID listing from mediasite system
 
+        params:
+            max_folders: stop after gathering this number of folders
+            query: odata.query or odata attribute string for the listing. Listings made with a query
+                are returned as is, only the default $select=full listing is stored on the model.
+
         returns:
-            list of dictionary items containing mediasite folder names, owner, ID's and parent folder ID's
+            list of dictionary items containing mediasite folder names, owner, ID's and parent folder ID's,
+            raises pager.incomplete_listing_error rather than returning a listing with missing pages
         """
 
         logging.info("Gathering all Mediasite folders")
 
+        if query is not None:
+            odata_attributes, _ = odata.resolve_query(query)
+            return self.mediasite.pager.get_all('Folders', odata_attributes, page_size=1000, max_items=max_folders)
+
         if not self.folders:
-            increment = 1000
-            folders = []
-            next_page = f'$skip=0&$top={increment}&$select=full'
-            while next_page:
-                result = self.mediasite.api_client.request('get', 'Folders', next_page)
-                if not self.mediasite.experienced_request_errors(result):
-                    result = result.json()
-                    folder = result['value']
-                    folders.extend(folder)
-                    next_link = result.get('odata.nextLink')
-                    next_page = next_link.split('?')[-1] if next_link else None
-                if max_folders and len(folders) > int(max_folders):
-                    break
+            folders = self.mediasite.pager.get_all('Folders', '$select=full', page_size=1000, max_items=max_folders)
 
             self.mediasite.model.set_folders(folders)
             self.folders = folders
 
         return self.folders
 
+    def iter_folders(self, max_folders=None, query=None):
+        """
+        Generator over all mediasite folders, requested page by page so only a few pages are held in memory.
+        Unlike get_all_folders the result is not stored on the model.
+
+        params:
+            max_folders: stop after gathering this number of folders
+            query: odata.query or odata attribute string for the listing, defaults to $select=full
+
+        yields:
+            mediasite folder records in listing order
+        """
+
+        logging.info("Iterating over all Mediasite folders")
+
+        odata_attributes, _ = odata.resolve_query(query)
+        for page in self.mediasite.pager.iter_pages('Folders', odata_attributes, page_size=1000, max_items=max_folders):
+            yield from page
+
+    def get_folder_tree(self, refresh=False):
+        """
+        Gathers an in-memory index of the whole folder hierarchy, built once from the bulk folder listing
+
+        params:
+            refresh: rebuild the index from a new folder listing
+
+        returns:
+            folder_tree of all non-recycled folders under the root folder
+        """
+
+        if refresh:
+            self.folders = list()
+            self.tree = None
+
+        if self.tree is None:
+            self.tree = folder_tree.folder_tree(self.get_all_folders(), self.root_folder_id)
+
+        return self.tree
+
+    def get_descendant_folders(self, parent_id):
+        """
+        Gathers all mediasite folders beneath a folder using the folder tree rather than one request per folder
+
+        params:
+            parent_id: id of mediasite folder
+
+        returns:
+            list of folder records beneath the given parent folder id, parents before their children
+        """
+
+        return self.get_folder_tree().get_descendants(parent_id)
+
+    def get_folder_id_by_path(self, folder_path, root_id=None):
+        """
+        Resolves a folder path to a folder id using the folder tree
+
+        params:
+            folder_path: mediasite management portal folder path, for ex "/Current/Spring 2018/Test"
+            root_id: id of the folder the path starts from, defaults to the root folder
+
+        returns:
+            id of the folder, None if the path was not found
+        """
+
+        root_id = root_id or self.root_folder_id
+        folder_ids = self.get_folder_tree().get_ids_by_path(folder_path, root_id)
+        if folder_ids is None:
+            return None
+
+        #remember the folders found so parse_and_create_folders does not request them again
+        folder_names = [folder_name for folder_name in folder_path.split("/") if folder_name != ""]
+        self.path_cache.add(root_id, folder_names, folder_ids)
+
+        return folder_ids[-1] if folder_ids else root_id
+
     def parse_and_create_folders(self, folders, parent_id=""):
         """
         Parse the provided path of folders in the GUI, delimeted by "/" and create each
@@ -398,18 +496,10 @@ class folder():
         if parent_id == "":
             parent_id = self.mediasite.model.get_root_parent_folder_id()
 
-        folders_list = folders.split("/")
+        folders_list = [folder for folder in folders.split("/") if folder != ""]
 
-        #loop through our folders list creating each folder using the parent of the last
-        for folder in folders_list:
-            if folder != "":
-                result = self.create_folder(folder, parent_id)
-                if "Id" in result:
-                    parent_id = result["Id"]
-                else:
-                    break
-
-        return parent_id
+        #create each folder using the parent of the last, folders found or created before are not requested again
+        return self.path_cache.resolve(parent_id, folders_list, self.create_folder)
 
     def delete_folder(self, folder_id):
         """
@@ -425,6 +515,11 @@ class folder():
         logging.info("Deleting mediasite folder with guid of: "+folder_id)
 
         result = self.mediasite.api_client.request("post", "Folders('"+folder_id+"')/DeleteFolder", "",{})
+        self.mediasite.api_client.invalidate_cache("Folders")
+        self.path_cache.clear()
+        self.mediasite.api_client.invalidate_cache("Presentations")
+        self.mediasite.api_client.invalidate_cache("Schedules")
+        self.mediasite.api_client.invalidate_cache("Catalogs")
 
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -443,40 +538,29 @@ class folder():
             response from mediasite system
         """
 
-        parent_id = ""
-
-        #for each folder found in provided path, find it by name and parent folder guid
-
-        for folder_name in folder_path.split("/")[1:]:
-            result = self.mediasite.folder.find_folder_by_name_and_parent_id(folder_name, parent_id)
-            if int(result["odata.count"]) > 0:
-                for item in result["value"]:
-                    if item["Name"] == folder_name:
-                        parent_id = item["Id"]
-            else:
-                #if we don't find one of the folders in the provided path, return to stop this function from continuing
-                logging.error("Unable to find folder in provided path: "+folder_name)
-                return
+        #resolve the provided path using the folder tree rather than one request per folder name
+        parent_id = self.get_folder_id_by_path(folder_path)
+        if parent_id is None:
+            #if we don't find one of the folders in the provided path, return to stop this function from continuing
+            logging.error("Unable to find folder in provided path: "+folder_path)
+            return
 
         #remove "recorded" presentations and schedules as these can prevent folders from being deleted
-        child_folders = self.mediasite.folder.get_child_folders(parent_id)
-        child_folders.append({"Id":parent_id})
+        #folders are handled children first, ending with the folder itself
+        child_folders = list(reversed(self.get_descendant_folders(parent_id))) + [{"Id":parent_id}]
 
         #gather catalogs as these will be needed later
         self.mediasite.catalog.get_all_catalogs()
-        catalogs = self.mediasite.model.get_catalogs()
 
-        for folder in child_folders:
-            folder_presentations = self.mediasite.folder.get_folder_presentations(folder["Id"])
+        #folder deletion jobs are tracked by folder id so sibling folders are deleted while the next folder is being cleared
+        folder_jobs = {}
 
+        for folder in child_folders:
             #presentation loop to remove presentations with a status of "Recorded" or "Record"
-            folder_presentations_json = folder_presentations.json()
-            if int(folder_presentations_json["odata.count"]) > 0:
-                for presentation in folder_presentations_json["value"]:
-                    print(presentation["Status"])
-                    #if presentation["Status"] == "Recorded" or presentation["Status"] == "Record":
-                    logging.info("Deleting presentation "+presentation["Title"]+" to ensure capability to delete parent folder(s).")
-                    delete_result = self.mediasite.presentation.delete_presentation(presentation["Id"])
+            for presentation in self.mediasite.folder.get_folder_presentations(folder["Id"]):
+                #if presentation["Status"] == "Recorded" or presentation["Status"] == "Record":
+                logging.info("Deleting presentation "+presentation["Title"]+" to ensure capability to delete parent folder(s).")
+                delete_result = self.mediasite.presentation.delete_presentation(presentation["Id"])
 
             #schedule loop to remove schedules
             folder_schedules = self.mediasite.folder.get_folder_schedules(folder["Id"])
@@ -486,18 +570,21 @@ class folder():
                     logging.info("Deleting schedule "+ schedule["Name"]+" to ensure capability to delete parent folder(s).")
                     delete_result = self.mediasite.schedule.delete_schedule(schedule["Id"])
 
-            for catalog in catalogs:
-                if catalog["LinkedFolderId"] == folder["Id"]:
-                    logging.info("Deleting catalog "+catalog["Id"]+" to ensure capability to delete parent folder(s).")
-                    self.mediasite.catalog.delete_catalog(catalog["Id"])
+            for catalog in self.mediasite.model.get_catalogs_by_folder_id(folder["Id"]):
+                logging.info("Deleting catalog "+catalog["Id"]+" to ensure capability to delete parent folder(s).")
+                self.mediasite.catalog.delete_catalog(catalog["Id"])
 
-            result = self.mediasite.folder.delete_folder(folder["Id"])
-            job_result = self.mediasite.wait_for_job_to_complete(result.json()["odata.id"])
+            #a folder is deleted only once the deletion jobs of its child folders ended
+            for child_folder in self.get_folder_tree().get_children(folder["Id"]):
+                folder_jobs[child_folder["Id"]].result()
 
+            result = self.mediasite.folder.delete_folder(folder["Id"])
+            folder_jobs[folder["Id"]] = self.mediasite.job_tracker.track(result.json()["odata.id"])
 
-        result = self.mediasite.folder.delete_folder(parent_id)
+        job_result = folder_jobs[parent_id].result()
 
-        job_result = self.mediasite.wait_for_job_to_complete(result.json()["odata.id"])
+        #the deleted folders are no longer part of the tree
+        self.get_folder_tree().remove(parent_id)
 
         #note: this appears to be the only way with these particular jobs to determine a successful run (despite actual message contents)
         if job_result:
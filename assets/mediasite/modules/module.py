@@ -32,6 +32,7 @@ class module():
                     }
 
         result = self.controller.api_client.request("post", "Modules", "", post_data).json()
+        self.controller.api_client.invalidate_cache("Modules")
 
         if self.controller.experienced_request_errors(result):
             return result
@@ -41,6 +42,20 @@ class module():
 
             return result
 
+    def get_all_module_ids(self):
+        """
+        Gathers the moduleid of every existing mediasite module, for checking many moduleids without a request each
+
+        returns:
+            set of existing moduleids
+        """
+
+        logging.info("Gathering all Mediasite module ids")
+
+        modules = self.controller.pager.get_all("Modules", "", page_size=1000)
+
+        return {module["ModuleId"] for module in modules if module.get("ModuleId")}
+
     def module_moduleid_already_exists(self, module_id):
         """
         Determine whether the provided moduleid already exists
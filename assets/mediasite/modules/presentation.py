@@ -8,54 +8,62 @@ License: MIT - see license.txt
 """
 
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import assets.mediasite.odata as odata
+
+ENRICHMENT_STAGES = ("details", "presenters", "availability", "content", "analytics")
 
 
 class presentation():
     def __init__(self, mediasite, *args, **kwargs):
         self.mediasite = mediasite
 
-    def get_all_presentations(self):
+    def get_all_presentations(self, query=None):
         """
         Gathers a listing of all presentations.
 
+        params:
+            query: odata.query or odata attribute string to project, expand, filter or sort the listing,
+                for ex. odata.query(select="full", expand=["Presenters", "OnDemandContent"]). Defaults to $select=full.
+
         returns:
-            resulting response from the mediasite web api request
+            resulting response from the mediasite web api request, raises pager.incomplete_listing_error
+            rather than returning a listing with missing pages
         """
         logging.info("Getting a list of all presentations. Take a few minutes...")
 
-        #request mediasite folder information on the "Mediasite Users" folder
-        current = 0
+        odata_attributes, full = odata.resolve_query(query)
+
         # 1000 increment is usually the pre-configured maximum on Mediasite API
-        increment = 1000
-        presentations_list = []
-
-        next_page = f'$select=full&$skip={str(current)}&$top={str(increment)}'
-        while next_page:
-            result = self.mediasite.api_client.request('get', 'Presentations', next_page)
-            if not self.mediasite.experienced_request_errors(result):
-                result = result.json()
-                if "odata.error" in result:
-                    logging.error(result["odata.error"]["code"] + ": " + result["odata.error"]["message"]["value"])
-                else:
-                    data = result['value']
-                    presentations_list.extend(data)
+        presentations = self.mediasite.pager.get_all('Presentations', odata_attributes, page_size=1000)
 
-                    next_link = result.get('odata.nextLink')
-                    next_page = next_link.split('?')[-1] if next_link else None
+        #add the listing of presentations to the model for later lookups, partial records would break them
+        if full:
+            self.mediasite.model.set_presentations(presentations)
 
-        return presentations_list
+        return presentations
 
-    def get_number_of_presentations(self):
-        data = int()
-        next_page = '$skip=0&$top=1'
-        result = self.mediasite.api_client.request("get", "Presentations", next_page)
-        if not self.mediasite.experienced_request_errors(result):
-            result = result.json()
-            if "odata.error" in result:
-                logging.error(result["odata.error"]["code"] + ": " + result["odata.error"]["message"]["value"])
-            else:
-                data = int(result['odata.count'])
-        return data
+    def iter_presentations(self, query=None):
+        """
+        Generator over all presentations, requested page by page so only a few pages are held in memory.
+
+        params:
+            query: odata.query or odata attribute string for the listing, defaults to $select=full
+
+        yields:
+            presentation records in listing order
+        """
+        logging.info("Iterating over all presentations.")
+
+        odata_attributes, _ = odata.resolve_query(query)
+        for page in self.mediasite.pager.iter_pages('Presentations', odata_attributes, page_size=1000):
+            yield from page
+
+    def get_number_of_presentations(self, query=None):
+        odata_attributes, _ = odata.resolve_query(query, "")
+        return self.mediasite.pager.get_count("Presentations", odata_attributes)
 
     def get_presentation_by_id(self, presentation_id, full=False):
         """
@@ -190,6 +198,103 @@ class presentation():
 
         return data
 
+    def enrich_presentations(self, presentation_ids, content_types=("OnDemandContent", "SlideDetailsContent"),
+                             include_analytics=True, max_workers=None, max_pending=None):
+        """
+        Generator which gathers the details, presenters, availability, content and analytics of many
+        presentations. The requests of each stage run on their own worker pool, so all requests for a
+        presentation are in flight at once and a slow stage does not hold up the others.
+
+        params:
+            presentation_ids: iterable of presentation guids, consumed lazily
+            content_types: content resources to gather for each presentation, for ex. "OnDemandContent"
+            include_analytics: whether presentation analytics are gathered
+            max_workers: workers per stage, either a number used for every stage or a dictionary
+                keyed by stage name ("details", "presenters", "availability", "content", "analytics").
+                Defaults to the controller setting.
+            max_pending: number of presentations in flight at one time, defaults to twice the largest stage pool
+
+        yields:
+            presentation records with "Presenters", "Availability", one key per content type and
+            "Analytics" added, in the order they complete
+        """
+        default_workers = self.mediasite.max_workers
+        if isinstance(max_workers, dict):
+            stage_workers = {stage: max_workers.get(stage, default_workers) for stage in ENRICHMENT_STAGES}
+        else:
+            stage_workers = {stage: max_workers or default_workers for stage in ENRICHMENT_STAGES}
+
+        max_pending = max_pending or 2 * max(stage_workers.values())
+        executors = {stage: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'enrich_{stage}')
+                     for stage, workers in stage_workers.items()}
+
+        completed = queue.Queue()
+        lock = threading.Lock()
+        pending = {}
+
+        def submit(presentation_id):
+            requests = [("details", None, self.get_presentation_by_id, (presentation_id, True)),
+                        ("presenters", "Presenters", self.get_presenters, (presentation_id,)),
+                        ("availability", "Availability", self.get_availability, (presentation_id,))]
+            requests += [("content", content_type, self.get_content, (presentation_id, content_type))
+                         for content_type in content_types]
+            if include_analytics:
+                requests.append(("analytics", "Analytics", self.get_analytics, (presentation_id,)))
+
+            entry = {"id": presentation_id, "futures": [], "remaining": len(requests)}
+            pending[presentation_id] = entry
+
+            def done(future):
+                with lock:
+                    entry["remaining"] -= 1
+                    finished = entry["remaining"] == 0
+                if finished:
+                    completed.put(entry)
+
+            for stage, key, function, args in requests:
+                future = executors[stage].submit(function, *args)
+                entry["futures"].append((key, future))
+                future.add_done_callback(done)
+
+        def assemble(entry):
+            record = {"Id": entry["id"]}
+            for key, future in entry["futures"]:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.error(f'Unable to gather {key or "details"} for presentation {entry["id"]}: {e}')
+                    result = None
+
+                if key is None:
+                    record.update(result or {})
+                else:
+                    record[key] = result
+            return record
+
+        logging.info(f'Enriching presentations with stage workers {stage_workers}')
+
+        presentation_ids = iter(presentation_ids)
+        try:
+            while 1:
+                #keep the pipeline full without reading the whole id listing up front
+                while len(pending) < max_pending:
+                    presentation_id = next(presentation_ids, None)
+                    if presentation_id is None:
+                        break
+                    #the same id may be listed twice, it only needs gathering once
+                    if presentation_id not in pending:
+                        submit(presentation_id)
+
+                if not pending:
+                    break
+
+                entry = completed.get()
+                del pending[entry["id"]]
+                yield assemble(entry)
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+
     def delete_presentation(self, presentation_id):
         """
         Deletes mediasite presentation given presentation guid
@@ -205,6 +310,7 @@ class presentation():
 
         #request mediasite folder information on the "Mediasite Users" folder
         result = self.mediasite.api_client.request("delete", "Presentations('presentation_id')")
+        self.mediasite.api_client.invalidate_cache("Presentations")
 
         if self.mediasite.experienced_request_errors(result):
             return result
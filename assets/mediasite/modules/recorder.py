@@ -8,15 +8,22 @@ License: MIT - see license.txt
 """
 
 import logging
+import time
+import assets.mediasite.odata as odata
+from concurrent.futures import ThreadPoolExecutor
 
 class recorder():
     def __init__(self, mediasite, *args, **kwargs):
         self.mediasite = mediasite
 
-    def gather_recorders(self):
+    def gather_recorders(self, query=None):
         """
         Gathers mediasite recorder name listing from mediasite system
 
+        params:
+            query: odata.query or odata attribute string to filter or sort the recorders, selected
+                properties must include Name and Id. Listings made with a query are not stored on the model.
+
         returns:
             list of mediasite recorder names from mediasite system
         """
@@ -26,7 +33,8 @@ class recorder():
         logging.info("Gathering Mediasite recorders")
 
         #request mediasite recorder information from mediasite
-        result = self.mediasite.api_client.request("get", "Recorders", "$top=100", "")
+        odata_attributes = "$top=100" if query is None else odata.add_default_attribute(odata.resolve_query(query)[0], "$top", 100)
+        result = self.mediasite.api_client.request("get", "Recorders", odata_attributes, "")
         
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -36,13 +44,41 @@ class recorder():
                 ms_recorders.append({"name":recorder["Name"],"id":recorder["Id"]})
 
             #add the listing of recorder names to the model for later use
-            self.mediasite.model.set_recorders(ms_recorders)
+            if query is None:
+                self.mediasite.model.set_recorders(ms_recorders)
 
             return ms_recorders
 
-    def gather_recorder_status(self, recorder_whitelist=[]):
+    def gather_single_recorder_status(self, recorder, timeout=None):
+        """
+        Gathers the status of a single mediasite recorder
+
+        params:
+            recorder: recorder dictionary from the model containing "name" and "id"
+            timeout: seconds to wait for the recorder status before giving up, no limit if None
+
+        returns:
+            mediasite recorder status with the recorder name added, RecorderState is "Unknown" if it could not be gathered
         """
-        Gathers mediasite recorder status listing from mediasite system
+
+        logging.info("Finding recorder status information for recorder: " + recorder["name"])
+
+        #status polls are not retried so the timeout is a deadline for the recorder, the next poll asks again
+        result = self.mediasite.api_client.request("get", "Recorders('"+recorder["id"]+"')/Status", "", "", timeout=timeout, max_retries=0)
+
+        if self.mediasite.experienced_request_errors(result):
+            logging.error("Unable to gather status for recorder: " + recorder["name"])
+            result_json = {"RecorderState": "Unknown"}
+        else:
+            result_json = result.json()
+
+        result_json["Name"] = recorder["name"]
+        return result_json
+
+    def gather_recorder_status(self, recorder_whitelist=[], max_workers=None, timeout=None):
+        """
+        Gathers mediasite recorder status listing from mediasite system, requesting
+        the status of several recorders at one time
 
         note: can be the following:
             Unknown
@@ -57,23 +93,60 @@ class recorder():
             OpeningSession
             ConfiguringDevices
 
+        params:
+            recorder_whitelist: names of recorders to leave out of the listing
+            max_workers: number of recorder statuses requested at one time, defaults to the controller setting
+            timeout: seconds to wait for each recorder status before giving up, no limit if None
+
         returns:
-            list of mediasite recorder status from mediasite system
+            list of mediasite recorder status from mediasite system, in model order
         """
 
-        result_list = []
+        recorders = [recorder for recorder in self.mediasite.model.get_recorders()
+                     if recorder["name"] not in recorder_whitelist]
 
-        for recorder in self.mediasite.model.get_recorders():
-            if recorder["name"] in recorder_whitelist:
-                continue
+        if not recorders:
+            return []
 
-            logging.info("Finding recorder status information for recorder: " + recorder["name"])
-            result = self.mediasite.api_client.request("get", "Recorders('"+recorder["id"]+"')/Status", "", "")
-            result_json = result.json()
-            result_json["Name"] = recorder["name"]
-            result_list.append(result_json)
+        max_workers = max_workers or self.mediasite.max_workers
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(recorders))) as executor:
+            return list(executor.map(lambda recorder: self.gather_single_recorder_status(recorder, timeout), recorders))
+
+    def watch_recorder_status(self, interval=30, recorder_whitelist=[], max_workers=None, timeout=None, max_sweeps=None):
+        """
+        Generator which repeatedly gathers recorder status and streams the changes
+
+        params:
+            interval: seconds between the start of each status sweep
+            recorder_whitelist: names of recorders to leave out of the listing
+            max_workers: number of recorder statuses requested at one time, defaults to the controller setting
+            timeout: seconds to wait for each recorder status before giving up, defaults to half the interval
+            max_sweeps: stop after this number of sweeps, runs until the consumer stops if None
+
+        yields:
+            mediasite recorder status whenever it differs from the previous sweep, every status on the first sweep
+        """
+
+        if not self.mediasite.model.get_recorders():
+            self.gather_recorders()
+
+        last_status = {}
+        sweeps = 0
+
+        if timeout is None:
+            timeout = interval / 2
+
+        while max_sweeps is None or sweeps < max_sweeps:
+            sweep_start = time.monotonic()
+
+            for status in self.gather_recorder_status(recorder_whitelist, max_workers, timeout):
+                if last_status.get(status["Name"]) != status:
+                    last_status[status["Name"]] = status
+                    yield status
 
-        return result_list
+            sweeps += 1
+            if max_sweeps is None or sweeps < max_sweeps:
+                time.sleep(max(0, interval - (time.monotonic() - sweep_start)))
 
     def gather_recorder_scheduled_recordings(self, recorder_id):
         """
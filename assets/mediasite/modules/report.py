@@ -16,14 +16,52 @@ import sys
 import urllib.request
 import requests
 import pandas as pd
-from xml.sax import parse
-from assets.misc.ExcelHandler import ExcelHandler
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from itertools import islice
+from assets.misc.ExcelHandler import parse_sheet_columns, iter_sheet_rows, rows_to_columns
+import assets.mediasite.report_cache as report_cache
 from xml.etree.cElementTree import iterparse
 
+#worksheets of presentation report excel xml exports
+PRESENTATION_REPORT_SUMMARY_SHEET = 0
+PRESENTATION_REPORT_PRESENTATION_SHEET = 3
+
+def load_presentation_report_file(filepath, use_cache=True, cache_dir=None):
+    """
+    Loads the summary and presentation sheets of a downloaded presentation report without a
+    Mediasite connection. Used as the process pool worker of report.load_many_presentation_reports.
+
+    params:
+        filepath: filepath to the presentation report excel xml
+        use_cache: whether the report cache is used
+        cache_dir: directory for cached report sheets, next to the report if None
+
+    returns:
+        pandas dataframes of the presentation report summary and presentations
+    """
+
+    reader = report(None, config_data={"mediasite_report_cache":use_cache, "mediasite_report_cache_dir":cache_dir})
+    return reader.load_presentation_report_sheets(filepath)
+
 class report():
-    def __init__(self, mediasite, *args, **kwargs):
+    def __init__(self, mediasite, *args, config_data=None, **kwargs):
+        """
+        params:
+            mediasite: controller used to make requests, None when only parsing downloaded reports
+            config_data: configuration used in place of the controller configuration
+        """
         self.mediasite = mediasite
 
+        if config_data is None:
+            config_data = mediasite.config_data if mediasite else {}
+
+        #parsed report sheets are cached next to the downloaded reports unless disabled
+        if config_data.get("mediasite_report_cache", True):
+            self.sheet_cache = report_cache.report_cache(config_data.get("mediasite_report_cache_dir"))
+        else:
+            self.sheet_cache = None
+
     def find_presentation_report_id_by_name(self, presentation_report_name):
         """
         find a presentation report id by name
@@ -71,14 +109,27 @@ class report():
         Note: waits for job to complete before returning
         """
 
-        logging.info("Executing presentation report")
-        presentation_report_execute_json = self.mediasite.api_client.request("post","PresentationReports('"+presentation_report_id+"')/Execute", "", {}).json()
+        presentation_report_execute_json = self.start_presentation_report_execution(presentation_report_id)
 
         #wait for the report to be generated
         self.mediasite.wait_for_job_to_complete(presentation_report_execute_json["JobLink"])
 
         return presentation_report_execute_json
 
+    def start_presentation_report_execution(self, presentation_report_id):
+        """
+        starts execution of a mediasite presentation report by it's mediasite id without waiting for it
+
+        params:
+            presentation_report_id: id of the mediasite presentation report
+
+        returns:
+            resulting response from the mediasite web api request, containing the JobLink and ResultId
+        """
+
+        logging.info("Executing presentation report")
+        return self.mediasite.api_client.request("post","PresentationReports('"+presentation_report_id+"')/Execute", "", {}).json()
+
     def execute_storage_report(self, storage_report_id):
         """
         executes (initiates) mediasite presentation report by it's mediasite id
@@ -113,15 +164,42 @@ class report():
         """
 
         #make request for report file to be generated
-        presentation_report_execute_export_json = self.mediasite.api_client.request("post", "PresentationReports('"+presentation_report_id+"')/Export", "", {"ResultId":presentation_report_result_id,"FileFormat":download_type}).json()
+        presentation_report_execute_export_json = self.start_presentation_report_export(presentation_report_id, presentation_report_result_id, download_type)
 
         #wait for the job to finish
         self.mediasite.wait_for_job_to_complete(presentation_report_execute_export_json["JobLink"])
-        logging.info("Attempting to download report from url: "+presentation_report_execute_export_json["DownloadLink"])
+
+        self.download_report_file(presentation_report_execute_export_json["DownloadLink"], download_filename)
+
+    def start_presentation_report_export(self, presentation_report_id, presentation_report_result_id, download_type):
+        """
+        Requests a Mediasite presentation report file be generated without waiting for it
+
+        params:
+            presentation_report_id: Mediasite GUID for relevant report
+            presentation_report_result_id: Mediasite GUID for relevant report result (data)
+            download_type: type of file to request, for ex. "Excel" or "XML"
+
+        returns:
+            resulting response from the mediasite web api request, containing the JobLink and DownloadLink
+        """
+
+        return self.mediasite.api_client.request("post", "PresentationReports('"+presentation_report_id+"')/Export", "", {"ResultId":presentation_report_result_id,"FileFormat":download_type}).json()
+
+    def download_report_file(self, download_link, download_filename):
+        """
+        Downloads a generated Mediasite report file as a stream
+
+        params:
+            download_link: DownloadLink of the report export
+            download_filename: name of the resulting downloaded report data file
+        """
+
+        logging.info("Attempting to download report from url: "+download_link)
 
         #download the file as a stream
         with open(download_filename, 'wb') as handle:
-            presentation_report_job_rsp = self.mediasite.api_client.request("get stream",presentation_report_execute_export_json["DownloadLink"],"","")
+            presentation_report_job_rsp = self.mediasite.api_client.request("get stream",download_link,"","")
             for block in presentation_report_job_rsp.iter_content(1024):
                 handle.write(block)
 
@@ -216,12 +294,141 @@ class report():
             pandas dataframe containing data from the presentation report summary
         """
 
-        #build and use parser
-        excelHandler = ExcelHandler()
-        parse(filepath, excelHandler)
+        #only the first sheet is read, parsing stops once it ends
+        return self.load_presentation_report_frames(filepath, [PRESENTATION_REPORT_SUMMARY_SHEET])[PRESENTATION_REPORT_SUMMARY_SHEET]
+
+    def load_presentation_report_presentation_sheet(self, filepath):
+        """
+        Function for parsing excel xml presentation data from a downloaded presentation report
+
+        params:
+            filepath: filepath to the presentation report excel xml
+
+        returns:
+            pandas dataframe containing data from the presentation report presentations
+        """
+
+        return self.load_presentation_report_frames(filepath, [PRESENTATION_REPORT_PRESENTATION_SHEET])[PRESENTATION_REPORT_PRESENTATION_SHEET]
+
+    def load_presentation_report_sheets(self, filepath):
+        """
+        Function for parsing both the summary and presentation data of a downloaded presentation report
+        in a single pass over the file
+
+        params:
+            filepath: filepath to the presentation report excel xml
+
+        returns:
+            pandas dataframes of the presentation report summary and presentations
+        """
+
+        frames = self.load_presentation_report_frames(filepath, [PRESENTATION_REPORT_SUMMARY_SHEET, PRESENTATION_REPORT_PRESENTATION_SHEET])
+
+        return frames[PRESENTATION_REPORT_SUMMARY_SHEET], frames[PRESENTATION_REPORT_PRESENTATION_SHEET]
+
+    def load_presentation_report_frames(self, filepath, sheets):
+        """
+        Loads presentation report sheets from the report cache, parsing the sheets which are not cached
+
+        params:
+            filepath: filepath to the presentation report excel xml
+            sheets: PRESENTATION_REPORT_SUMMARY_SHEET and/or PRESENTATION_REPORT_PRESENTATION_SHEET
+
+        returns:
+            dictionary of each sheet to its pandas dataframe
+        """
+
+        if self.sheet_cache:
+            return self.sheet_cache.load_or_parse(filepath, sheets, lambda missing_sheets: self.parse_presentation_report_frames(filepath, missing_sheets))
+
+        return self.parse_presentation_report_frames(filepath, sheets)
+
+    def parse_presentation_report_frames(self, filepath, sheets):
+        """
+        Parses presentation report sheets in a single pass over the file
+
+        params:
+            filepath: filepath to the presentation report excel xml
+            sheets: PRESENTATION_REPORT_SUMMARY_SHEET and/or PRESENTATION_REPORT_PRESENTATION_SHEET
+
+        returns:
+            dictionary of each sheet to its pandas dataframe
+        """
+
+        #the summary sheet is laid out as labels and values so it is read as rows of text
+        parsed_sheets = parse_sheet_columns(filepath, sheets, row_sheets=[PRESENTATION_REPORT_SUMMARY_SHEET])
+
+        frames = {}
+        if PRESENTATION_REPORT_SUMMARY_SHEET in parsed_sheets:
+            frames[PRESENTATION_REPORT_SUMMARY_SHEET] = self.build_presentation_report_summary_frame(parsed_sheets[PRESENTATION_REPORT_SUMMARY_SHEET])
+        if PRESENTATION_REPORT_PRESENTATION_SHEET in parsed_sheets:
+            frames[PRESENTATION_REPORT_PRESENTATION_SHEET] = self.build_presentation_report_presentation_frame(parsed_sheets[PRESENTATION_REPORT_PRESENTATION_SHEET])
+
+        return frames
+
+    def convert_presentation_report(self, filepath):
+        """
+        Parses a downloaded presentation report into the report cache so later loads read the cached sheets
+
+        params:
+            filepath: filepath to the presentation report excel xml
+        """
+
+        logging.info("Converting presentation report "+filepath)
+        self.load_presentation_report_frames(filepath, [PRESENTATION_REPORT_SUMMARY_SHEET, PRESENTATION_REPORT_PRESENTATION_SHEET])
+
+    def load_many_presentation_reports(self, filepaths, max_workers=None):
+        """
+        Loads the summary and presentation sheets of many downloaded presentation reports, each
+        report being parsed in its own process so parsing scales with the number of cores
+
+        params:
+            filepaths: filepaths to the presentation report excel xml files
+            max_workers: number of processes, defaults to the number of cores
+
+        returns:
+            pandas dataframes of the summaries and presentations of every report, with a "Report File"
+            column holding the filepath each row came from. Reports which could not be loaded are logged and left out.
+        """
+
+        summary_dfs = []
+        presentation_dfs = []
+
+        #checked here so worker processes do not each warn about a missing pyarrow
+        use_cache = self.sheet_cache is not None and self.sheet_cache.available()
+        cache_dir = self.sheet_cache.directory if use_cache else None
+
+        #spawned processes do not inherit the locks and threads of the controller
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(load_presentation_report_file, filepath, use_cache, cache_dir) for filepath in filepaths]
+
+            #results are combined in the order of the filepaths
+            for filepath, future in zip(filepaths, futures):
+                try:
+                    summary_df, presentation_df = future.result()
+                except Exception as e:
+                    logging.error("Unable to load presentation report "+filepath+": "+str(e))
+                    continue
+
+                summary_dfs.append(summary_df.assign(**{"Report File":filepath}))
+                presentation_dfs.append(presentation_df.assign(**{"Report File":filepath}))
+
+        if not summary_dfs:
+            return pd.DataFrame(), pd.DataFrame()
+
+        return pd.concat(summary_dfs, ignore_index=True), pd.concat(presentation_dfs, ignore_index=True)
+
+    def build_presentation_report_summary_frame(self, summary_rows):
+        """
+        params:
+            summary_rows: rows of the summary sheet of a presentation report excel xml
+
+        returns:
+            pandas dataframe containing data from the presentation report summary
+        """
 
         #gather data from first sheet of excel xml report
-        summary_df = pd.DataFrame(excelHandler.tables[0])
+        summary_df = pd.DataFrame(summary_rows)
 
         #transpose (col names are row values for this sheet) and set column names using first row
         summary_df = summary_df.T
@@ -229,8 +436,8 @@ class report():
         summary_df.drop(summary_df.index[0], inplace=True)
 
         #translate final two columns into values and rename the columns to relevant variable names
-        summary_df.ix[1, summary_df.columns[len(summary_df.columns)-1]] = summary_df.columns[len(summary_df.columns)-1]
-        summary_df.ix[1, summary_df.columns[len(summary_df.columns)-2]] = summary_df.columns[len(summary_df.columns)-2]
+        summary_df.loc[1, summary_df.columns[len(summary_df.columns)-1]] = summary_df.columns[len(summary_df.columns)-1]
+        summary_df.loc[1, summary_df.columns[len(summary_df.columns)-2]] = summary_df.columns[len(summary_df.columns)-2]
         summary_df.rename(columns={ summary_df.columns[len(summary_df.columns)-1]: "Timezone",
                             summary_df.columns[len(summary_df.columns)-2]: "Report Date"}, 
                     inplace=True)
@@ -243,29 +450,76 @@ class report():
 
         return summary_df
 
-    def load_presentation_report_presentation_sheet(self, filepath):
+    def build_presentation_report_presentation_frame(self, presentation_columns):
         """
-        Function for parsing excel xml presentation data from a downloaded presentation report
-
         params:
-            filepath: filepath to the presentation report excel xml
+            presentation_columns: column names and typed column values of the presentation sheet
+                of a presentation report excel xml, see ExcelHandler.parse_sheet_columns
 
         returns:
             pandas dataframe containing data from the presentation report presentations
         """
 
-        #build and use parser
-        excelHandler = ExcelHandler()
-        parse(filepath, excelHandler)
+        #gather data from fourth sheet of excel xml report, numeric and datetime columns are used as is
+        presentation_df = self.build_report_sheet_frame(presentation_columns)
 
-        #gather data from fourth sheet of excel xml report
-        presentation_df = pd.DataFrame(excelHandler.tables[3][1:], columns=excelHandler.tables[3][0])
-        presentation_df['Air Date'] =  pd.to_datetime(presentation_df['Air Date'], format='%Y-%m-%d %H:%M:%S')
+        #air dates stored as DateTime cells are already converted
+        if not pd.api.types.is_datetime64_any_dtype(presentation_df['Air Date']):
+            presentation_df['Air Date'] =  pd.to_datetime(presentation_df['Air Date'], format='%Y-%m-%d %H:%M:%S')
 
         presentation_df.reset_index(drop=True, inplace=True)
 
         return presentation_df
 
+    def build_report_sheet_frame(self, sheet_columns):
+        """
+        params:
+            sheet_columns: column names and typed column values of a report excel xml sheet
+
+        returns:
+            pandas dataframe using the column values without copying them
+        """
+
+        column_names, column_values = sheet_columns
+        sheet_df = pd.DataFrame(dict(enumerate(column_values)), copy=False)
+        sheet_df.columns = column_names
+
+        return sheet_df
+
+    def iter_report_sheet(self, filepath, sheet=PRESENTATION_REPORT_PRESENTATION_SHEET, chunk_size=10000):
+        """
+        Generator over a sheet of a downloaded report excel xml in chunks of rows, for sheets too
+        large to be loaded at once (for ex. millions of views). Only one chunk is held in memory.
+
+        params:
+            filepath: filepath to the report excel xml
+            sheet: index or name of the sheet, the first row of which holds the column names
+            chunk_size: number of rows per chunk, not counting the column names row. The last chunk may be smaller.
+
+        yields:
+            pandas dataframe of each chunk of rows, columns keeping the type they had in the first chunk
+            unless later values do not fit it. Air dates of the presentation sheet are converted to datetimes.
+        """
+
+        #presentation sheet chunks are built like the whole sheet would be
+        if sheet == PRESENTATION_REPORT_PRESENTATION_SHEET:
+            build_frame = self.build_presentation_report_presentation_frame
+        else:
+            build_frame = self.build_report_sheet_frame
+
+        #the column names row is read on its own so every chunk holds chunk_size data rows
+        rows = iter_sheet_rows(filepath, sheet)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        column_names = ["" if value is None else str(value) for value in header]
+        column_kinds = []
+        for chunk in iter(lambda: list(islice(rows, chunk_size)), []):
+            chunk_column_names = list(column_names)
+            chunk_column_values = rows_to_columns(chunk_column_names, chunk, column_kinds)
+            yield build_frame((chunk_column_names, chunk_column_values))
+
     def parse_new_presentation_count(self, filepath):
         """
         Function for for determining the number of new presentations for a given presentation report
@@ -277,8 +531,7 @@ class report():
             number of new presentations found by the function
         """
 
-        summary_df = self.load_presentation_report_summary_sheet(filepath)
-        presentation_df = self.load_presentation_report_presentation_sheet(filepath)
+        summary_df, presentation_df = self.load_presentation_report_sheets(filepath)
 
         #parse the start date of report from the Range col in the summary date
         date_range_start = summary_df["Range"][0].split(": ")[1].split(" to ")[0]
@@ -302,7 +555,6 @@ class report():
             filename of the report which was generated
         """
 
-        file_extension = ".excel.xml" if report_type == "excel" else ".xml"
         mediasite_request_type = "Excel" if report_type == "excel" else "XML"
 
         presentation_report_id = self.find_presentation_report_id_by_name(presentation_report_name)
@@ -310,12 +562,7 @@ class report():
         #gather report execute data
         presentation_report_execute_json = self.execute_presentation_report(presentation_report_id)
 
-        #gather date strings for request
-        current_date_file_string = time.strftime("%m-%d-%Y")
-
-        #filenames and locations for the excel and xml files
-        filename = export_destination.rstrip('/')+"/mediasite_report_"+\
-            recurrence+"_"+report_prefix+'_'+current_date_file_string+file_extension
+        filename = self.get_report_export_filename(report_type, recurrence, report_prefix, export_destination)
 
         #download excel (xml) version of data
         logging.info("Beginning Excel XML file generation for report")
@@ -362,6 +609,68 @@ class report():
 
         return filename    
 
+    def get_report_export_filename(self, report_type, recurrence, report_prefix, export_destination):
+        """
+        params:
+            report_type: type of report being gathered - excel or xml
+            recurrence: recurrence timeframe, for titling of files
+            report_prefix: prefix to indicate differences between types
+            export_destination: filepath for the downloaded reports
+
+        returns:
+            filename a report export is downloaded to, dated with the current date
+        """
+
+        file_extension = ".excel.xml" if report_type == "excel" else ".xml"
+
+        #gather date strings for request
+        current_date_file_string = time.strftime("%m-%d-%Y")
+
+        #filenames and locations for the excel and xml files
+        return export_destination.rstrip('/')+"/mediasite_report_"+\
+            recurrence+"_"+report_prefix+'_'+current_date_file_string+file_extension
+
+    def gather_presentation_report_exports(self, recurrence, report_prefix, export_destination, presentation_report_name, report_types=("xml", "excel"), convert=False):
+        """
+        Gathers exports of a single execution of the report. The report is executed once and each
+        export is generated from its result, the export jobs being waited on together.
+
+        params:
+            recurrence: recurrence timeframe, for titling of files
+            report_prefix: prefix to indicate differences between types
+            export_destination: filepath for the downloaded reports
+            presentation_report_name: name of the mediasite presentation report
+            report_types: types of report being gathered - excel and/or xml
+            convert: whether the excel.xml export is parsed into the report cache once downloaded, skipped without a report cache
+
+        returns:
+            filenames of the reports which were generated, in the order of report_types
+        """
+
+        presentation_report_id = self.find_presentation_report_id_by_name(presentation_report_name)
+
+        #gather report execute data
+        presentation_report_execute_json = self.execute_presentation_report(presentation_report_id)
+
+        #request every export of the same result before waiting on any of them
+        export_jsons = [self.start_presentation_report_export(presentation_report_id,
+                                                              presentation_report_execute_json["ResultId"],
+                                                              "Excel" if report_type == "excel" else "XML")
+                        for report_type in report_types]
+        self.mediasite.wait_for_jobs_to_complete([export_json["JobLink"] for export_json in export_jsons])
+
+        filenames = []
+        for report_type, export_json in zip(report_types, export_jsons):
+            filename = self.get_report_export_filename(report_type, recurrence, report_prefix, export_destination)
+            self.download_report_file(export_json["DownloadLink"], filename)
+            filenames.append(filename)
+
+            #without a usable report cache converting would only parse the report for nothing
+            if convert and report_type == "excel" and self.sheet_cache and self.sheet_cache.available():
+                self.convert_presentation_report(filename)
+
+        return tuple(filenames)
+
     def gather_all_presentation_report_exports(self, recurrence, report_prefix, export_destination, presentation_report_name):
         """
         Gathers all export via exectution and download of the report (xml and excel.xml)
@@ -376,10 +685,41 @@ class report():
             filenames of the reports which were generated, xml and excel.xml
         """
 
-        xml_filename = self.gather_presentation_report_export("xml", recurrence, report_prefix, export_destination, presentation_report_name)
-        excel_filename = self.gather_presentation_report_export("excel", recurrence, report_prefix, export_destination, presentation_report_name)
+        return self.gather_presentation_report_exports(recurrence, report_prefix, export_destination, presentation_report_name)
+
+    def gather_many_presentation_report_exports(self, presentation_reports, recurrence, export_destination, max_workers=None, convert=False):
+        """
+        Gathers xml and excel.xml exports of many presentation reports concurrently
+
+        params:
+            presentation_reports: dictionary of report prefixes to mediasite presentation report names,
+                for ex. {"bba":"BBA Weekly Report", "dls":"DLS Weekly Report"}
+            recurrence: recurrence timeframe, for titling of files
+            export_destination: filepath for the downloaded reports
+            max_workers: number of reports gathered at one time, defaults to the controller setting
+            convert: whether the excel.xml exports are parsed into the report cache once downloaded, skipped without a report cache
+
+        returns:
+            dictionary of report prefixes to xml and excel.xml filenames, reports which could not be
+            gathered are logged and left out
+        """
+
+        max_workers = max_workers or self.mediasite.max_workers
+        report_filenames = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.gather_presentation_report_exports, recurrence, report_prefix,
+                                       export_destination, presentation_report_name, convert=convert):report_prefix
+                       for report_prefix, presentation_report_name in presentation_reports.items()}
+
+            for future in as_completed(futures):
+                report_prefix = futures[future]
+                try:
+                    report_filenames[report_prefix] = future.result()
+                except Exception as e:
+                    logging.error("Unable to gather presentation report "+presentation_reports[report_prefix]+": "+str(e))
 
-        return xml_filename, excel_filename
+        return report_filenames
 
     def gather_presentaton_report_summary_data(self, recurrence, report_prefix, export_destination, presentation_report_name):
         """
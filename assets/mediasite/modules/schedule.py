@@ -14,7 +14,10 @@ import datetime
 import pytz
 import tzlocal
 import datetime
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dateutil import rrule
+import assets.mediasite.schedule_importer as schedule_importer
 
 class schedule():
     def __init__(self, mediasite, *args, **kwargs):
@@ -96,6 +99,7 @@ class schedule():
                     }
 
         result = self.mediasite.api_client.request("post", "Schedules", "", post_data).json()
+        self.mediasite.api_client.invalidate_cache("Schedules")
         
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -207,6 +211,22 @@ class schedule():
 
         return datelist
 
+    def get_occurrences(self, schedule_data):
+        """
+        Gathers the recurrence datetimes of the schedule data. They are generated once and kept
+        in the schedule data under "schedule_occurrences" for validation and recurrence creation.
+
+        params:
+            schedule_data: dictionary containing various necessary data for creating mediasite scheduling
+
+        returns:
+            list of recurrence datetimes based on the schedule data
+        """
+        if "schedule_occurrences" not in schedule_data:
+            schedule_data["schedule_occurrences"] = self.recurrence_datelist_generator(schedule_data)
+
+        return schedule_data["schedule_occurrences"]
+
     def schedule_data_has_0_occurrences(self, schedule_data):
         """
         Determine whether the current schedule data contains 0 occurrences to avoid errors
@@ -214,7 +234,7 @@ class schedule():
         returns:
             true if there are 0 occurrences in the schedule data, false if there are more than 0 occurrences
         """
-        datelist = self.recurrence_datelist_generator(schedule_data)
+        datelist = self.get_occurrences(schedule_data)
 
         if len(datelist) <= 0:
             logging.error("Submitted schedule data does not contain at least one occurrence.")
@@ -222,6 +242,38 @@ class schedule():
         else:
             return False
 
+    def build_one_time_recurrences(self, schedule_id, datelist, recurrence_duration):
+        """
+        Builds one-time recurrence post data for each local datetime in a single vectorized pass.
+        Each datetime is converted to UTC using the offset in effect on that date, so dates on the
+        other side of a daylight saving change from today are scheduled at the intended local time.
+
+        params:
+            schedule_id: Mediasite schedule ID the recurrences belong to
+            datelist: list of naive local datetimes, for ex. from recurrence_datelist_generator
+            recurrence_duration: recording duration in milliseconds
+
+        returns:
+            list of post data dictionaries in datelist order
+        """
+        if not datelist:
+            return []
+
+        #the local timezone may be a zoneinfo (tzlocal 3+) or pytz (older tzlocal) zone, pandas accepts both
+        local_tz = tzlocal.get_localzone()
+
+        #times within the daylight saving changeover hours are treated as daylight time or moved past the gap
+        start_times_utc = pd.DatetimeIndex(datelist) \
+            .tz_localize(local_tz, ambiguous=True, nonexistent=datetime.timedelta(hours=1)) \
+            .tz_convert("UTC") \
+            .strftime("%Y-%m-%dT%H:%M:%S")
+
+        return [{"MediasiteId":schedule_id,
+                 "RecordDuration":recurrence_duration,
+                 "StartRecordDateTime":start_time_utc,
+                 "RecurrencePattern":"None",
+                 } for start_time_utc in start_times_utc]
+
     def create_recurrence(self, schedule_data, schedule_result):
         """
         Creates Mediasite schedule recurrence. Specifically, this is the datetimes which a recording schedule
@@ -232,7 +284,8 @@ class schedule():
             schedule_result: data provided from Mediasite after a schedule is produced
 
         returns:
-            resulting response from the mediasite web api request
+            resulting response from the mediasite web api request, for weekly recurrences a list
+            of the responses for each one-time recurrence in date order
         """
         logging.info("Creating schedule recurrence(s) for '"+schedule_data["schedule_name"])
 
@@ -242,18 +295,30 @@ class schedule():
         #translate various values gathered from the UI to Mediasite-friendly conventions
         recurrence_type = self.mediasite.model.translate_schedule_recurrence_pattern(schedule_data["schedule_recurrence"])
 
-        #creates a recurrence using post_data created below
-        def request_create_recurrence(post_data):
-            result = self.mediasite.api_client.request("post", "Schedules('"+schedule_result["Id"]+"')/Recurrences", "", post_data).json()
+        recurrences_resource = "Schedules('"+schedule_result["Id"]+"')/Recurrences"
+
+        #checks the response to a recurrence creation request and records the new recurrence
+        def handle_recurrence_result(result):
+            result = result.json()
 
             if self.mediasite.experienced_request_errors(result):
                 return result
             else:
                 if "odata.error" in result:
                     logging.error(result["odata.error"]["code"]+": "+result["odata.error"]["message"]["value"])
-                else:
+                #$batch parts without a body (for ex. a 204) have no recurrence to record
+                elif "Id" in result:
                     self.mediasite.model.add_recurrence(result)
 
+                return result
+
+        #creates a recurrence using post_data created below
+        def request_create_recurrence(post_data):
+            result = self.mediasite.api_client.request("post", recurrences_resource, "", post_data)
+            self.mediasite.api_client.invalidate_cache("Schedules")
+
+            return handle_recurrence_result(result)
+
         result = ""
 
         #for one-time recurrence creation
@@ -278,43 +343,18 @@ class schedule():
             """
 
             #determine date range for use in creating single instances which are less error-prone
-            datelist = self.recurrence_datelist_generator(schedule_data)
-
-            #for each date in the list produced above, we create post data and request a one-time schedule recurrence
-            for date in datelist:
-
-                ms_friendly_datetime_start_utc = self.convert_datetime_local_to_utc(date)
-                ms_friendly_datetime_start = ms_friendly_datetime_start_utc.strftime("%Y-%m-%dT%H:%M:%S")
+            datelist = self.get_occurrences(schedule_data)
 
-                #find our current timezone
-                local_tz = tzlocal.get_localzone()
+            #post data for every date is prepared up front, converting all dates to utc at once
+            operations = [("post", recurrences_resource, "", post_data)
+                          for post_data in self.build_one_time_recurrences(schedule_result["Id"], datelist, recurrence_duration)]
 
-                #check if current datetime is dst or not
-                now = datetime.datetime.now()
-                #is_now_dst = now.astimezone(local_tz).dst() != datetime.timedelta(0)
-                is_now_dst = local_tz.localize(now).dst() != datetime.timedelta(0)
+            #the one-time recurrences are independent so they are sent in as few $batch requests as possible,
+            #or through a bounded number of parallel requests when batching is not available
+            recurrence_results = self.mediasite.api_client.batch(operations, max_workers=self.mediasite.max_workers)
+            self.mediasite.api_client.invalidate_cache("Schedules")
 
-                #check if future datetime is dst or not
-                #is_later_dst = date.astimezone(local_tz).dst() != datetime.timedelta(0)
-                is_later_dst = local_tz.localize(date).dst() != datetime.timedelta(0)
-
-                #compare between the current and future datetimes to find differences and adjust
-                if is_now_dst != is_later_dst:
-
-                    #convert future datetime to be an hour more or less bast on dst comparison above
-                    if is_now_dst and not is_later_dst:
-                        ms_friendly_datetime_start = (ms_friendly_datetime_start_utc + datetime.timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S")
-                    
-                    elif not is_now_dst and is_later_dst:
-                        ms_friendly_datetime_start = (ms_friendly_datetime_start_utc - datetime.timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S")
-
-                post_data = {"MediasiteId":schedule_result["Id"],
-                            "RecordDuration":recurrence_duration,
-                            "StartRecordDateTime":ms_friendly_datetime_start,
-                            "RecurrencePattern":"None",
-                            }
-                
-                request_create_recurrence(post_data)
+            result = [handle_recurrence_result(recurrence_result) for recurrence_result in recurrence_results]
 
             return result
 
@@ -340,32 +380,159 @@ class schedule():
 
             return result
 
-    def process_batch_scheduling_data(self, batch_scheduling_data):
+    def process_batch_scheduling_data(self, batch_scheduling_data, max_workers=None):
         """
         Process batch scheduling data provided in pre-specified format.
 
         params:
             batch_scheduling_data: list of dictionaries which contain pertinent mediasite scheduling data
+            max_workers: number of rows processed at one time, defaults to the controller setting
 
         returns:
-            output indicating which rows of scheduling information were successfully scheduled
+            output indicating which rows of scheduling information were successfully scheduled, in row order
         """
 
-        result_list = []
+        result_list = [None] * len(batch_scheduling_data)
 
-        #parse each row of scheduling data
-        for row in batch_scheduling_data:
+        for row_index, row_result in self.iter_batch_scheduling_results(batch_scheduling_data, max_workers):
+            result_list[row_index] = row_result
 
-            #gather and organize schedule data
-            schedule_data = self.gather_import_schedule_data(row)
+        return result_list
 
-            #perform mediasite-specific work using schedule_data for row
-            row_result = self.mediasite.process_scheduling_data_row(schedule_data)
+    def iter_batch_scheduling_results(self, batch_scheduling_data, max_workers=None):
+        """
+        Generator which processes batch scheduling data concurrently. Rows are validated first, then the
+        folders of all valid rows are created once (see create_batch_folders), after which the rows are
+        processed independently of one another.
 
-            #append results to the overall list
-            result_list.append(row_result)
+        params:
+            batch_scheduling_data: list of dictionaries which contain pertinent mediasite scheduling data
+            max_workers: number of rows processed at one time, defaults to the controller setting
 
-        return result_list
+        yields:
+            row index and output indicating whether the row was successfully scheduled, as each row completes
+        """
+
+        #gather and organize schedule data for each row
+        batch_schedule_data = {}
+        for row_index, row in enumerate(batch_scheduling_data):
+            try:
+                batch_schedule_data[row_index] = self.gather_import_schedule_data(row)
+            except (KeyError, ValueError) as e:
+                error = f'Error: row {row_index + 1} - Unable to read scheduling data ({e})'
+                logging.error(error)
+                yield row_index, {"error":error}
+
+        yield from self.iter_schedule_data_results(batch_schedule_data, max_workers)
+
+    def iter_scheduling_file_results(self, path, max_workers=None, sheet_name=0):
+        """
+        Generator which reads a CSV or Excel scheduling spreadsheet with schedule_importer, parsing all
+        rows at once, and processes its rows concurrently as iter_batch_scheduling_results does
+
+        params:
+            path: path to a .csv, .xlsx or .xls scheduling spreadsheet
+            max_workers: number of rows processed at one time, defaults to the controller setting
+            sheet_name: sheet to read from Excel files
+
+        yields:
+            spreadsheet row index and output indicating whether the row was successfully scheduled, as each row completes
+        """
+
+        importer = schedule_importer.schedule_importer()
+        parsed = importer.parse(importer.read(path, sheet_name))
+
+        for row_index, error in parsed.loc[parsed["error"] != "", "error"].items():
+            logging.error(error)
+            yield row_index, {"error":error}
+
+        yield from self.iter_schedule_data_results(dict(importer.iter_schedule_data(parsed)), max_workers)
+
+    def iter_schedule_data_results(self, batch_schedule_data, max_workers=None):
+        """
+        Generator which processes already gathered schedule data concurrently, see iter_batch_scheduling_results
+
+        params:
+            batch_schedule_data: dictionary of schedule data by row index
+            max_workers: number of rows processed at one time, defaults to the controller setting
+
+        yields:
+            row index and output indicating whether the row was successfully scheduled, as each row completes
+        """
+
+        max_workers = max_workers or self.mediasite.max_workers
+        logging.info(f'Processing {len(batch_schedule_data)} scheduling rows with {max_workers} workers')
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            #validate every row before anything is created so invalid rows leave no folders behind
+            validation_report = self.mediasite.validate_batch_scheduling_data(batch_schedule_data)
+
+            for row_index, row_errors in validation_report.groupby("row")["error"]:
+                del batch_schedule_data[row_index]
+                yield int(row_index), {"error":" ".join(row_errors), "errors":list(row_errors)}
+
+            #rows sharing folder paths depend on the same folders, which are created once up front
+            folder_ids = self.create_batch_folders(batch_schedule_data.values(), executor)
+
+            row_futures = {}
+            for row_index, schedule_data in batch_schedule_data.items():
+                parent_folder_id = folder_ids[self.get_batch_folder_key(schedule_data)]
+                future = executor.submit(self.mediasite.process_scheduling_data_row, schedule_data, parent_folder_id, True)
+                row_futures[future] = row_index
+
+            for future in as_completed(row_futures):
+                row_index = row_futures[future]
+                try:
+                    row_result = future.result()
+                except Exception as e:
+                    row_result = {"error":f'Error: {batch_schedule_data[row_index]["schedule_name"]} - {e}'}
+                    logging.error(row_result["error"])
+
+                yield row_index, row_result
+
+    def get_batch_folder_key(self, schedule_data):
+        """
+        returns:
+            root folder id and tuple of folder names for the folder path of the schedule data
+        """
+        root_id = self.mediasite.get_schedule_folder_root_id(schedule_data) or self.mediasite.model.get_root_parent_folder_id()
+        folder_names = tuple(folder for folder in self.mediasite.get_schedule_folders(schedule_data).split("/") if folder != "")
+
+        return root_id, folder_names
+
+    def create_batch_folders(self, batch_schedule_data, executor):
+        """
+        Creates the folders of many schedule data rows, each distinct folder only once. Folders are
+        created level by level, the distinct folders of a level being created concurrently once
+        their parents from the level above exist. Created folders are remembered by the folder
+        module's path cache, so parents are not requested again.
+
+        params:
+            batch_schedule_data: iterable of schedule data dictionaries
+            executor: executor used to create folders
+
+        returns:
+            dictionary of final folder id by folder key (see get_batch_folder_key). As with
+            parse_and_create_folders, this is the lowest folder which could be created.
+        """
+
+        folder_keys = {self.get_batch_folder_key(schedule_data) for schedule_data in batch_schedule_data}
+        if not folder_keys:
+            return {}
+
+        def create_folders(folder_key):
+            return self.mediasite.folder.parse_and_create_folders("/".join(folder_key[1]), folder_key[0])
+
+        for depth in range(1, max(len(folder_names) for _, folder_names in folder_keys) + 1):
+            level = sorted({(root_id, folder_names[:depth]) for root_id, folder_names in folder_keys
+                            if len(folder_names) >= depth})
+
+            logging.info(f'Creating {len(level)} folders at depth {depth}')
+            list(executor.map(create_folders, level))
+
+        #every folder is cached at this point so resolving the full paths makes no requests
+        return {folder_key:create_folders(folder_key) for folder_key in folder_keys}
 
     def fix_12_hour_time_padding(self, time_string):
         """
@@ -502,6 +669,7 @@ class schedule():
 
         #request mediasite folder information on the "Mediasite Users" folder
         result = self.mediasite.api_client.request("delete", "Schedules('"+schedule_id+"')", "","")
+        self.mediasite.api_client.invalidate_cache("Schedules")
         
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -9,15 +9,20 @@ License: MIT - see license.txt
 
 import logging
 from urllib.parse import quote
+import assets.mediasite.odata as odata
 
 class template():
     def __init__(self, mediasite, *args, **kwargs):
         self.mediasite = mediasite
 
-    def gather_templates(self):
+    def gather_templates(self, query=None):
         """
         Gathers mediasite template name listing from mediasite system
 
+        params:
+            query: odata.query or odata attribute string to project, filter or sort the templates.
+                Listings made with a query are not stored on the model.
+
         returns:
             list of mediasite template names from mediasite system
         """
@@ -27,7 +32,8 @@ class template():
         logging.info("Gathering Mediasite templates")
 
         #request mediasite template information from mediasite
-        result = self.mediasite.api_client.request("get", "Templates", "$top=200", "")
+        odata_attributes = "$top=200" if query is None else odata.add_default_attribute(odata.resolve_query(query)[0], "$top", 200)
+        result = self.mediasite.api_client.request("get", "Templates", odata_attributes, "")
         
         if self.mediasite.experienced_request_errors(result):
             return result
@@ -37,7 +43,8 @@ class template():
                 mediasite_templates.append(template)
             
             #add the listing of template names to the model for later use
-            self.mediasite.model.set_templates(mediasite_templates)
+            if query is None:
+                self.mediasite.model.set_templates(mediasite_templates)
             return mediasite_templates
 
     def find_template_by_name(self, template_name):
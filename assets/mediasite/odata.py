@@ -0,0 +1,357 @@
+"""
+OData query building and $batch encoding for Mediasite API requests
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import copy
+import datetime
+import json
+import re
+import uuid
+from urllib.parse import quote
+
+FILTER_OPERATORS = ("eq", "ne", "gt", "ge", "lt", "le")
+PROPERTY_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(/[A-Za-z_][A-Za-z0-9_]*)*$")
+BOUNDARY_PATTERN = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+
+def format_literal(value):
+    """
+    Formats a python value as an OData literal, for ex. "it's" becomes 'it''s'
+
+    params:
+        value: str, bool, int, float, datetime or None
+
+    returns:
+        OData literal string
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        #Mediasite stores times as UTC without an offset
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return "datetime'" + value.strftime("%Y-%m-%dT%H:%M:%S") + "'"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+
+    raise TypeError(f'Unable to format {type(value).__name__} as an OData literal')
+
+def check_property(name):
+    """
+    params:
+        name: entity property or navigation path, for ex. "Title" or "Presenters/FirstName"
+
+    returns:
+        the property name, raises ValueError if it is not a valid OData identifier
+    """
+    if not PROPERTY_PATTERN.match(name):
+        raise ValueError(f'Invalid OData property name: {name}')
+    return name
+
+class query():
+    def __init__(self, select=None, expand=None, filter=None, orderby=None):
+        """
+        Builder for the $select, $expand, $filter and $orderby options of a listing request.
+        Methods return the query so they can be chained.
+
+        params:
+            select: property names to return, or "full"/"card" Mediasite projections
+            expand: related entities to return inline, for ex. "Presenters"
+            filter: raw $filter expression
+            orderby: property names to sort by, append " desc" for descending order
+
+        Usage:
+            odata.query().select("Id", "Title", "ParentFolderId").where("Status", "eq", "Viewable").orderby("Title")
+            odata.query(select="full", expand=["Presenters", "OnDemandContent"])
+        """
+        self.select_fields = []
+        self.expand_fields = []
+        self.filters = []
+        self.orderby_fields = []
+
+        if select:
+            self.select(*([select] if isinstance(select, str) else select))
+        if expand:
+            self.expand(*([expand] if isinstance(expand, str) else expand))
+        if filter:
+            self.filter(filter)
+        if orderby:
+            for field in ([orderby] if isinstance(orderby, str) else orderby):
+                name, _, direction = field.partition(" ")
+                self.orderby(name, direction.strip().lower() == "desc")
+
+    def select(self, *fields):
+        for field in fields:
+            if check_property(field) not in self.select_fields:
+                self.select_fields.append(field)
+        return self
+
+    def expand(self, *fields):
+        for field in fields:
+            if check_property(field) not in self.expand_fields:
+                self.expand_fields.append(field)
+        return self
+
+    def filter(self, expression):
+        """
+        Adds a raw $filter expression, combined with any others using "and"
+        """
+        self.filters.append(expression)
+        return self
+
+    def where(self, field, operator, value):
+        """
+        Adds a comparison to $filter with the value formatted as an OData literal
+
+        params:
+            field: property name to compare
+            operator: one of eq, ne, gt, ge, lt, le
+            value: python value compared against, see format_literal
+        """
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f'Unsupported OData operator: {operator}')
+        return self.filter(f'{check_property(field)} {operator} {format_literal(value)}')
+
+    def orderby(self, field, descending=False):
+        self.orderby_fields.append(check_property(field) + (" desc" if descending else ""))
+        return self
+
+    def is_full(self):
+        """
+        returns:
+            whether the query returns every record with every property, so the listing can be stored
+            on the model. Mediasite only returns full records for $select=full, and a $filter
+            returns a subset of the records.
+        """
+        return "full" in self.select_fields and not self.filters
+
+    def build(self):
+        """
+        returns:
+            odata attribute string for api_client.client.request, for ex. "$select=Id,Title&$orderby=Title"
+        """
+        options = []
+        if self.select_fields:
+            options.append("$select=" + ",".join(self.select_fields))
+        if self.expand_fields:
+            options.append("$expand=" + ",".join(self.expand_fields))
+        if self.filters:
+            expression = " and ".join(f'({f})' if len(self.filters) > 1 else f for f in self.filters)
+            options.append("$filter=" + quote(expression, safe="'(),/:=$"))
+        if self.orderby_fields:
+            options.append("$orderby=" + quote(",".join(self.orderby_fields), safe=","))
+
+        return "&".join(options)
+
+    def __str__(self):
+        return self.build()
+
+def resolve_query(query_option, default="$select=full"):
+    """
+    Turns the query option accepted by module listing methods into odata attributes
+
+    params:
+        query_option: odata.query, raw odata attribute string, or None for the default
+        default: odata attributes used when no query is provided
+
+    returns:
+        odata attribute string and whether the listing contains every record with every property
+        ($select=full without a $filter)
+    """
+    if query_option is None:
+        return default, True
+    if isinstance(query_option, query):
+        return query_option.build(), query_option.is_full()
+
+    odata_attributes = str(query_option).lstrip("?")
+    select = re.search(r"\$select=([^&]*)", odata_attributes)
+    full = select is not None and "full" in select.group(1).split(",") and "$filter=" not in odata_attributes
+    return odata_attributes, full
+
+def resolve_scoped_query(query_option, scope_filter, default):
+    """
+    Turns the query option accepted by listings scoped to a parent (for ex. the schedules of a folder)
+    into odata attributes. The scope filter always applies, combined with any $filter of the query.
+
+    params:
+        query_option: odata.query, raw odata attribute string, or None for the default
+        scope_filter: $filter expression selecting the records of the parent, for ex. "FolderId eq '1234'"
+        default: odata attributes used when no query is provided
+
+    returns:
+        odata attribute string
+    """
+    if query_option is None:
+        return default
+    if isinstance(query_option, query):
+        scoped = copy.deepcopy(query_option)
+        scoped.filters.insert(0, scope_filter)
+        return scoped.build()
+
+    options = [option for option in str(query_option).lstrip("?").split("&") if option]
+    for position, option in enumerate(options):
+        if option.startswith("$filter="):
+            options[position] = f'$filter={scope_filter} and ({option[len("$filter="):]})'
+            break
+    else:
+        options.append(f'$filter={scope_filter}')
+
+    return "&".join(options)
+
+def has_attribute(odata_attributes, name):
+    """
+    returns:
+        whether the odata attribute string sets the given query option, for ex. "$top"
+    """
+    return any(attribute.split("=", 1)[0] == name for attribute in (odata_attributes or "").lstrip("?").split("&"))
+
+def add_default_attribute(odata_attributes, name, value):
+    """
+    Adds a query option in front of odata attributes unless they already set it, for ex. a default
+    $top which a caller provided $top replaces (OData rejects query options given twice)
+
+    returns:
+        odata attribute string
+    """
+    if has_attribute(odata_attributes, name):
+        return odata_attributes
+    return join_attributes(f'{name}={value}', odata_attributes)
+
+def join_attributes(*odata_attributes):
+    """
+    returns:
+        odata attribute strings joined with "&", empty strings being left out
+    """
+    return "&".join(attributes.lstrip("?") for attributes in odata_attributes if attributes)
+
+class batch_response:
+    def __init__(self, url, status_code, headers, content):
+        """
+        Response of a single operation within a $batch response. Mirrors the parts of requests.Response
+        used throughout the Mediasite modules.
+
+        params:
+            url: url of the operation
+            status_code: http status code of the operation
+            headers: dictionary of operation response headers
+            content: operation response body as bytes
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content) if self.content.strip() else {}
+
+def encode_batch(operations, boundary=None):
+    """
+    Encodes operations as an OData v3 multipart/mixed $batch request body. Each write operation
+    is placed in its own changeset so the operations succeed or fail independently.
+
+    params:
+        operations: list of (method, url, post_vars) tuples, urls being absolute
+        boundary: batch boundary, generated if None
+
+    returns:
+        request body as bytes and the Content-Type header value for it
+    """
+    boundary = boundary or "batch_" + uuid.uuid4().hex
+    lines = []
+
+    for method, url, post_vars in operations:
+        method = method.upper()
+        request_lines = [f'{method} {url} HTTP/1.1', "Accept: application/json"]
+
+        if method == "GET":
+            lines += [f'--{boundary}', "Content-Type: application/http", "Content-Transfer-Encoding: binary", ""]
+            lines += request_lines + ["", ""]
+            continue
+
+        changeset = "changeset_" + uuid.uuid4().hex
+        body = json.dumps(post_vars) if post_vars is not None else ""
+        request_lines += ["Content-Type: application/json", f'Content-Length: {len(body.encode("utf-8"))}']
+        lines += [f'--{boundary}', f'Content-Type: multipart/mixed; boundary={changeset}', ""]
+        lines += [f'--{changeset}', "Content-Type: application/http", "Content-Transfer-Encoding: binary", ""]
+        lines += request_lines + ["", body, f'--{changeset}--', ""]
+
+    lines.append(f'--{boundary}--')
+    return "\r\n".join(lines).encode("utf-8"), f'multipart/mixed; boundary={boundary}'
+
+def split_headers(block):
+    """
+    Splits a block of text into its header lines and the remainder after the first blank line
+
+    returns:
+        list of header lines and the remaining text
+    """
+    block = block.lstrip("\r\n")
+    match = re.search(r"\r?\n\r?\n", block)
+    if match is None:
+        return block.splitlines(), ""
+    return block[:match.start()].splitlines(), block[match.end():]
+
+def parse_header_lines(lines):
+    headers = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        if value:
+            headers[key.strip()] = value.strip()
+    return headers
+
+def parse_batch_response(content, content_type, urls=None):
+    """
+    Parses an OData v3 multipart/mixed $batch response into one response per operation
+
+    params:
+        content: batch response body as bytes
+        content_type: Content-Type header of the batch response, containing its boundary
+        urls: urls of the operations in request order, used to label the responses
+
+    returns:
+        list of batch_response in the order the operations were sent
+    """
+    responses = []
+    text = content.decode("utf-8", errors="replace")
+
+    match = BOUNDARY_PATTERN.search(content_type or "")
+    if match is None:
+        raise ValueError("Batch response has no multipart boundary")
+    boundary = match.group(1)
+
+    for part in text.split(f'--{boundary}')[1:]:
+        if part.startswith("--"):
+            break
+
+        part_headers, part_body = split_headers(part)
+        part_headers = parse_header_lines(part_headers)
+        part_type = next((value for key, value in part_headers.items() if key.lower() == "content-type"), "")
+
+        #changesets are nested multipart sections containing the write operation responses
+        if part_type.lower().startswith("multipart/mixed"):
+            for changeset_response in parse_batch_response(part_body.encode("utf-8"), part_type):
+                responses.append(changeset_response)
+            continue
+
+        status_lines, body = split_headers(part_body)
+        if not status_lines:
+            continue
+        status_code = int(status_lines[0].split(" ")[1])
+        body = body.rstrip("\r\n")
+        responses.append(batch_response(None, status_code, parse_header_lines(status_lines[1:]), body.encode("utf-8")))
+
+    for response, url in zip(responses, urls or []):
+        response.url = url
+
+    return responses
@@ -0,0 +1,229 @@
+"""
+Mediasite client class for fetching paged OData collections
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import logging
+import assets.mediasite.odata as odata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+class incomplete_listing_error(Exception):
+    def __init__(self, resource, odata_attributes, records=None):
+        """
+        Raised when a page of a collection could not be gathered, so a listing with missing
+        records is never mistaken for the whole collection (for ex. stored on the model)
+
+        params:
+            resource: collection resource within the API, for ex. "Presentations"
+            odata_attributes: odata attributes of the page which could not be gathered
+            records: records gathered before the failure, set by pager.get_all
+        """
+        super().__init__(f'Unable to gather the complete listing of {resource} ({odata_attributes})')
+        self.resource = resource
+        self.odata_attributes = odata_attributes
+        self.records = records or []
+
+class pager():
+    def __init__(self, mediasite, *args, **kwargs):
+        self.mediasite = mediasite
+
+    def build_page_attributes(self, odata_attributes, skip, top):
+        """
+        Appends $skip and $top window attributes to existing odata attributes
+
+        params:
+            odata_attributes: odata attributes for the collection, for ex. "$select=full"
+            skip: number of records to skip
+            top: number of records to request
+
+        returns:
+            odata attribute string for the requested window
+        """
+        window = f'$skip={skip}&$top={top}'
+        odata_attributes = (odata_attributes or '').lstrip('?')
+        return f'{odata_attributes}&{window}' if odata_attributes else window
+
+    def request_collection(self, resource, odata_attributes=""):
+        """
+        Requests a collection resource and checks the result for errors
+
+        params:
+            resource: collection resource within the API, for ex. "Presentations"
+            odata_attributes: odata attributes for the request
+
+        returns:
+            json response, None if the request was not successful
+        """
+        result = self.mediasite.api_client.request("get", resource, odata_attributes)
+
+        if self.mediasite.experienced_request_errors(result):
+            logging.error(f'Unable to get page of {resource} ({odata_attributes})')
+            return None
+
+        result = result.json()
+        if "odata.error" in result:
+            logging.error(result["odata.error"]["code"] + ": " + result["odata.error"]["message"]["value"])
+            return None
+
+        return result
+
+    def request_page(self, resource, odata_attributes="", skip=0, top=1000):
+        """
+        Requests a single $skip/$top window of a collection
+
+        params:
+            resource: collection resource within the API, for ex. "Presentations"
+            odata_attributes: odata attributes for the collection, for ex. "$select=full"
+            skip: number of records to skip
+            top: number of records to request
+
+        returns:
+            json response of the page, None if the request was not successful
+        """
+        return self.request_collection(resource, self.build_page_attributes(odata_attributes, skip, top))
+
+    def get_count(self, resource, odata_attributes=""):
+        """
+        Gathers the number of records in a collection using the odata.count of a single record page
+
+        params:
+            resource: collection resource within the API, for ex. "Presentations"
+            odata_attributes: odata attributes for the collection, for ex. a $filter
+
+        returns:
+            number of records in the collection
+        """
+        result = self.request_page(resource, odata_attributes, 0, 1)
+        if result and "odata.count" in result:
+            return int(result["odata.count"])
+
+        return int()
+
+    def get_all(self, resource, odata_attributes="", page_size=1000, max_workers=None, max_items=None):
+        """
+        Gathers every record of a collection. See iter_pages for how pages are requested.
+
+        params:
+            resource: collection resource within the API, for ex. "Presentations"
+            odata_attributes: odata attributes for the collection, for ex. "$select=full"
+            page_size: records requested per page (1000 is usually the pre-configured maximum on Mediasite API)
+            max_workers: number of pages requested at one time, defaults to the controller setting
+            max_items: stop after gathering this number of records
+
+        returns:
+            list of records in collection order, raises incomplete_listing_error (holding the records
+            gathered so far) if any page could not be gathered
+        """
+        records = []
+        try:
+            for page_records in self.iter_pages(resource, odata_attributes, page_size, max_workers, max_items):
+                records.extend(page_records)
+        except incomplete_listing_error as error:
+            error.records = records
+            raise
+
+        return records
+
+    def iter_pages(self, resource, odata_attributes="", page_size=1000, max_workers=None, max_items=None):
+        """
+        Generator over the pages of a collection. The first page provides odata.count and the
+        page size the server actually honors, the remaining $skip/$top windows are then
+        requested concurrently. At most max_workers pages are held ahead of the consumer so
+        memory stays bounded by page size. Collections are ordered by Id unless the odata
+        attributes provide an $orderby, so windows requested separately do not overlap.
+
+        params:
+            resource: collection resource within the API, for ex. "Presentations"
+            odata_attributes: odata attributes for the collection, for ex. "$select=full"
+            page_size: records requested per page (1000 is usually the pre-configured maximum on Mediasite API)
+            max_workers: number of pages requested at one time, defaults to the controller setting
+            max_items: stop after gathering this number of records
+
+        yields:
+            lists of records in collection order, one per page. Raises incomplete_listing_error
+            if a page could not be gathered.
+        """
+        #OData does not promise the same order across requests without an $orderby
+        odata_attributes = odata.add_default_attribute(odata_attributes, "$orderby", "Id")
+
+        first_page = self.request_page(resource, odata_attributes, 0, page_size)
+        if first_page is None:
+            raise incomplete_listing_error(resource, self.build_page_attributes(odata_attributes, 0, page_size))
+
+        #without a count we can only follow the next links one page at a time
+        if "odata.count" not in first_page:
+            yield from self.iter_next_links(resource, first_page, max_items)
+            return
+
+        count = int(first_page["odata.count"])
+        if max_items:
+            count = min(count, int(max_items))
+
+        records = first_page.get("value", [])
+        yield records[:count]
+
+        #the server may cap the page size below what was requested
+        effective_page_size = len(records)
+        if effective_page_size == 0 or count <= effective_page_size:
+            return
+
+        windows = iter(range(effective_page_size, count, effective_page_size))
+        max_workers = max_workers or self.mediasite.max_workers
+        logging.debug(f'Requesting remaining pages of {resource} ({count} records) with {max_workers} workers')
+
+        def request_window(skip):
+            top = min(effective_page_size, count - skip)
+            page = self.request_page(resource, odata_attributes, skip, top)
+            if page is None:
+                raise incomplete_listing_error(resource, self.build_page_attributes(odata_attributes, skip, top))
+            return page.get("value", [])
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = deque()
+        try:
+            for skip in islice(windows, max_workers):
+                pending.append(executor.submit(request_window, skip))
+
+            while pending:
+                page_records = pending.popleft().result()
+                for skip in islice(windows, 1):
+                    pending.append(executor.submit(request_window, skip))
+                yield page_records
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_next_links(self, resource, page, max_items=None):
+        """
+        Generator over the pages of a collection following odata.nextLink
+
+        params:
+            resource: collection resource within the API, for ex. "Presentations"
+            page: json response of the first page
+            max_items: stop after gathering this number of records
+
+        yields:
+            lists of records in collection order, one per page. Raises incomplete_listing_error
+            if a page could not be gathered.
+        """
+        gathered = 0
+        while page is not None:
+            records = page.get("value", [])
+            if max_items:
+                records = records[:int(max_items) - gathered]
+            gathered += len(records)
+            yield records
+
+            next_link = page.get("odata.nextLink")
+            if not next_link or (max_items and gathered >= int(max_items)):
+                break
+
+            page = self.request_collection(resource, next_link.split('?')[-1])
+            if page is None:
+                raise incomplete_listing_error(resource, next_link.split('?')[-1])
@@ -0,0 +1,129 @@
+"""
+Columnar on-disk cache of parsed Mediasite report sheets, stored as Feather (Arrow IPC) files
+next to the downloaded reports. Requires pyarrow, without which reports are always parsed.
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import glob
+import hashlib
+import logging
+import os
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+#changed whenever parsed sheets change shape so older cached sheets are no longer used
+CACHE_VERSION = "1"
+
+#whether the missing pyarrow warning was logged by this process
+warned_unavailable = False
+
+class report_cache():
+    def __init__(self, directory=None):
+        """
+        Stores each parsed report sheet under the hash of the report file, so a report downloaded
+        again with new contents is parsed again while unchanged reports are read from the cache.
+        Cached sheets are uncompressed so they can be memory-mapped when read.
+
+        params:
+            directory: directory cached sheets are stored in, next to each report if None
+        """
+        self.directory = directory
+
+    def available(self):
+        """
+        returns:
+            whether pyarrow is installed, warning once per process if it is not
+        """
+        global warned_unavailable
+        if feather is None and not warned_unavailable:
+            logging.warning("pyarrow is not installed, report sheets will be parsed without being cached (pip install pyarrow)")
+            warned_unavailable = True
+        return feather is not None
+
+    def hash_file(self, filepath, block_size=1024*1024):
+        """
+        returns:
+            hex digest of the report file contents and the cache version
+        """
+        digest = hashlib.sha256(CACHE_VERSION.encode("utf-8"))
+        with open(filepath, "rb") as handle:
+            for block in iter(lambda: handle.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get_path(self, filepath, sheet, file_hash="*"):
+        """
+        returns:
+            path of the cached sheet of a report file, for ex. "mediasite_report_weekly_bba_10-18-2026.excel.xml.3.1f2e....feather"
+        """
+        directory = self.directory or os.path.dirname(os.path.abspath(filepath))
+        return os.path.join(directory, f'{os.path.basename(filepath)}.{sheet}.{file_hash[:16]}.feather')
+
+    def load(self, filepath, sheet, file_hash):
+        """
+        returns:
+            pandas dataframe of the cached sheet, or None if the sheet is not cached for this file hash
+        """
+        path = self.get_path(filepath, sheet, file_hash)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            return feather.read_table(path, memory_map=True).to_pandas()
+        except Exception as e:
+            logging.warning("Unable to read cached report sheet "+path+": "+str(e))
+            return None
+
+    def store(self, filepath, sheet, file_hash, frame):
+        """
+        Writes a parsed sheet to the cache, removing sheets cached for earlier contents of the file
+        """
+        path = self.get_path(filepath, sheet, file_hash)
+        for stale_path in glob.glob(glob.escape(self.get_path(filepath, sheet, "")[:-len(".feather")]) + "*.feather"):
+            if stale_path != path:
+                os.remove(stale_path)
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            feather.write_feather(frame, path + ".tmp", compression="uncompressed")
+            os.replace(path + ".tmp", path)
+        except Exception as e:
+            logging.warning("Unable to cache report sheet "+path+": "+str(e))
+
+    def load_or_parse(self, filepath, sheets, parse):
+        """
+        Reads report sheets from the cache, parsing and caching only the sheets which are not
+
+        params:
+            filepath: filepath to the report
+            sheets: sheet indexes or names to load
+            parse: function taking a list of sheets and returning a dictionary of each to its pandas dataframe
+
+        returns:
+            dictionary of each requested sheet to its pandas dataframe
+        """
+        if not self.available():
+            return parse(sheets)
+
+        file_hash = self.hash_file(filepath)
+        frames = {}
+        for sheet in sheets:
+            frame = self.load(filepath, sheet, file_hash)
+            if frame is not None:
+                logging.debug("Read report sheet "+str(sheet)+" of "+filepath+" from cache")
+                frames[sheet] = frame
+
+        missing_sheets = [sheet for sheet in sheets if sheet not in frames]
+        if missing_sheets:
+            parsed = parse(missing_sheets)
+            for sheet in missing_sheets:
+                self.store(filepath, sheet, file_hash, parsed[sheet])
+            frames.update(parsed)
+
+        return frames
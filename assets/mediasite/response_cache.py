@@ -0,0 +1,230 @@
+"""
+Persistent on-disk cache for Mediasite API GET responses
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+class cached_response:
+    def __init__(self, url, status_code, headers, content):
+        """
+        Response served from the cache. Mirrors the parts of requests.Response
+        used throughout the Mediasite modules.
+
+        params:
+            url: url which the response was stored for
+            status_code: http status code of the stored response
+            headers: dictionary of stored response headers
+            content: response body as bytes
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1024):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+class response_cache:
+    def __init__(self, path, ttl=None, default_ttl=0, max_size_mb=256, identity=""):
+        """
+        params:
+            path: sqlite database file used to store responses
+            ttl: dictionary of seconds responses stay fresh per resource name, for ex. {"Folders": 3600}
+            default_ttl: seconds responses for resources not listed in ttl stay fresh, 0 disables caching them
+            max_size_mb: size of stored responses above which least recently used entries are evicted
+            identity: credentials the responses are gathered with, for ex. the username and api key. Responses
+                are stored under its hash so clients with different credentials sharing a cache file never
+                serve each other's responses.
+        """
+        self.path = path
+        self.identity = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+        self.ttl = ttl or {}
+        self.default_ttl = default_ttl
+        self.max_size = int(max_size_mb * 1024 * 1024)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("""CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                resource TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                content BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                stored REAL,
+                accessed REAL,
+                size INTEGER)""")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS responses_resource ON responses (resource)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def get_resource_name(self, resource):
+        """
+        Finds the collection name of a resource, for ex. "Presentations('1234')/Presenters" is "Presentations"
+
+        params:
+            resource: resource within the API
+
+        returns:
+            collection name of the resource
+        """
+        return re.split(r"[(/?]", resource, maxsplit=1)[0]
+
+    def get_resource_key(self, resource):
+        """
+        Lists the collection name of every segment of a resource so responses for nested resources
+        can be invalidated by any of them, for ex. "Folders('1234')/Presentations" is "/Folders/Presentations/"
+
+        params:
+            resource: resource within the API
+
+        returns:
+            collection names of the resource separated and surrounded by "/"
+        """
+        path = re.split(r"[?]", resource, maxsplit=1)[0]
+        names = [re.split(r"[(]", segment, maxsplit=1)[0] for segment in path.split("/")]
+        return "/" + "".join(name + "/" for name in names if name)
+
+    def get_key(self, url):
+        """
+        returns:
+            key responses for the url are stored under, for ex. "1f2e3d4c5b6a7980 https://.../Folders"
+        """
+        return f'{self.identity} {url}'
+
+    def get_ttl(self, resource):
+        """
+        params:
+            resource: resource within the API
+
+        returns:
+            seconds responses for the resource stay fresh, 0 if they are not cached
+        """
+        return self.ttl.get(self.get_resource_name(resource), self.default_ttl)
+
+    def lookup(self, url):
+        """
+        Finds the stored response for a url
+
+        params:
+            url: full request url
+
+        returns:
+            dictionary with the cached_response, etag, last_modified and stored time, None if not stored
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT status_code, headers, content, etag, last_modified, stored FROM responses WHERE url = ?",
+                (self.get_key(url),)).fetchone()
+
+        if row is None:
+            return None
+
+        status_code, headers, content, etag, last_modified, stored = row
+        return {
+            "response": cached_response(url, status_code, json.loads(headers), content),
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored": stored
+        }
+
+    def is_fresh(self, entry, resource):
+        return time.time() - entry["stored"] < self.get_ttl(resource)
+
+    def touch(self, url, revalidated=False):
+        """
+        Marks a stored response as recently used, and fresh again if it was revalidated with the server
+
+        params:
+            url: full request url
+            revalidated: whether the server confirmed the stored response is unchanged
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            if revalidated:
+                self.connection.execute("UPDATE responses SET accessed = ?, stored = ? WHERE url = ?", (now, now, self.get_key(url)))
+            else:
+                self.connection.execute("UPDATE responses SET accessed = ? WHERE url = ?", (now, self.get_key(url)))
+
+    def store(self, url, resource, rsp):
+        """
+        Stores a successful response, evicting least recently used entries when over the size limit
+
+        params:
+            url: full request url
+            resource: resource within the API
+            rsp: response to store
+        """
+        now = time.time()
+        content = rsp.content
+        headers = {key: value for key, value in rsp.headers.items()
+                   if key.lower() in ("content-type", "etag", "last-modified")}
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.get_key(url), self.get_resource_key(resource), rsp.status_code, json.dumps(headers), content,
+                 rsp.headers.get("ETag"), rsp.headers.get("Last-Modified"), now, now, len(content)))
+            self.evict()
+
+    def evict(self):
+        """
+        Removes least recently used entries until stored responses fit in max_size. Expects the lock to be held.
+        """
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        for url, size in self.connection.execute("SELECT url, size FROM responses ORDER BY accessed").fetchall():
+            self.connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def invalidate(self, resource=None):
+        """
+        Removes stored responses, for use after changes are made through the API
+
+        params:
+            resource: collection name whose responses are removed, including those of resources nested
+                in or containing it (for ex. "Presentations" also removes "Folders('1234')/Presentations"),
+                all responses if None
+        """
+        with self.lock, self.connection:
+            if resource is None:
+                self.connection.execute("DELETE FROM responses")
+            else:
+                resource_name = self.get_resource_name(resource)
+                pattern = "%/" + resource_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"
+                self.connection.execute("DELETE FROM responses WHERE resource LIKE ? ESCAPE '\\'", (pattern,))
+
+        logging.debug(f'Invalidated cached responses for {resource or "all resources"}')
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
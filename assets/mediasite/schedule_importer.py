@@ -0,0 +1,236 @@
+"""
+DataFrame based reading of scheduling spreadsheets into Mediasite schedule data
+
+Last modified: October 2026
+
+License: MIT - see license.txt
+"""
+
+import datetime
+import logging
+import os
+import pandas as pd
+import tzlocal
+
+#spreadsheet columns holding "TRUE"/"FALSE" values and the schedule data keys they fill
+BOOLEAN_COLUMNS = {
+    "Include Catalog":"catalog_include",
+    "Enable Catalog Download":"catalog_enable_download",
+    "Allow Catalog Links":"catalog_allow_links",
+    "Include Module":"module_include"
+}
+
+#spreadsheet columns copied into the schedule data as text
+TEXT_COLUMNS = {
+    "Mediasite Folder":"folders",
+    "Catalog Name":"catalog_name",
+    "Catalog Description":"catalog_description",
+    "Module Name":"module_name",
+    "Module ID":"module_id",
+    "Template":"schedule_template",
+    "Presentation Title":"schedule_name",
+    "Naming Scheme":"schedule_naming_scheme",
+    "Recorder":"schedule_recorder",
+    "Recurrence":"schedule_recurrence",
+    "Recurrence Frequency":"schedule_recurrence_freq"
+}
+
+#spreadsheet day of week columns and the schedule data days they fill
+DAY_COLUMNS = {
+    "Sun":"Sunday",
+    "Mon":"Monday",
+    "Tue":"Tuesday",
+    "Wed":"Wednesday",
+    "Thu":"Thursday",
+    "Fri":"Friday",
+    "Sat":"Saturday"
+}
+
+MEDIASITE_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+class schedule_importer():
+    def __init__(self, local_tz=None):
+        """
+        Reads scheduling spreadsheets with the columns described in schedule.gather_import_schedule_data.
+        Every column is parsed for all rows at once and the schedule data dictionaries are built lazily.
+
+        params:
+            local_tz: timezone the spreadsheet dates and times are in, defaults to the system timezone
+        """
+        self.local_tz = local_tz or tzlocal.get_localzone()
+
+    def read(self, path, sheet_name=0):
+        """
+        Reads a CSV or Excel scheduling spreadsheet, all values being kept as text
+
+        params:
+            path: path to a .csv, .xlsx or .xls file
+            sheet_name: sheet to read from Excel files
+
+        returns:
+            pandas DataFrame with one row per schedule
+        """
+        logging.info("Reading scheduling spreadsheet: " + path)
+
+        if os.path.splitext(path)[1].lower() == ".csv":
+            frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        else:
+            frame = pd.read_excel(path, sheet_name=sheet_name, dtype=str).fillna("")
+
+        frame.columns = [str(column).strip() for column in frame.columns]
+        return frame
+
+    def parse_dates(self, values):
+        """
+        Parses dates written as "08/24/26", falling back to other formats (for ex. dates read from Excel cells)
+
+        returns:
+            pandas Series of datetimes at midnight, NaT where a value could not be read
+        """
+        dates = pd.to_datetime(values, format="%m/%d/%y", errors="coerce")
+
+        unread = dates.isna() & (values != "")
+        if unread.any():
+            dates[unread] = pd.to_datetime(values[unread], format="mixed", errors="coerce")
+
+        return dates.dt.normalize()
+
+    def parse_times(self, values):
+        """
+        Parses times written as "09:00 AM", falling back to other formats (for ex. "09:00:00")
+
+        returns:
+            pandas Series of time since midnight, NaT where a value could not be read
+        """
+        times = pd.to_datetime(values, format="%I:%M %p", errors="coerce")
+
+        unread = times.isna() & (values != "")
+        if unread.any():
+            times[unread] = pd.to_datetime(values[unread], format="mixed", errors="coerce")
+
+        return times - times.dt.normalize()
+
+    def to_utc(self, local_datetimes):
+        """
+        Converts local datetimes to UTC using the offset in effect on each date
+
+        returns:
+            pandas Series of naive UTC datetimes
+        """
+        return local_datetimes.dt.tz_localize(self.local_tz, ambiguous=True, nonexistent=datetime.timedelta(hours=1)) \
+                              .dt.tz_convert("UTC") \
+                              .dt.tz_localize(None)
+
+    def parse(self, frame):
+        """
+        Parses every column of a scheduling spreadsheet at once
+
+        params:
+            frame: pandas DataFrame as returned by read
+
+        returns:
+            pandas DataFrame with one column per schedule data key, and an "error" column
+            describing rows which could not be read (empty for rows which were read)
+        """
+        frame = frame.fillna("").astype(str)
+        missing_columns = [column for column in list(BOOLEAN_COLUMNS) + list(TEXT_COLUMNS) + list(DAY_COLUMNS) +
+                           ["Delete Schedule After Occurrences", "Start Date", "End Date", "Start Time", "End Time"]
+                           if column not in frame.columns]
+        if missing_columns:
+            raise KeyError(f'Scheduling spreadsheet is missing columns: {", ".join(missing_columns)}')
+
+        parsed = pd.DataFrame(index=frame.index)
+
+        for column, key in TEXT_COLUMNS.items():
+            parsed[key] = frame[column]
+
+        for column, key in BOOLEAN_COLUMNS.items():
+            parsed[key] = frame[column].str.strip().str.upper() == "TRUE"
+
+        for column, day in DAY_COLUMNS.items():
+            parsed[day] = frame[column].str.strip().str.upper() == "TRUE"
+
+        auto_delete = frame["Delete Schedule After Occurrences"].str.strip().str.upper() == "TRUE"
+        parsed["schedule_auto_delete"] = auto_delete.map({True:"True", False:"False"})
+
+        start_times = self.parse_times(frame["Start Time"].str.strip())
+        end_times = self.parse_times(frame["End Time"].str.strip())
+
+        #schedules are created 10 seconds into the minute as the row by row import does
+        seconds = pd.Timedelta(seconds=10)
+        local_start = self.parse_dates(frame["Start Date"].str.strip()) + start_times + seconds
+        local_end = self.parse_dates(frame["End Date"].str.strip()) + end_times + seconds
+
+        parsed["schedule_duration"] = ((end_times - start_times) % pd.Timedelta(days=1) // pd.Timedelta(minutes=1)) \
+            .astype("Int64").astype(str)
+
+        unread = local_start.isna() | local_end.isna()
+        parsed["error"] = ""
+        parsed.loc[unread, "error"] = "Error: " + parsed.loc[unread, "schedule_name"] + \
+            " - Unable to read the start or end date and time."
+
+        utc_start = self.to_utc(local_start)
+        utc_end = self.to_utc(local_end)
+
+        parsed["schedule_start_datetime_local"] = local_start
+        parsed["schedule_end_datetime_local"] = local_end
+        parsed["schedule_start_datetime_utc"] = utc_start
+        parsed["schedule_end_datetime_utc"] = utc_end
+        parsed["schedule_start_datetime_local_string"] = local_start.dt.strftime(MEDIASITE_DATETIME_FORMAT)
+        parsed["schedule_end_datetime_local_string"] = local_end.dt.strftime(MEDIASITE_DATETIME_FORMAT)
+        parsed["schedule_start_datetime_utc_string"] = utc_start.dt.strftime(MEDIASITE_DATETIME_FORMAT)
+        parsed["schedule_end_datetime_utc_string"] = utc_end.dt.strftime(MEDIASITE_DATETIME_FORMAT)
+
+        return parsed
+
+    def iter_schedule_data(self, parsed):
+        """
+        Generator over the schedule data of parsed rows which could be read, built one row at a time
+
+        params:
+            parsed: pandas DataFrame as returned by parse
+
+        yields:
+            row index and schedule data dictionary in the format of schedule.gather_import_schedule_data
+        """
+        readable = parsed[parsed["error"] == ""]
+
+        #converted to python values once for all rows so each dictionary is only a lookup per key
+        columns = {column:readable[column].tolist() for column in readable.columns}
+        for column in ("schedule_start_datetime_local", "schedule_end_datetime_local",
+                       "schedule_start_datetime_utc", "schedule_end_datetime_utc"):
+            columns[column] = list(readable[column].dt.to_pydatetime())
+
+        for position, row_index in enumerate(readable.index):
+            row = {column:values[position] for column, values in columns.items()}
+
+            yield row_index, {
+                "folder_root_id":"",
+                "folders":row["folders"],
+                "catalog_include":bool(row["catalog_include"]),
+                "catalog_name":row["catalog_name"],
+                "catalog_description":row["catalog_description"],
+                "catalog_enable_download":bool(row["catalog_enable_download"]),
+                "catalog_allow_links":bool(row["catalog_allow_links"]),
+                "module_include":bool(row["module_include"]),
+                "module_name":row["module_name"],
+                "module_id":row["module_id"],
+                "schedule_parent_folder_id":"",
+                "schedule_template":row["schedule_template"],
+                "schedule_name":row["schedule_name"],
+                "schedule_naming_scheme":row["schedule_naming_scheme"],
+                "schedule_recorder":row["schedule_recorder"],
+                "schedule_recurrence":row["schedule_recurrence"],
+                "schedule_auto_delete":row["schedule_auto_delete"],
+                "schedule_start_datetime_utc_string":row["schedule_start_datetime_utc_string"],
+                "schedule_end_datetime_utc_string":row["schedule_end_datetime_utc_string"],
+                "schedule_start_datetime_utc":row["schedule_start_datetime_utc"],
+                "schedule_end_datetime_utc":row["schedule_end_datetime_utc"],
+                "schedule_start_datetime_local_string":row["schedule_start_datetime_local_string"],
+                "schedule_end_datetime_local_string":row["schedule_end_datetime_local_string"],
+                "schedule_start_datetime_local":row["schedule_start_datetime_local"],
+                "schedule_end_datetime_local":row["schedule_end_datetime_local"],
+                "schedule_duration":row["schedule_duration"],
+                "schedule_recurrence_freq":row["schedule_recurrence_freq"],
+                "schedule_days_of_week":{day:bool(row[day]) for day in DAY_COLUMNS.values()}
+            }
@@ -1,26 +1,458 @@
-# Referenced from: 
+# Referenced from:
 # https://www.safaribooksonline.com/library/view/python-cookbook-2nd/0596007973/ch12s08.html
 
-from xml.sax import ContentHandler, parse
+import datetime
+from array import array
+import numpy as np
+from xml.sax import ContentHandler, SAXException, parse
+from xml.etree.ElementTree import iterparse
+
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+#int64 value numpy reads as NaT
+NAT_VALUE = np.iinfo(np.int64).min
+
+#array typecodes of the column buffer kinds kept in machine arrays
+KIND_TYPECODES = {"bool":"b", "int":"q", "float":"d", "datetime":"q"}
+
+#element tag prefix of SpreadsheetML elements and attributes when read with ElementTree
+SPREADSHEET_NAMESPACE = "{urn:schemas-microsoft-com:office:spreadsheet}"
+
+class StopParsing(SAXException):
+    """
+    Raised by ExcelHandler once every requested worksheet was read, ending the parse early
+    """
+    pass
+
+def convert_value(text, data_type):
+    """
+    Converts the text of a SpreadsheetML cell to a python value based on its ss:Type
+
+    params:
+        text: cell text
+        data_type: ss:Type of the cell data, for ex. "String", "Number", "DateTime" or "Boolean"
+
+    returns:
+        int, float, datetime, bool or str value (None for empty non-text cells)
+    """
+    if data_type is None or data_type == "String":
+        return text
+    if text == "":
+        return None
+
+    try:
+        if data_type == "Number":
+            try:
+                return int(text)
+            except ValueError:
+                return float(text)
+        if data_type == "DateTime":
+            #fromisoformat is much faster than strptime on the usual "2018-05-01T00:00:00.000" values
+            try:
+                return datetime.datetime.fromisoformat(text[:19])
+            except ValueError:
+                return datetime.datetime.strptime(text[:19], "%Y-%m-%dT%H:%M:%S")
+        if data_type == "Boolean":
+            return text.strip() == "1"
+    except ValueError:
+        pass
+
+    return text
+
 class ExcelHandler(ContentHandler):
-    def __init__(self):
+    def __init__(self, sheets=None, typed=False):
+        """
+        SAX handler gathering the rows of SpreadsheetML (Excel XML) worksheets
+
+        params:
+            sheets: worksheet indexes or names to gather, all worksheets are gathered if None.
+                Parsing stops once each of them was read.
+            typed: whether cells are converted to python values based on their ss:Type, or the
+                worksheet indexes or names whose cells are converted
+        """
         self.chars = [  ]
         self.cells = [  ]
         self.rows = [  ]
         self.tables = [  ]
+        self.sheets = sheets
+        self.typed = typed
+        self.sheet_tables = {  }
+        self.sheet_names = [  ]
+        self.remaining = set(sheets) if sheets is not None else None
+        self.keep = True
+        self.typed_sheet = typed is True
+        self.data_type = None
+    def wanted(self, sheet_index, sheet_name):
+        return self.sheets is None or sheet_index in self.sheets or sheet_name in self.sheets
+    def is_typed(self, sheet_index, sheet_name):
+        if isinstance(self.typed, bool):
+            return self.typed
+        return sheet_index in self.typed or sheet_name in self.typed
     def characters(self, content):
-        self.chars.append(content)
+        if self.keep:
+            self.chars.append(content)
     def startElement(self, name, atts):
+        if name=="Worksheet":
+            self.sheet_names.append(atts.get("ss:Name", ""))
+            self.keep = self.wanted(len(self.sheet_names)-1, self.sheet_names[-1])
+            self.typed_sheet = self.is_typed(len(self.sheet_names)-1, self.sheet_names[-1])
+        if not self.keep:
+            return
         if name=="Cell":
             self.chars = [  ]
+            self.data_type = None
+            #cells following skipped (empty) cells carry their 1-based column index
+            if "ss:Index" in atts:
+                self.cells.extend([None if self.typed_sheet else ''] * (int(atts["ss:Index"])-1-len(self.cells)))
+        elif name=="Data":
+            self.data_type = atts.get("ss:Type")
         elif name=="Row":
             self.cells=[  ]
         elif name=="Table":
             self.rows = [  ]
     def endElement(self, name):
+        if name=="Worksheet":
+            if self.keep and self.remaining is not None:
+                self.remaining.discard(len(self.sheet_names)-1)
+                self.remaining.discard(self.sheet_names[-1])
+                if not self.remaining:
+                    raise StopParsing("All requested worksheets were read")
+            self.keep = True
+        if not self.keep:
+            return
         if name=="Cell":
-            self.cells.append(''.join(self.chars))
+            text = ''.join(self.chars)
+            self.cells.append(convert_value(text, self.data_type) if self.typed_sheet else text)
         elif name=="Row":
-            self.rows.append(self.cells)
+            self.add_row(self.cells)
         elif name=="Table":
-            self.tables.append(self.rows)  
\ No newline at end of file
+            self.tables.append(self.rows)
+            self.sheet_tables[len(self.sheet_names)-1] = self.rows
+            self.sheet_tables[self.sheet_names[-1]] = self.rows
+    def add_row(self, cells):
+        self.rows.append(cells)
+
+def parse_sheets(filepath, sheets, typed=False):
+    """
+    Reads the requested worksheets of a SpreadsheetML (Excel XML) file in a single pass,
+    stopping after the last of them
+
+    params:
+        filepath: filepath to the excel xml file
+        sheets: worksheet indexes or names to read
+        typed: whether cells are converted to python values based on their ss:Type, or the
+            worksheet indexes or names whose cells are converted
+
+    returns:
+        dictionary of each requested worksheet index or name to its list of rows
+    """
+    handler = ExcelHandler(sheets, typed)
+    try:
+        parse(filepath, handler)
+    except StopParsing:
+        pass
+
+    missing_sheets = [sheet for sheet in sheets if sheet not in handler.sheet_tables]
+    if missing_sheets:
+        raise KeyError(f'Worksheets not found in {filepath}: {missing_sheets}')
+
+    return {sheet:handler.sheet_tables[sheet] for sheet in sheets}
+
+class ColumnBuffer():
+    def __init__(self, kind=None):
+        """
+        Typed buffer for the values of one worksheet column. The buffer kind follows the python
+        type of the first value (see convert_value): ints, floats and datetimes are kept in
+        machine arrays, other values in a list. Ints become floats once a cell is empty, and
+        values not matching the kind turn the buffer into a list.
+
+        params:
+            kind: kind to start the buffer with, for ex. the kind the column had in an earlier chunk of rows
+        """
+        self.kind = None
+        self.values = [  ]
+        self.nulls = 0
+        if kind:
+            self.set_kind(kind)
+    def set_kind(self, kind):
+        self.kind = kind
+        self.values = array(KIND_TYPECODES[kind]) if kind in KIND_TYPECODES else [  ]
+    def promote(self, kind):
+        values = self.to_array()
+        if kind == "float":
+            self.values = array("d", values.astype(np.float64).tobytes())
+        else:
+            self.values = values.astype(object).tolist() if self.kind != "datetime" else \
+                [None if value == NAT_VALUE else EPOCH + value * MICROSECOND for value in self.values]
+        self.kind = kind
+    def start(self, value):
+        if isinstance(value, bool):
+            self.set_kind("bool")
+        elif isinstance(value, int):
+            self.set_kind("int")
+        elif isinstance(value, float):
+            self.set_kind("float")
+        elif isinstance(value, datetime.datetime):
+            self.set_kind("datetime")
+        else:
+            self.set_kind("object")
+        #empty cells seen before the first value
+        nulls, self.nulls = self.nulls, 0
+        for _ in range(nulls):
+            self.append(None)
+    def append(self, value):
+        #empty text cells count as empty in columns which are not text
+        if value == "":
+            value = None if self.kind != "object" else value
+
+        if self.kind is None:
+            if value is None:
+                self.nulls += 1
+                return
+            self.start(value)
+
+        kind = self.kind
+        if kind == "object":
+            self.values.append(value)
+        elif value is None:
+            if kind == "float":
+                self.values.append(float("nan"))
+            elif kind == "datetime":
+                self.values.append(NAT_VALUE)
+            elif kind == "int":
+                self.promote("float")
+                self.values.append(float("nan"))
+            else:
+                self.promote("object")
+                self.values.append(value)
+        elif kind == "datetime" and isinstance(value, datetime.datetime):
+            self.values.append((value - EPOCH) // MICROSECOND)
+        elif kind == "bool" and isinstance(value, bool):
+            self.values.append(value)
+        elif kind in ("int", "float") and isinstance(value, (int, float)) and not isinstance(value, bool):
+            if kind == "int" and isinstance(value, float):
+                self.promote("float")
+            self.values.append(value)
+        else:
+            self.promote("object")
+            self.values.append(value)
+    def __len__(self):
+        return self.nulls if self.kind is None else len(self.values)
+    def to_array(self):
+        """
+        returns:
+            numpy array sharing the memory of the buffer (a list for text columns)
+        """
+        if self.kind is None:
+            return [None] * self.nulls
+        if self.kind == "object":
+            return self.values
+        if self.kind == "float":
+            return np.frombuffer(self.values, dtype=np.float64)
+        if self.kind == "bool":
+            return np.frombuffer(self.values, dtype=np.int8).view(np.bool_)
+        values = np.frombuffer(self.values, dtype=np.int64)
+        return values.view("datetime64[us]") if self.kind == "datetime" else values
+
+class ColumnarExcelHandler(ExcelHandler):
+    def __init__(self, sheets=None, row_sheets=()):
+        """
+        SAX handler gathering worksheets as typed columns rather than rows. The first row of each
+        worksheet holds the column names, cells of the following rows are converted by their ss:Type
+        and appended to one ColumnBuffer per column.
+
+        params:
+            sheets: worksheet indexes or names to gather, all worksheets are gathered if None.
+                Parsing stops once each of them was read.
+            row_sheets: worksheet indexes or names gathered as rows of text as ExcelHandler does,
+                for ex. sheets laid out as labels and values
+        """
+        super().__init__(sheets, typed=True)
+        self.row_sheets = row_sheets
+        self.column_names = None
+        self.buffers = [  ]
+        self.sheet_columns = {  }
+    def is_typed(self, sheet_index, sheet_name):
+        return sheet_index not in self.row_sheets and sheet_name not in self.row_sheets
+    def startElement(self, name, atts):
+        super().startElement(name, atts)
+        if name=="Table" and self.keep and self.typed_sheet:
+            self.column_names = None
+            self.buffers = [  ]
+    def endElement(self, name):
+        if name=="Table" and self.keep and self.typed_sheet:
+            columns = (self.column_names or [  ], [buffer.to_array() for buffer in self.buffers])
+            self.sheet_columns[len(self.sheet_names)-1] = columns
+            self.sheet_columns[self.sheet_names[-1]] = columns
+        super().endElement(name)
+    def add_row(self, cells):
+        if not self.typed_sheet:
+            super().add_row(cells)
+            return
+
+        if self.column_names is None:
+            self.column_names = ["" if cell is None else str(cell) for cell in cells]
+            self.buffers = [ColumnBuffer() for _ in cells]
+            return
+
+        #cells past the named columns get a column named by their position
+        for position in range(len(self.buffers), len(cells)):
+            self.column_names.append(str(position))
+            buffer = ColumnBuffer()
+            for _ in range(len(self.buffers[0]) if self.buffers else 0):
+                buffer.append(None)
+            self.buffers.append(buffer)
+
+        for position, buffer in enumerate(self.buffers):
+            buffer.append(cells[position] if position < len(cells) else None)
+
+def parse_sheet_columns(filepath, sheets, row_sheets=()):
+    """
+    Reads the requested worksheets of a SpreadsheetML (Excel XML) file in a single pass as typed
+    columns, stopping after the last of them
+
+    params:
+        filepath: filepath to the excel xml file
+        sheets: worksheet indexes or names to read
+        row_sheets: worksheets among sheets read as rows of text rather than columns
+
+    returns:
+        dictionary of each requested worksheet index or name to its column names and column
+        values (numpy arrays for numeric, datetime and boolean columns, lists otherwise), or to
+        its list of rows for row_sheets
+    """
+    handler = ColumnarExcelHandler(sheets, row_sheets)
+    try:
+        parse(filepath, handler)
+    except StopParsing:
+        pass
+
+    gathered = dict(handler.sheet_tables)
+    gathered.update(handler.sheet_columns)
+    missing_sheets = [sheet for sheet in sheets if sheet not in gathered]
+    if missing_sheets:
+        raise KeyError(f'Worksheets not found in {filepath}: {missing_sheets}')
+
+    return {sheet:gathered[sheet] for sheet in sheets}
+
+def rows_to_columns(column_names, rows, kinds=None):
+    """
+    Turns rows into typed columns, see ColumnBuffer
+
+    params:
+        column_names: names of the columns, extended with positional names for cells past them
+        rows: list of rows of python values
+        kinds: buffer kinds of the columns in earlier chunks of rows, so each column keeps its type
+            from chunk to chunk. Updated with the kinds of these rows (None for columns without values yet).
+
+    returns:
+        list of column values (numpy arrays for numeric, datetime and boolean columns, lists otherwise)
+    """
+    if kinds is None:
+        kinds = [  ]
+    buffers = [ColumnBuffer(kinds[position] if position < len(kinds) else None) for position in range(len(column_names))]
+    for row_number, cells in enumerate(rows):
+        for position in range(len(buffers), len(cells)):
+            if position >= len(column_names):
+                column_names.append(str(position))
+            buffer = ColumnBuffer()
+            for _ in range(row_number):
+                buffer.append(None)
+            buffers.append(buffer)
+
+        for position, buffer in enumerate(buffers):
+            buffer.append(cells[position] if position < len(cells) else None)
+
+    kinds[:] = [buffer.kind for buffer in buffers]
+    return [buffer.to_array() for buffer in buffers]
+
+def read_row(row, typed=True):
+    """
+    params:
+        row: SpreadsheetML Row element
+        typed: whether cells are converted to python values based on their ss:Type
+
+    returns:
+        list of the cell values of the row
+    """
+    cells = [  ]
+    for cell in row.iter(SPREADSHEET_NAMESPACE+"Cell"):
+        #cells following skipped (empty) cells carry their 1-based column index
+        index = cell.get(SPREADSHEET_NAMESPACE+"Index")
+        if index:
+            cells.extend([None if typed else ''] * (int(index)-1-len(cells)))
+
+        data = cell.find(SPREADSHEET_NAMESPACE+"Data")
+        if data is None:
+            cells.append(None if typed else '')
+            continue
+
+        text = ''.join(data.itertext())
+        cells.append(convert_value(text, data.get(SPREADSHEET_NAMESPACE+"Type")) if typed else text)
+
+    return cells
+
+def iter_sheet_rows(filepath, sheet, typed=True):
+    """
+    Generator over the rows of one worksheet of a SpreadsheetML (Excel XML) file. Elements are
+    cleared as soon as each row was read so memory stays bounded whatever the size of the
+    worksheet, and reading stops at the end of the worksheet.
+
+    params:
+        filepath: filepath to the excel xml file
+        sheet: worksheet index or name
+        typed: whether cells are converted to python values based on their ss:Type
+
+    yields:
+        list of the cell values of each row, the first row usually holding the column names
+    """
+    sheet_index = -1
+    in_sheet = False
+    table = None
+
+    for event, elem in iterparse(filepath, events=("start", "end")):
+        if event == "start":
+            if elem.tag == SPREADSHEET_NAMESPACE+"Worksheet":
+                sheet_index += 1
+                in_sheet = sheet == sheet_index or sheet == elem.get(SPREADSHEET_NAMESPACE+"Name")
+            elif elem.tag == SPREADSHEET_NAMESPACE+"Table":
+                table = elem
+            continue
+
+        if elem.tag == SPREADSHEET_NAMESPACE+"Row":
+            if in_sheet:
+                yield read_row(elem, typed)
+
+            #drop the rows read so far from the tree being built
+            table.clear()
+
+        elif elem.tag == SPREADSHEET_NAMESPACE+"Worksheet":
+            if in_sheet:
+                return
+            elem.clear()
+
+    raise KeyError(f'Worksheet not found in {filepath}: {sheet}')
+
+def iter_sheet_chunks(filepath, sheet, chunk_size=10000, typed=True):
+    """
+    Generator over fixed-size chunks of the rows of one worksheet, see iter_sheet_rows
+
+    params:
+        filepath: filepath to the excel xml file
+        sheet: worksheet index or name
+        chunk_size: number of rows per chunk, the last chunk may be smaller
+        typed: whether cells are converted to python values based on their ss:Type
+
+    yields:
+        list of at most chunk_size rows
+    """
+    chunk = [  ]
+    for row in iter_sheet_rows(filepath, sheet, typed):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = [  ]
+
+    if chunk:
+        yield chunk
@@ -0,0 +1,106 @@
+"""
+Tests for concurrent processing of batch scheduling data
+
+License: MIT - see license.txt
+"""
+
+import threading
+import unittest
+
+import pandas as pd
+
+import assets.mediasite.controller as controller
+import assets.mediasite.folder_path_cache as folder_path_cache
+import assets.mediasite.modules.folder as folder
+import assets.mediasite.modules.schedule as schedule
+
+class stub_model:
+    def get_root_parent_folder_id(self):
+        return "root"
+
+class stub_mediasite:
+    max_workers = 4
+
+    get_schedule_folders = controller.controller.get_schedule_folders
+    get_schedule_folder_root_id = controller.controller.get_schedule_folder_root_id
+
+    def __init__(self, invalid_rows=(), failing_names=()):
+        """
+        params:
+            invalid_rows: row indexes reported by batch validation
+            failing_names: schedule names whose processing raises
+        """
+        self.model = stub_model()
+        self.invalid_rows = invalid_rows
+        self.failing_names = failing_names
+        self.lock = threading.Lock()
+        self.created_folders = []
+        self.processed_rows = []
+
+        self.folder = folder.folder.__new__(folder.folder)
+        self.folder.mediasite = self
+        self.folder.path_cache = folder_path_cache.folder_path_cache()
+        self.folder.create_folder = self.create_folder
+
+        self.schedule = schedule.schedule(self)
+
+    def create_folder(self, folder_name, parent_id):
+        with self.lock:
+            self.created_folders.append((folder_name, parent_id))
+        return {"Id": f'{parent_id}/{folder_name}'}
+
+    def validate_batch_scheduling_data(self, batch_schedule_data):
+        return pd.DataFrame([{"row": row_index, "error": "Recorder not found."} for row_index in self.invalid_rows],
+                            columns=["row", "error"])
+
+    def process_scheduling_data_row(self, schedule_data, parent_folder_id=None, skip_validation=False):
+        if schedule_data["schedule_name"] in self.failing_names:
+            raise ValueError("Unable to create schedule")
+
+        with self.lock:
+            self.processed_rows.append((schedule_data["schedule_name"], parent_folder_id))
+        return {"schedule_name": schedule_data["schedule_name"], "folder_id": parent_folder_id}
+
+def schedule_rows(*folders):
+    return {row_index: {"schedule_name": f'Lecture {row_index}', "folders": folder_path, "folder_root_id": ""}
+            for row_index, folder_path in enumerate(folders)}
+
+class batch_scheduling_test(unittest.TestCase):
+    def test_folders_created_once(self):
+        mediasite = stub_mediasite()
+        rows = schedule_rows("Current/Spring/Biology", "Current/Spring/Biology", "Current/Spring/Chemistry", "Current/Fall", "Archive")
+        results = dict(mediasite.schedule.iter_schedule_data_results(rows))
+
+        self.assertEqual(sorted(mediasite.created_folders), sorted([
+            ("Current", "root"), ("Archive", "root"), ("Spring", "root/Current"), ("Fall", "root/Current"),
+            ("Biology", "root/Current/Spring"), ("Chemistry", "root/Current/Spring")]))
+        self.assertEqual([results[row_index]["folder_id"] for row_index in range(5)], [
+            "root/Current/Spring/Biology", "root/Current/Spring/Biology", "root/Current/Spring/Chemistry",
+            "root/Current/Fall", "root/Archive"])
+
+    def test_parents_created_before_children(self):
+        mediasite = stub_mediasite()
+        list(mediasite.schedule.iter_schedule_data_results(schedule_rows("A/B/C", "A/D")))
+
+        positions = {folder_name: position for position, (folder_name, _) in enumerate(mediasite.created_folders)}
+        self.assertLess(positions["A"], positions["B"])
+        self.assertLess(positions["B"], positions["C"])
+        self.assertLess(positions["A"], positions["D"])
+
+    def test_invalid_rows_are_not_processed(self):
+        mediasite = stub_mediasite(invalid_rows=(1,))
+        results = dict(mediasite.schedule.iter_schedule_data_results(schedule_rows("Current", "Invalid")))
+
+        self.assertEqual(results[1]["errors"], ["Recorder not found."])
+        self.assertEqual(mediasite.processed_rows, [("Lecture 0", "root/Current")])
+        self.assertNotIn(("Invalid", "root"), mediasite.created_folders)
+
+    def test_failed_rows_report_errors(self):
+        mediasite = stub_mediasite(failing_names=("Lecture 1",))
+        results = dict(mediasite.schedule.iter_schedule_data_results(schedule_rows("Current", "Current", "Current")))
+
+        self.assertEqual(results[1], {"error": "Error: Lecture 1 - Unable to create schedule"})
+        self.assertEqual(sorted(name for name, _ in mediasite.processed_rows), ["Lecture 0", "Lecture 2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for typed columns and chunked reading of Excel XML report sheets
+
+License: MIT - see license.txt
+"""
+
+import datetime
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from assets.misc.ExcelHandler import ColumnBuffer, rows_to_columns
+import assets.mediasite.modules.report as report
+
+def fill(values, kind=None):
+    buffer = ColumnBuffer(kind)
+    for value in values:
+        buffer.append(value)
+    return buffer
+
+class column_buffer_test(unittest.TestCase):
+    def test_ints(self):
+        buffer = fill([1, 2, 3])
+
+        self.assertEqual(buffer.kind, "int")
+        self.assertEqual(buffer.to_array().dtype, np.int64)
+        self.assertEqual(buffer.to_array().tolist(), [1, 2, 3])
+
+    def test_ints_widen_to_floats_on_empty_cells(self):
+        buffer = fill([1, None, 3])
+
+        self.assertEqual(buffer.kind, "float")
+        self.assertEqual(buffer.to_array()[[0, 2]].tolist(), [1.0, 3.0])
+        self.assertTrue(math.isnan(buffer.to_array()[1]))
+
+    def test_ints_widen_to_floats_on_float_values(self):
+        buffer = fill([1, 2.5])
+
+        self.assertEqual(buffer.kind, "float")
+        self.assertEqual(buffer.to_array().tolist(), [1.0, 2.5])
+
+    def test_numbers_widen_to_objects_on_text(self):
+        buffer = fill([1, 2.5, "n/a"])
+
+        self.assertEqual(buffer.kind, "object")
+        self.assertEqual(buffer.to_array(), [1.0, 2.5, "n/a"])
+
+    def test_empty_text_counts_as_empty_in_numeric_columns(self):
+        buffer = fill([None, "", 4])
+
+        self.assertEqual(buffer.kind, "float")
+        self.assertEqual(len(buffer), 3)
+        self.assertTrue(np.isnan(buffer.to_array()[:2]).all())
+
+    def test_empty_text_is_kept_in_text_columns(self):
+        self.assertEqual(fill(["a", "", None]).to_array(), ["a", "", None])
+
+    def test_datetimes(self):
+        first = datetime.datetime(2026, 3, 8, 9, 30)
+        buffer = fill([first, None])
+
+        self.assertEqual(buffer.kind, "datetime")
+        self.assertEqual(buffer.to_array().dtype, np.dtype("datetime64[us]"))
+        self.assertEqual(buffer.to_array()[0], np.datetime64(first))
+        self.assertTrue(np.isnat(buffer.to_array()[1]))
+
+    def test_datetimes_widen_to_objects(self):
+        first = datetime.datetime(2026, 3, 8, 9, 30)
+
+        self.assertEqual(fill([first, None, "later"]).to_array(), [first, None, "later"])
+
+    def test_bools_widen_to_objects_on_empty_cells(self):
+        buffer = fill([True, None, False])
+
+        self.assertEqual(buffer.kind, "object")
+        self.assertEqual(buffer.to_array(), [True, None, False])
+
+    def test_starting_kind(self):
+        buffer = fill([1, 2], kind="float")
+
+        self.assertEqual(buffer.kind, "float")
+        self.assertEqual(buffer.to_array().dtype, np.float64)
+
+class rows_to_columns_test(unittest.TestCase):
+    def test_columns(self):
+        column_names = ["Title", "Views"]
+        columns = rows_to_columns(column_names, [["a", 1], ["b", 2]])
+
+        self.assertEqual(columns[0], ["a", "b"])
+        self.assertEqual(columns[1].tolist(), [1, 2])
+
+    def test_cells_past_the_column_names(self):
+        column_names = ["Title"]
+        columns = rows_to_columns(column_names, [["a"], ["b", 5], ["c"]])
+
+        self.assertEqual(column_names, ["Title", "1"])
+        self.assertEqual(len(columns[1]), 3)
+        self.assertEqual(columns[1][1], 5)
+
+    def test_kinds_carry_across_chunks(self):
+        kinds = []
+        first = rows_to_columns(["Views", "Title"], [[1, "a"], [None, "b"]], kinds)
+        second = rows_to_columns(["Views", "Title"], [[2, "c"], [3, "d"]], kinds)
+
+        self.assertEqual(kinds, ["float", "object"])
+        self.assertEqual(first[0].dtype, second[0].dtype)
+
+    def test_kinds_widen_in_later_chunks(self):
+        kinds = []
+        rows_to_columns(["Views"], [[1], [2]], kinds)
+        rows_to_columns(["Views"], [["n/a"]], kinds)
+
+        self.assertEqual(kinds, ["object"])
+
+SPREADSHEET_HEADER = '<?xml version="1.0"?><Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet" ' \
+                     'xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet">'
+
+def spreadsheet_row(*cells):
+    return "<Row>" + "".join(f'<Cell><Data ss:Type="{data_type}">{value}</Data></Cell>' for data_type, value in cells) + "</Row>"
+
+class iter_report_sheet_test(unittest.TestCase):
+    def setUp(self):
+        rows = [spreadsheet_row(("String", "Title"), ("String", "Air Date"), ("String", "Views"))]
+        for number in range(10):
+            rows.append(spreadsheet_row(("String", f'Presentation {number}'),
+                                        ("String", f'2026-05-0{number % 9 + 1} 10:00:00'),
+                                        ("Number", "" if number == 1 else number)))
+
+        #the presentation sheet of a presentation report is its fourth sheet
+        sheets = "".join(f'<Worksheet ss:Name="Sheet {number}"><Table>{spreadsheet_row(("String", "x"))}</Table></Worksheet>'
+                         for number in range(3))
+        sheets += '<Worksheet ss:Name="Presentations"><Table>' + "".join(rows) + "</Table></Worksheet>"
+
+        directory = tempfile.mkdtemp()
+        self.filepath = os.path.join(directory, "report.excel.xml")
+        with open(self.filepath, "w") as handle:
+            handle.write(SPREADSHEET_HEADER + sheets + "</Workbook>")
+
+        self.report = report.report(None)
+
+    def test_chunk_sizes(self):
+        self.assertEqual([len(chunk) for chunk in self.report.iter_report_sheet(self.filepath, chunk_size=3)], [3, 3, 3, 1])
+        self.assertEqual([len(chunk) for chunk in self.report.iter_report_sheet(self.filepath, chunk_size=5)], [5, 5])
+
+    def test_chunk_types(self):
+        chunks = list(self.report.iter_report_sheet(self.filepath, chunk_size=3))
+
+        self.assertEqual({tuple(str(dtype) for dtype in chunk.dtypes) for chunk in chunks},
+                         {tuple(str(dtype) for dtype in chunks[0].dtypes)})
+        self.assertEqual(str(chunks[-1]["Views"].dtype), "float64")
+        self.assertTrue(all(str(chunk["Air Date"].dtype).startswith("datetime64") for chunk in chunks))
+        self.assertEqual(list(chunks[0].columns), ["Title", "Air Date", "Views"])
+
+if __name__ == "__main__":
+    unittest.main()
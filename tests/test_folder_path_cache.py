@@ -0,0 +1,114 @@
+"""
+Tests for memoized folder path resolution
+
+License: MIT - see license.txt
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import assets.mediasite.folder_path_cache as folder_path_cache
+
+class stub_folders:
+    def __init__(self, delay=0.02, failing_names=()):
+        """
+        Stands in for folder.create_folder, recording each find or create request
+
+        params:
+            delay: seconds each request takes, so concurrent requests overlap
+            failing_names: folder names which cannot be created
+        """
+        self.delay = delay
+        self.failing_names = failing_names
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, folder_name, parent_id):
+        with self.lock:
+            self.calls.append((folder_name, parent_id))
+        time.sleep(self.delay)
+
+        if folder_name in self.failing_names:
+            return {"odata.error": {"code": "", "message": {"value": "Unable to create folder"}}}
+        return {"Id": f'{parent_id}/{folder_name}'}
+
+def resolve_concurrently(cache, create_folder, paths):
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        return list(executor.map(lambda path: cache.resolve("root", path, create_folder), paths))
+
+class resolve_test(unittest.TestCase):
+    def test_resolves_path(self):
+        create_folder = stub_folders(delay=0)
+        folder_id = folder_path_cache.folder_path_cache().resolve("root", ["Current", "Spring"], create_folder)
+
+        self.assertEqual(folder_id, "root/Current/Spring")
+        self.assertEqual(create_folder.calls, [("Current", "root"), ("Spring", "root/Current")])
+
+    def test_cached_path_is_not_requested_again(self):
+        cache = folder_path_cache.folder_path_cache()
+        create_folder = stub_folders(delay=0)
+        cache.resolve("root", ["Current", "Spring"], create_folder)
+        cache.resolve("root", ["Current", "Spring"], create_folder)
+        cache.resolve("root", ["Current", "Fall"], create_folder)
+
+        self.assertEqual(create_folder.calls, [("Current", "root"), ("Spring", "root/Current"), ("Fall", "root/Current")])
+
+    def test_same_path_concurrently(self):
+        create_folder = stub_folders()
+        folder_ids = resolve_concurrently(folder_path_cache.folder_path_cache(), create_folder, [["Current", "Spring"]] * 8)
+
+        self.assertEqual(set(folder_ids), {"root/Current/Spring"})
+        self.assertEqual(sorted(create_folder.calls), [("Current", "root"), ("Spring", "root/Current")])
+
+    def test_sibling_paths_concurrently(self):
+        create_folder = stub_folders()
+        siblings = [f'Course {number}' for number in range(8)]
+        folder_ids = resolve_concurrently(folder_path_cache.folder_path_cache(), create_folder,
+                                          [["Current", sibling] for sibling in siblings])
+
+        self.assertEqual(folder_ids, [f'root/Current/{sibling}' for sibling in siblings])
+        self.assertEqual(create_folder.calls.count(("Current", "root")), 1)
+        self.assertEqual(sorted(create_folder.calls[1:]), sorted((sibling, "root/Current") for sibling in siblings))
+
+    def test_siblings_are_created_in_parallel(self):
+        create_folder = stub_folders(delay=0.2)
+        cache = folder_path_cache.folder_path_cache()
+        cache.resolve("root", ["Current"], create_folder)
+
+        start = time.monotonic()
+        resolve_concurrently(cache, create_folder, [["Current", f'Course {number}'] for number in range(4)])
+
+        #one request's delay rather than four when siblings do not wait on each other
+        self.assertLess(time.monotonic() - start, 0.6)
+
+    def test_failed_folder_returns_lowest_folder(self):
+        cache = folder_path_cache.folder_path_cache()
+        create_folder = stub_folders(delay=0, failing_names=("Spring",))
+
+        self.assertEqual(cache.resolve("root", ["Current", "Spring", "Week 1"], create_folder), "root/Current")
+
+        #folders which could not be created are requested again later
+        cache.resolve("root", ["Current", "Spring"], create_folder)
+        self.assertEqual(create_folder.calls.count(("Spring", "root/Current")), 2)
+
+    def test_added_paths_are_not_requested(self):
+        cache = folder_path_cache.folder_path_cache()
+        cache.add("root", ["Current", "Spring"], ["current-id", "spring-id"])
+        create_folder = stub_folders(delay=0)
+
+        self.assertEqual(cache.resolve("root", ["Current", "Spring", "Week 1"], create_folder), "spring-id/Week 1")
+        self.assertEqual(create_folder.calls, [("Week 1", "spring-id")])
+
+    def test_clear(self):
+        cache = folder_path_cache.folder_path_cache()
+        create_folder = stub_folders(delay=0)
+        cache.resolve("root", ["Current"], create_folder)
+        cache.clear()
+        cache.resolve("root", ["Current"], create_folder)
+
+        self.assertEqual(create_folder.calls, [("Current", "root")] * 2)
+
+if __name__ == "__main__":
+    unittest.main()
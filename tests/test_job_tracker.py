@@ -0,0 +1,115 @@
+"""
+Tests for tracking many Mediasite jobs at one time
+
+License: MIT - see license.txt
+"""
+
+import threading
+import unittest
+from concurrent.futures import CancelledError
+
+import assets.mediasite.job_tracker as job_tracker
+
+class stub_response:
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return self.content
+
+class stub_api_client:
+    def __init__(self, statuses):
+        """
+        Serves job statuses, each job going through its list of statuses one poll at a time
+        and staying at the last one
+
+        params:
+            statuses: dictionary of job link to list of job results
+        """
+        self.statuses = statuses
+        self.polls = {}
+        self.lock = threading.Lock()
+
+    def request(self, request_type, resource, odata_attributes=None, post_vars=None):
+        with self.lock:
+            poll = self.polls.get(resource, 0)
+            self.polls[resource] = poll + 1
+
+        statuses = self.statuses[resource]
+        return stub_response(statuses[min(poll, len(statuses) - 1)])
+
+class stub_mediasite:
+    max_workers = 4
+
+    def __init__(self, statuses):
+        self.api_client = stub_api_client(statuses)
+
+    def experienced_request_errors(self, request_result):
+        return "odata.error" in request_result
+
+WORKING = {"Status": "Working"}
+SUCCESSFUL = {"Status": "Successful"}
+FAILED = {"Status": "Failed", "StatusMessage": "Unable to delete folder"}
+NOT_FOUND = {"odata.error": {"code": "", "message": {"value": "Not found"}}}
+
+class job_tracker_test(unittest.TestCase):
+    def setUp(self):
+        self.mediasite = stub_mediasite({
+            "job-1": [WORKING, WORKING, SUCCESSFUL],
+            "job-2": [SUCCESSFUL],
+            "job-3": [WORKING, FAILED],
+            "job-4": [NOT_FOUND],
+            "job-long": [WORKING]
+        })
+        self.tracker = job_tracker.job_tracker(self.mediasite, initial_interval=0.01, max_interval=0.02)
+
+    def tearDown(self):
+        self.tracker.shutdown()
+
+    def test_job_results(self):
+        futures = self.tracker.track_all(["job-1", "job-2", "job-3", "job-4"])
+
+        self.assertEqual([future.result(timeout=5) for future in futures], [None, None, None, NOT_FOUND])
+        self.assertEqual(self.mediasite.api_client.polls["job-1"], 3)
+        self.assertEqual(self.mediasite.api_client.polls["job-2"], 1)
+
+    def test_callback(self):
+        finished = []
+        done = threading.Event()
+
+        def callback(future):
+            finished.append(future.result())
+            done.set()
+
+        self.tracker.track("job-4", callback=callback)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(finished, [NOT_FOUND])
+
+    def test_shutdown_cancels_tracked_jobs(self):
+        future = self.tracker.track("job-long")
+        self.tracker.shutdown()
+
+        with self.assertRaises(CancelledError):
+            future.result(timeout=5)
+        self.assertIsNone(self.tracker.thread)
+        self.assertIsNone(self.tracker.executor)
+
+    def test_track_after_shutdown(self):
+        for _ in range(20):
+            self.tracker.track("job-long")
+            self.tracker.shutdown()
+
+            #a job tracked right after shutdown must start a new scheduler rather than land on the old one
+            self.assertIsNone(self.tracker.track("job-2").result(timeout=5))
+
+    def test_shutdown_stops_threads(self):
+        self.tracker.track("job-2").result(timeout=5)
+        thread = self.tracker.thread
+        self.tracker.shutdown()
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(any(active.name.startswith("job_poll") for active in threading.enumerate()))
+
+if __name__ == "__main__":
+    unittest.main()
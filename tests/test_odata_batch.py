@@ -0,0 +1,187 @@
+"""
+Tests for OData $batch request encoding and response parsing
+
+License: MIT - see license.txt
+"""
+
+import json
+import unittest
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import assets.mediasite.odata as odata
+import assets.mediasite.api_client as api_client
+
+SERVICE_ROOT = "http://mediasite.example.edu/Mediasite/api/v1/"
+
+def parse_multipart(body, content_type):
+    """
+    Parses a multipart/mixed body with the standard library, independently of odata.parse_batch_response
+    """
+    return BytesParser(policy=HTTP).parsebytes(b"Content-Type: " + content_type.encode("utf-8") + b"\r\n\r\n" + body)
+
+def http_response(status, body=None, status_text="OK"):
+    lines = [f'HTTP/1.1 {status} {status_text}']
+    if body is not None:
+        content = json.dumps(body)
+        lines += ["Content-Type: application/json;odata=minimalmetadata", f'Content-Length: {len(content)}', "", content]
+    else:
+        lines += ["", ""]
+    return lines
+
+def build_batch_response(boundary, parts):
+    """
+    Builds a $batch response body
+
+    params:
+        boundary: boundary of the batch response
+        parts: list of response lines for a single operation, or of lists of them for a changeset
+    """
+    lines = []
+    for number, part in enumerate(parts):
+        if isinstance(part[0], list):
+            changeset = f'changesetresponse_{number}'
+            lines += [f'--{boundary}', f'Content-Type: multipart/mixed; boundary={changeset}', ""]
+            for response in part:
+                lines += [f'--{changeset}', "Content-Type: application/http", "Content-Transfer-Encoding: binary", ""]
+                lines += response
+            lines += [f'--{changeset}--']
+        else:
+            lines += [f'--{boundary}', "Content-Type: application/http", "Content-Transfer-Encoding: binary", ""]
+            lines += part
+    lines += [f'--{boundary}--', ""]
+    return "\r\n".join(lines).encode("utf-8"), f'multipart/mixed; boundary={boundary}'
+
+class encode_batch_test(unittest.TestCase):
+    def setUp(self):
+        self.operations = [
+            ("get", SERVICE_ROOT + "Folders?$select=full", None),
+            ("post", SERVICE_ROOT + "Schedules('1')/Recurrences", {"RecordDuration": 3600000, "Name": "café"}),
+            ("patch", SERVICE_ROOT + "Catalogs('2')/Settings", {"AllowPresentationDownload": "True"})
+        ]
+        self.body, self.content_type = odata.encode_batch(self.operations, "batch_test")
+
+    def test_content_type_carries_boundary(self):
+        self.assertEqual(self.content_type, "multipart/mixed; boundary=batch_test")
+
+    def test_crlf_framing(self):
+        #every line break is a CRLF and the body is delimited by the batch boundary
+        self.assertNotIn(b"\n", self.body.replace(b"\r\n", b""))
+        self.assertTrue(self.body.startswith(b"--batch_test\r\n"))
+        self.assertTrue(self.body.endswith(b"\r\n--batch_test--"))
+
+    def test_reads_operations(self):
+        message = parse_multipart(self.body, self.content_type)
+        parts = message.get_payload()
+        self.assertEqual(len(parts), 3)
+
+        #reads are sent directly in the batch
+        self.assertEqual(parts[0].get_content_type(), "application/http")
+        self.assertTrue(parts[0].get_payload().startswith("GET " + SERVICE_ROOT + "Folders?$select=full HTTP/1.1\r\n"))
+
+    def test_writes_in_own_changesets(self):
+        message = parse_multipart(self.body, self.content_type)
+        parts = message.get_payload()
+
+        boundaries = set()
+        for part, (method, url, post_vars) in zip(parts[1:], self.operations[1:]):
+            self.assertEqual(part.get_content_type(), "multipart/mixed")
+            boundaries.add(part.get_boundary())
+
+            requests = part.get_payload()
+            self.assertEqual(len(requests), 1)
+            request = requests[0].get_payload(decode=True)
+            head, _, content = request.partition(b"\r\n\r\n")
+            head_lines = head.decode("utf-8").split("\r\n")
+            content = content.rstrip(b"\r\n")
+
+            self.assertEqual(head_lines[0], f'{method.upper()} {url} HTTP/1.1')
+            self.assertIn(f'Content-Length: {len(content)}', head_lines)
+            self.assertEqual(json.loads(content), post_vars)
+
+        self.assertEqual(len(boundaries), 2)
+
+class parse_batch_response_test(unittest.TestCase):
+    def test_round_trip(self):
+        operations = [
+            ("get", SERVICE_ROOT + "Folders", None),
+            ("post", SERVICE_ROOT + "Schedules('1')/Recurrences", {"RecordDuration": 3600000})
+        ]
+        _, request_content_type = odata.encode_batch(operations, "batch_request")
+        self.assertIn("batch_request", request_content_type)
+
+        body, content_type = build_batch_response("batchresponse_1", [
+            http_response(200, {"value": [{"Id": "f1"}]}),
+            [http_response(201, {"Id": "r1", "RecordDuration": 3600000}, "Created")]
+        ])
+        responses = odata.parse_batch_response(body, content_type, [url for _, url, _ in operations])
+
+        self.assertEqual([response.status_code for response in responses], [200, 201])
+        self.assertEqual(responses[0].json(), {"value": [{"Id": "f1"}]})
+        self.assertEqual(responses[1].json()["Id"], "r1")
+        self.assertEqual([response.url for response in responses], [url for _, url, _ in operations])
+        self.assertEqual(responses[0].headers["Content-Type"], "application/json;odata=minimalmetadata")
+
+    def test_nested_changesets_keep_operation_order(self):
+        body, content_type = build_batch_response("batchresponse_2", [
+            [http_response(201, {"Id": "r1"}, "Created"), http_response(201, {"Id": "r2"}, "Created")],
+            http_response(200, {"Id": "f1"}),
+            [http_response(201, {"Id": "r3"}, "Created")]
+        ])
+        responses = odata.parse_batch_response(body, content_type)
+
+        self.assertEqual([response.json()["Id"] for response in responses], ["r1", "r2", "f1", "r3"])
+
+    def test_no_content_parts(self):
+        body, content_type = build_batch_response("batchresponse_3", [
+            [http_response(204, None, "No Content")],
+            [http_response(201, {"Id": "r1"}, "Created")]
+        ])
+        responses = odata.parse_batch_response(body, content_type)
+
+        self.assertEqual(responses[0].status_code, 204)
+        self.assertEqual(responses[0].content, b"")
+        self.assertEqual(responses[0].json(), {})
+        self.assertEqual(responses[1].json(), {"Id": "r1"})
+
+    def test_error_parts(self):
+        error = {"odata.error": {"code": "", "message": {"lang": "en-US", "value": "Not found"}}}
+        body, content_type = build_batch_response("batchresponse_4", [[http_response(404, error, "Not Found")]])
+        responses = odata.parse_batch_response(body, content_type)
+
+        self.assertEqual(responses[0].status_code, 404)
+        self.assertEqual(responses[0].json(), error)
+
+    def test_missing_parts(self):
+        urls = [SERVICE_ROOT + "Schedules('1')/Recurrences"] * 3
+        body, content_type = build_batch_response("batchresponse_5", [[http_response(201, {"Id": "r1"}, "Created")]])
+        responses = odata.parse_batch_response(body, content_type, urls)
+
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0].url, urls[0])
+
+    def test_missing_boundary(self):
+        with self.assertRaises(ValueError):
+            odata.parse_batch_response(b"", "multipart/mixed")
+
+class send_batch_test(unittest.TestCase):
+    def test_missing_parts_become_request_errors(self):
+        client = api_client.client(SERVICE_ROOT, "key", "user", "password")
+        body, content_type = build_batch_response("batchresponse_6", [[http_response(201, {"Id": "r1"}, "Created")]])
+
+        class batch_rsp:
+            status_code = 202
+            headers = {"Content-Type": content_type}
+            content = body
+
+        client.send_with_retries = lambda *args, **kwargs: batch_rsp()
+        operations = [("post", "Schedules('1')/Recurrences", "", {"Name": str(number)}) for number in range(3)]
+        results = client.send_batch(operations)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].json(), {"Id": "r1"})
+        self.assertIsInstance(results[1], api_client.request_error)
+        self.assertIsInstance(results[2], api_client.request_error)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Tests for paged OData collection listings
+
+License: MIT - see license.txt
+"""
+
+import random
+import threading
+import unittest
+
+import assets.mediasite.pager as pager
+
+class stub_mediasite:
+    max_workers = 4
+
+class stub_collection:
+    def __init__(self, count, max_page_size=None, failing_skips=()):
+        """
+        Stands in for pager.request_page, serving the windows of a collection of count records.
+        Without an $orderby each request sees the records in a different order, as OData allows.
+
+        params:
+            count: number of records in the collection
+            max_page_size: page size the server caps requests to, no cap if None
+            failing_skips: $skip values of windows which fail
+        """
+        self.records = [{"Id": f'{number:05d}'} for number in range(count)]
+        self.max_page_size = max_page_size
+        self.failing_skips = failing_skips
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, resource, odata_attributes="", skip=0, top=1000):
+        with self.lock:
+            self.requests.append((odata_attributes, skip, top))
+
+        if skip in self.failing_skips:
+            return None
+
+        records = list(self.records)
+        if "$orderby=Id" not in odata_attributes.split("&"):
+            random.Random(skip).shuffle(records)
+
+        if self.max_page_size:
+            top = min(top, self.max_page_size)
+        return {"odata.count": str(len(records)), "value": records[skip:skip + top]}
+
+def create_pager(collection):
+    collection_pager = pager.pager(stub_mediasite())
+    collection_pager.request_page = collection
+    return collection_pager
+
+class iter_pages_test(unittest.TestCase):
+    def test_each_record_exactly_once(self):
+        collection = stub_collection(2345)
+        records = create_pager(collection).get_all("Presentations", "$select=full", page_size=100)
+
+        self.assertEqual([record["Id"] for record in records], [record["Id"] for record in collection.records])
+        self.assertTrue(all(attributes == "$orderby=Id&$select=full" for attributes, _, _ in collection.requests))
+
+    def test_keeps_caller_order(self):
+        collection = stub_collection(10)
+        create_pager(collection).get_all("Presentations", "$orderby=Title desc", page_size=5)
+
+        self.assertTrue(all(attributes == "$orderby=Title desc" for attributes, _, _ in collection.requests))
+
+    def test_windows_cover_count(self):
+        collection = stub_collection(2345)
+        pages = list(create_pager(collection).iter_pages("Presentations", page_size=1000))
+
+        self.assertEqual([len(page) for page in pages], [1000, 1000, 345])
+        self.assertEqual(sorted((skip, top) for _, skip, top in collection.requests), [(0, 1000), (1000, 1000), (2000, 345)])
+
+    def test_single_page(self):
+        collection = stub_collection(40)
+        records = create_pager(collection).get_all("Presentations", page_size=100)
+
+        self.assertEqual(len(records), 40)
+        self.assertEqual(len(collection.requests), 1)
+
+    def test_empty_collection(self):
+        collection = stub_collection(0)
+
+        self.assertEqual(create_pager(collection).get_all("Presentations"), [])
+        self.assertEqual(len(collection.requests), 1)
+
+    def test_max_items(self):
+        collection = stub_collection(2345)
+        records = create_pager(collection).get_all("Presentations", page_size=1000, max_items=1500)
+
+        self.assertEqual([record["Id"] for record in records], [record["Id"] for record in collection.records[:1500]])
+        self.assertEqual(sorted((skip, top) for _, skip, top in collection.requests), [(0, 1000), (1000, 500)])
+
+    def test_server_capped_page_size(self):
+        #the server returns 100 records however many are requested
+        collection = stub_collection(1050, max_page_size=100)
+        records = create_pager(collection).get_all("Presentations", page_size=1000)
+
+        self.assertEqual([record["Id"] for record in records], [record["Id"] for record in collection.records])
+        windows = sorted((skip, top) for _, skip, top in collection.requests)
+        self.assertEqual(windows[0], (0, 1000))
+        self.assertEqual(windows[1:], [(skip, min(100, 1050 - skip)) for skip in range(100, 1050, 100)])
+
+    def test_failed_window(self):
+        collection = stub_collection(1000, failing_skips=(300,))
+
+        with self.assertRaises(pager.incomplete_listing_error) as context:
+            create_pager(collection).get_all("Presentations", page_size=100)
+
+        #records of the pages before the failed one are kept on the error
+        self.assertEqual([record["Id"] for record in context.exception.records], [record["Id"] for record in collection.records[:300]])
+        self.assertIn("$skip=300", context.exception.odata_attributes)
+        self.assertEqual(context.exception.resource, "Presentations")
+
+    def test_failed_first_page(self):
+        collection = stub_collection(1000, failing_skips=(0,))
+
+        with self.assertRaises(pager.incomplete_listing_error) as context:
+            create_pager(collection).get_all("Presentations", page_size=100)
+
+        self.assertEqual(context.exception.records, [])
+        self.assertEqual(len(collection.requests), 1)
+
+    def test_next_links_without_count(self):
+        collection_pager = create_pager(lambda resource, odata_attributes="", skip=0, top=1000: {
+            "value": [{"Id": "1"}, {"Id": "2"}], "odata.nextLink": "http://mediasite/api/v1/Presentations?$skiptoken=2"})
+        next_pages = []
+
+        def request_collection(resource, odata_attributes=""):
+            next_pages.append(odata_attributes)
+            return {"value": [{"Id": "3"}]}
+
+        collection_pager.request_collection = request_collection
+        records = collection_pager.get_all("Presentations")
+
+        self.assertEqual([record["Id"] for record in records], ["1", "2", "3"])
+        self.assertEqual(next_pages, ["$skiptoken=2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for loading many presentation reports in worker processes
+
+License: MIT - see license.txt
+"""
+
+import os
+import tempfile
+import unittest
+
+import assets.mediasite.modules.report as report
+
+SPREADSHEET_HEADER = '<?xml version="1.0"?><Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet" ' \
+                     'xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet">'
+
+def spreadsheet_row(*values):
+    return "<Row>" + "".join(f'<Cell><Data ss:Type="String">{value}</Data></Cell>' for value in values) + "</Row>"
+
+def worksheet(name, *rows):
+    return f'<Worksheet ss:Name="{name}"><Table>' + "".join(rows) + "</Table></Worksheet>"
+
+def presentation_report(report_name, titles):
+    """
+    params:
+        report_name: name shown on the summary sheet
+        titles: presentation titles of the presentation sheet
+
+    returns:
+        excel xml of a presentation report
+    """
+    #summary labels run down the first column with their values next to them, ending with the report date and timezone
+    summary = worksheet("Summary",
+                        spreadsheet_row("Report Name:", report_name),
+                        spreadsheet_row("Range:", "2026-05-01 to 2026-05-31"),
+                        spreadsheet_row("2026-06-01"),
+                        spreadsheet_row("UTC"))
+    presentations = worksheet("Presentations",
+                              spreadsheet_row("Title", "Air Date"),
+                              *(spreadsheet_row(title, "2026-05-02 10:00:00") for title in titles))
+
+    #the presentation sheet of a presentation report is its fourth sheet
+    return SPREADSHEET_HEADER + summary + worksheet("B") + worksheet("C") + presentations + "</Workbook>"
+
+class load_many_presentation_reports_test(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.report = report.report(None, config_data={"mediasite_report_cache":False})
+
+    def write(self, filename, content):
+        filepath = os.path.join(self.directory, filename)
+        with open(filepath, "w") as handle:
+            handle.write(content)
+        return filepath
+
+    def test_reports_are_combined_in_filepath_order(self):
+        filepaths = [self.write(f'r{number}.excel.xml', presentation_report(f'Report {number}', [f'{number}a', f'{number}b']))
+                     for number in (2, 0, 1)]
+        summary_df, presentation_df = self.report.load_many_presentation_reports(filepaths, max_workers=2)
+
+        self.assertEqual(summary_df["Report File"].tolist(), filepaths)
+        self.assertEqual(summary_df["Report Name"].tolist(), ["Report 2", "Report 0", "Report 1"])
+        self.assertEqual(presentation_df["Title"].tolist(), ["2a", "2b", "0a", "0b", "1a", "1b"])
+        self.assertEqual(presentation_df["Report File"].tolist(), [filepath for filepath in filepaths for _ in range(2)])
+
+    def test_unreadable_reports_are_left_out(self):
+        readable = self.write("readable.excel.xml", presentation_report("Readable", ["a"]))
+        unreadable = self.write("unreadable.excel.xml", "not a spreadsheet")
+        missing = os.path.join(self.directory, "missing.excel.xml")
+
+        with self.assertLogs(level="ERROR") as logs:
+            summary_df, presentation_df = self.report.load_many_presentation_reports([unreadable, readable, missing], max_workers=2)
+
+        self.assertEqual(summary_df["Report File"].tolist(), [readable])
+        self.assertEqual(presentation_df["Title"].tolist(), ["a"])
+        self.assertEqual(len(logs.records), 2)
+
+    def test_no_readable_reports(self):
+        with self.assertLogs(level="ERROR"):
+            summary_df, presentation_df = self.report.load_many_presentation_reports([os.path.join(self.directory, "missing.excel.xml")])
+
+        self.assertTrue(summary_df.empty)
+        self.assertTrue(presentation_df.empty)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for DataFrame based reading of scheduling spreadsheets
+
+License: MIT - see license.txt
+"""
+
+import datetime
+import unittest
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+import assets.mediasite.schedule_importer as schedule_importer
+
+def spreadsheet_row(start_date, start_time, end_date=None, end_time="10:15 AM", title="Lecture"):
+    row = {column:"" for column in list(schedule_importer.TEXT_COLUMNS) + list(schedule_importer.BOOLEAN_COLUMNS)}
+    row.update({column:"FALSE" for column in schedule_importer.DAY_COLUMNS})
+    row.update({
+        "Presentation Title":title,
+        "Mediasite Folder":"Current/Spring 2026",
+        "Include Catalog":"TRUE",
+        "Mon":"TRUE",
+        "Delete Schedule After Occurrences":"FALSE",
+        "Start Date":start_date,
+        "End Date":end_date or start_date,
+        "Start Time":start_time,
+        "End Time":end_time
+    })
+    return row
+
+class schedule_importer_test(unittest.TestCase):
+    def setUp(self):
+        #central time moves from UTC-6 to UTC-5 on 03/08/26 and back on 11/01/26
+        self.importer = schedule_importer.schedule_importer(local_tz=ZoneInfo("America/Chicago"))
+
+    def parse(self, *rows):
+        return self.importer.parse(pd.DataFrame(list(rows)))
+
+    def test_offset_before_and_after_dst_change(self):
+        parsed = self.parse(spreadsheet_row("03/06/26", "09:00 AM"), spreadsheet_row("03/09/26", "09:00 AM"))
+
+        self.assertEqual(parsed["schedule_start_datetime_utc_string"].tolist(), ["2026-03-06T15:00:10", "2026-03-09T14:00:10"])
+        self.assertEqual(parsed["schedule_start_datetime_local_string"].tolist(), ["2026-03-06T09:00:10", "2026-03-09T09:00:10"])
+
+    def test_offset_of_each_date_is_used(self):
+        #a schedule starting before the change and ending after it converts each end with its own offset
+        parsed = self.parse(spreadsheet_row("03/06/26", "09:00 AM", end_date="03/20/26"))
+
+        self.assertEqual(parsed.loc[0, "schedule_start_datetime_utc"], pd.Timestamp("2026-03-06 15:00:10"))
+        self.assertEqual(parsed.loc[0, "schedule_end_datetime_utc"], pd.Timestamp("2026-03-20 15:15:10"))
+
+    def test_nonexistent_local_time(self):
+        #02:30 does not exist on 03/08/26, it is moved forward an hour
+        parsed = self.parse(spreadsheet_row("03/08/26", "02:30 AM", end_time="04:00 AM"))
+
+        self.assertEqual(parsed.loc[0, "schedule_start_datetime_utc_string"], "2026-03-08T08:30:10")
+
+    def test_ambiguous_local_time(self):
+        #01:30 happens twice on 11/01/26, the daylight saving time one is used
+        parsed = self.parse(spreadsheet_row("11/01/26", "01:30 AM", end_time="03:00 AM"))
+
+        self.assertEqual(parsed.loc[0, "schedule_start_datetime_utc_string"], "2026-11-01T06:30:10")
+        self.assertEqual(parsed.loc[0, "schedule_end_datetime_utc_string"], "2026-11-01T09:00:10")
+
+    def test_duration(self):
+        parsed = self.parse(spreadsheet_row("03/09/26", "09:00 AM"), spreadsheet_row("03/09/26", "11:00 PM", end_time="01:00 AM"))
+
+        self.assertEqual(parsed["schedule_duration"].tolist(), ["75", "120"])
+
+    def test_other_date_and_time_formats(self):
+        parsed = self.parse(spreadsheet_row("2026-03-09", "09:00:00", end_time="10:15:00"))
+
+        self.assertEqual(parsed.loc[0, "schedule_start_datetime_utc_string"], "2026-03-09T14:00:10")
+
+    def test_unreadable_rows(self):
+        parsed = self.parse(spreadsheet_row("not a date", "09:00 AM", title="Broken"), spreadsheet_row("03/09/26", "09:00 AM"))
+
+        self.assertIn("Broken", parsed.loc[0, "error"])
+        self.assertEqual(parsed.loc[1, "error"], "")
+        self.assertEqual([row_index for row_index, _ in self.importer.iter_schedule_data(parsed)], [1])
+
+    def test_schedule_data(self):
+        _, schedule_data = next(self.importer.iter_schedule_data(self.parse(spreadsheet_row("03/09/26", "09:00 AM"))))
+
+        self.assertEqual(schedule_data["schedule_start_datetime_utc"], datetime.datetime(2026, 3, 9, 14, 0, 10))
+        self.assertEqual(schedule_data["schedule_start_datetime_local"], datetime.datetime(2026, 3, 9, 9, 0, 10))
+        self.assertTrue(schedule_data["catalog_include"])
+        self.assertTrue(schedule_data["schedule_days_of_week"]["Monday"])
+        self.assertFalse(schedule_data["schedule_days_of_week"]["Tuesday"])
+        self.assertEqual(schedule_data["schedule_auto_delete"], "False")
+
+    def test_missing_columns(self):
+        with self.assertRaises(KeyError):
+            self.importer.parse(pd.DataFrame([{"Presentation Title":"Lecture"}]))
+
+if __name__ == "__main__":
+    unittest.main()